@@ -5,23 +5,129 @@ data from the ``_api_exceptions.txt`` definition file.
 
 A list of known API error codes can be found here: http://fbdevwiki.com/wiki/Error_codes
 
+The generated module only contains a compact table of the known
+errors: each exception class is created the first time it is accessed
+(as a module attribute, or through ``ERROR_CODE_CLASSES``), so that
+importing the module doesn't build hundreds of classes that will never
+be raised.
+
+Each class extends the most specific class from
+:py:mod:`django_fbcanvas.exceptions` matching its error code, and
+``OAuthException`` (the base of all of them before), so that existing
+``except`` clauses keep working.
+
 .. TODO: Also generate a nicer documentation page, grouping exceptions etc.
 """
 import sys
 
+MODULE_HEADER = """'''Auto-generated API Exceptions definition module
+
+Exception classes are created on first access; see
+``_generate_api_exceptions.py``.
+'''
+
+import sys
+import threading
+from types import ModuleType
+
+from django_fbcanvas import exceptions as _exceptions
+
+## Known errors, as: class name -> (error code, error id, base class
+## name, description)
+_ERRORS = {
+"""
+
+MODULE_FOOTER = """}
+
+_ERROR_NAMES = dict((row[0], name) for name, row in _ERRORS.items())
+
+
+class _LazyCodeTable(object):
+    '''Read-only map of API error codes to exception classes'''
+
+    def __init__(self, module):
+        self._module = module
+
+    def get(self, code, default=None):
+        name = _ERROR_NAMES.get(code)
+        if name is None:
+            return default
+        return getattr(self._module, name)
+
+    def __getitem__(self, code):
+        return getattr(self._module, _ERROR_NAMES[code])
+
+    def __contains__(self, code):
+        return code in _ERROR_NAMES
+
+    def __iter__(self):
+        return iter(sorted(_ERROR_NAMES))
+
+    def __len__(self):
+        return len(_ERROR_NAMES)
+
+    def keys(self):
+        return sorted(_ERROR_NAMES)
+
+
+class _LazyModule(ModuleType):
+    '''Module creating the exception classes on first access'''
+
+    def __init__(self, module):
+        ModuleType.__init__(self, module.__name__, module.__doc__)
+        ## Keep a reference to the original module, whose globals
+        ## are used by the functions defined in it
+        self._original_module = module
+        self._lock = threading.Lock()
+        self.__file__ = module.__file__
+        self.__all__ = sorted(_ERRORS) + ['ERROR_CODE_CLASSES']
+        ## Map of API error codes to exception classes
+        self.ERROR_CODE_CLASSES = _LazyCodeTable(self)
+
+    def __getattr__(self, name):
+        try:
+            error_code, error_id, base, description = _ERRORS[name]
+        except KeyError:
+            raise AttributeError(name)
+        base = getattr(_exceptions, base)
+        ## API errors used to be all OAuthExceptions: keep it a base
+        ## class, so that existing ``except`` clauses keep working
+        bases = (base,)
+        if not issubclass(base, _exceptions.OAuthException):
+            bases += (_exceptions.OAuthException,)
+        with self._lock:
+            if name not in self.__dict__:
+                self.__dict__[name] = type(name, bases, {
+                    '__doc__': 'Autogenerated exception class for API error code %d' % error_code,
+                    '__module__': self.__name__,
+                    'error_code': error_code,
+                    'error_id': error_id,
+                    'error_description': description,
+                })
+        return self.__dict__[name]
+
+    def __dir__(self):
+        return sorted(set(self.__dict__) | set(_ERRORS))
+
+
+sys.modules[__name__] = _LazyModule(sys.modules[__name__])
+"""
+
 if __name__ == '__main__':
     import os
+    sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+    from django_fbcanvas.exceptions import error_code_index
+
     input_file = os.path.join(os.path.dirname(__file__), '_api_exceptions.txt')
     output_file = os.path.join(os.path.dirname(__file__), 'api_exceptions.py')
-    
+
     _lines = 0
-    
+
     inf = open(input_file, 'r')
     outf = open(output_file, 'w')
-    
-    outf.write("'''Auto-generated API Exceptions definition module'''\n\n")
-    outf.write("from django_fbcanvas.exceptions import OAuthException\n\n")
-    
+
+    outf.write(MODULE_HEADER)
+
     for line in inf:
         if line.strip():
             _lines += 1
@@ -31,15 +137,14 @@ if __name__ == '__main__':
                 em = em[7:]
             ed = ed.strip()
             _em_camel = ''.join([p.title() for p in em.split('_')])
-            
-            outf.write("class %sError(OAuthException):\n" % _em_camel)
-            outf.write('    """Autogenerated exception class for API error code %d"""' % ec + "\n")
-            outf.write("    error_code = %d\n" % ec)
-            outf.write("    error_id = \"%s\"\n" % em)
-            outf.write("    error_description = %r\n" % ed)
-            outf.write("\n")
-    
+            _base = error_code_index.get_class(ec)
+            _base = _base.__name__ if _base else 'OAuthException'
+
+            outf.write("    %r: (%d, %r, %r, %r),\n" % ('%sError' % _em_camel, ec, em, _base, ed))
+
+    outf.write(MODULE_FOOTER)
+
     inf.close()
     outf.close()
-    
+
     sys.stderr.write("Written %s. %d exceptions was created.\n" % (output_file, _lines))
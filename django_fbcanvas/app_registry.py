@@ -0,0 +1,168 @@
+"""django_fbcanvas - app_registry
+
+Registry of the Facebook applications served by this process.
+
+By default, a single application is configured through
+``FACEBOOK_APP_ID`` and ``FACEBOOK_APP_SECRET``. Many applications can
+be served from the same deployment by listing them in ``FACEBOOK_APPS``,
+each selected by the request host and/or by the first segment of the
+request path::
+
+    FACEBOOK_APPS = [
+        {'app_id': '1234', 'secret': '...', 'hosts': ['quiz.example.com']},
+        {'app_id': '5678', 'secret': '...', 'path_prefixes': ['poll']},
+    ]
+
+Requests not matching any host or path prefix are assigned to the app
+whose ``fbsr_<app_id>`` cookie they carry, or to the default app (the
+one from ``FACEBOOK_APP_ID``, or else the first one listed).
+
+Cookie names and keyed HMAC states are computed once, when the registry
+is built, and all the lookups are dict lookups.
+"""
+
+import logging
+import threading
+
+import django_fbcanvas.settings as fb_settings
+from django_fbcanvas.exceptions import InvalidSignedRequest
+from django_fbcanvas.utils import SignedRequestVerifier
+
+logger = logging.getLogger(__name__)
+
+
+class FacebookApp(object):
+    """Configuration of a single Facebook application.
+
+    :param app_id: The application ID
+    :param secret: The application secret
+    :param hosts: Host names (without port) served by this app
+    :param path_prefixes: First path segments (eg. ``'poll'`` for
+        ``/poll/...``) served by this app
+    :param canvas_page: URL of the canvas page of the app
+    :param default_scope: Permissions asked by default to users;
+        defaults to ``FACEBOOK_DEFAULT_SCOPE``
+    """
+
+    def __init__(self, app_id, secret, hosts=None, path_prefixes=None,
+                 canvas_page=None, default_scope=None):
+        self.app_id = str(app_id)
+        self.secret = secret
+        self.hosts = [h.lower() for h in (hosts or [])]
+        self.path_prefixes = [p.strip('/') for p in (path_prefixes or [])]
+        self.canvas_page = canvas_page
+        if default_scope is None:
+            default_scope = fb_settings.FACEBOOK_DEFAULT_SCOPE
+        self.default_scope = default_scope
+        self.cookie_name = 'fbsr_%s' % self.app_id
+        self.verifier = SignedRequestVerifier(secret)
+
+    def parse_signed_request(self, signed_request):
+        """Verify and decode a signed request for this app.
+
+        :returns: The decoded data object if signature is valid, else ``None``.
+        """
+        try:
+            return self.verifier.verify(signed_request)
+        except InvalidSignedRequest, e:
+            logger.error("Invalid signed_data for app %s: %s" % (self.app_id, e))
+
+    def __repr__(self):
+        return '<FacebookApp %s>' % self.app_id
+
+
+class AppRegistry(object):
+    """Selects the :py:class:`FacebookApp` serving each request.
+
+    :param apps: List of :py:class:`FacebookApp`
+    :param default: The app used for requests not matching any other;
+        defaults to the first one
+    """
+
+    def __init__(self, apps, default=None):
+        self.apps = list(apps)
+        self.default = default or (self.apps[0] if self.apps else None)
+        self._by_id = {}
+        self._by_host = {}
+        self._by_prefix = {}
+        self._by_cookie = {}
+        for app in self.apps:
+            self._by_id[app.app_id] = app
+            self._by_cookie[app.cookie_name] = app
+            for host in app.hosts:
+                self._by_host[host] = app
+            for prefix in app.path_prefixes:
+                self._by_prefix[prefix] = app
+
+    def get(self, app_id):
+        """Returns the app with the given ID, or ``None``"""
+        return self._by_id.get(str(app_id))
+
+    def get_by_cookie(self, cookies):
+        """Returns the app for which a signed request cookie is
+        found in ``cookies``, or ``None``
+        """
+        if len(self._by_cookie) == 1:
+            ## Single app: avoid iterating over the cookies
+            cookie_name, app = self._by_cookie.items()[0]
+            return app if cookie_name in cookies else None
+        for cookie_name in cookies:
+            app = self._by_cookie.get(cookie_name)
+            if app is not None:
+                return app
+
+    def for_request(self, request):
+        """Returns the app serving ``request``"""
+        if self._by_host:
+            host = request.META.get('HTTP_HOST', '').split(':', 1)[0].lower()
+            app = self._by_host.get(host)
+            if app is not None:
+                return app
+        if self._by_prefix:
+            prefix = request.path.lstrip('/').split('/', 1)[0]
+            app = self._by_prefix.get(prefix)
+            if app is not None:
+                return app
+        if len(self.apps) > 1:
+            app = self.get_by_cookie(request.COOKIES)
+            if app is not None:
+                return app
+        return self.default
+
+    @classmethod
+    def from_settings(cls):
+        """Build the registry from ``FACEBOOK_APPS``, or from
+        ``FACEBOOK_APP_ID`` / ``FACEBOOK_APP_SECRET`` if not set.
+        """
+        apps = [FacebookApp(**app_config) for app_config in fb_settings.FACEBOOK_APPS]
+        default = None
+        if fb_settings.FACEBOOK_APP_ID:
+            default = dict((app.app_id, app) for app in apps).get(str(fb_settings.FACEBOOK_APP_ID))
+            if default is None:
+                default = FacebookApp(fb_settings.FACEBOOK_APP_ID,
+                                      fb_settings.FACEBOOK_APP_SECRET,
+                                      canvas_page=fb_settings.FACEBOOK_CANVAS_PAGE)
+                apps.append(default)
+        return cls(apps, default)
+
+
+_registry = None
+_registry_lock = threading.Lock()
+
+def get_app_registry():
+    """Returns the process-wide :py:class:`AppRegistry` configured
+    in settings.
+    """
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                _registry = AppRegistry.from_settings()
+    return _registry
+
+def get_app(app_id=None):
+    """Returns the app with the given ID, or the default one"""
+    registry = get_app_registry()
+    if app_id is None:
+        return registry.default
+    return registry.get(app_id)
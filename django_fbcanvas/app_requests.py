@@ -0,0 +1,112 @@
+"""django_fbcanvas - app_requests
+
+Processing of application requests (the ``request_ids`` Facebook adds
+to the canvas URL when a user accepts one or more app requests).
+
+``FacebookRequestMiddleware`` sends the
+:py:data:`django_fbcanvas.signals.facebook_app_request_received` signal
+before calling the view and, if ``FACEBOOK_PROCESS_APP_REQUESTS`` is
+enabled (it is disabled by default), hands the IDs to
+:py:func:`process_app_requests_async`. That runs off the request path,
+in a bounded worker pool, and:
+
+- fetches all the requests with ``?ids=`` requests, of up to
+  ``LOADER_MAX_BATCH`` ids each
+- deletes the fetched ones (as Facebook asks apps to do once a request
+  has been accepted) with batch requests
+- sends :py:data:`django_fbcanvas.signals.facebook_app_requests_processed`
+  with the fetched requests
+
+.. NOTE::
+    ``facebook_app_requests_processed`` is sent from a worker thread.
+"""
+
+import logging
+
+import django_fbcanvas.settings as fb_settings
+from django_fbcanvas.fb_api import OpenFacebook
+from django_fbcanvas.exceptions import OpenFacebookException
+from django_fbcanvas.loader import LOADER_MAX_BATCH
+from django_fbcanvas.signals import facebook_app_requests_processed
+from django_fbcanvas.workers import get_worker_pool, PoolFull
+
+logger = logging.getLogger(__name__)
+
+
+def get_app_requests_pool():
+    """Returns the worker pool processing app requests"""
+    return get_worker_pool('app_requests',
+                           fb_settings.FACEBOOK_APP_REQUESTS_POOL_SIZE,
+                           fb_settings.FACEBOOK_APP_REQUESTS_MAX_PENDING)
+
+
+def get_full_request_ids(request_ids, user_id=None):
+    """Returns the full IDs (``<request_id>_<user_id>``) of the requests,
+    needed to access requests sent to ``user_id``.
+    """
+    if not user_id:
+        return [rid for rid in request_ids if rid]
+    return [rid if '_' in rid else '%s_%s' % (rid, user_id)
+            for rid in request_ids if rid]
+
+
+def process_app_requests(access_token, request_ids, user_id=None, app=None):
+    """Fetch and delete app requests, then send the
+    ``facebook_app_requests_processed`` signal.
+
+    :param access_token: Access token of the user who received the requests
+    :param request_ids: IDs of the requests, as received from Facebook
+    :param user_id: Facebook ID of the user who received the requests
+    :param app: The :py:class:`django_fbcanvas.app_registry.FacebookApp`
+    :returns: A dict mapping request IDs to the fetched requests
+    """
+    request_ids = get_full_request_ids(request_ids, user_id)
+    if not request_ids:
+        return {}
+    facebook = OpenFacebook(access_token, app=app)
+
+    app_requests = {}
+    for i in range(0, len(request_ids), LOADER_MAX_BATCH):
+        chunk = request_ids[i:i + LOADER_MAX_BATCH]
+        try:
+            app_requests.update(facebook.get_many(*chunk))
+        except OpenFacebookException, e:
+            logger.warn("Unable to fetch app requests %s: %s" % (','.join(chunk), e))
+
+    ## Requests that couldn't be read are left on Facebook
+    fetched_ids = [rid for rid in request_ids if rid in app_requests]
+    if fetched_ids:
+        results = facebook.batch([('DELETE', rid) for rid in fetched_ids])
+        for rid, result in zip(fetched_ids, results):
+            if isinstance(result, Exception):
+                logger.warn("Unable to delete app request %s: %s" % (rid, result))
+
+    facebook_app_requests_processed.send(
+        sender=OpenFacebook, app_requests=app_requests,
+        request_ids=request_ids, user_id=user_id, app=app)
+    return app_requests
+
+
+def _process_app_requests_logged(*args):
+    """Run :py:func:`process_app_requests`, logging failures, since
+    nobody waits for background jobs
+    """
+    try:
+        return process_app_requests(*args)
+    except Exception:
+        logger.exception("Failed processing app requests")
+        raise
+
+
+def process_app_requests_async(access_token, request_ids, user_id=None, app=None):
+    """Schedule :py:func:`process_app_requests` in the app requests pool.
+
+    :returns: The ``AsyncResult``, or ``None`` if the pool is full (the
+        requests are left on Facebook, and will be received again)
+    """
+    try:
+        return get_app_requests_pool().try_submit(
+            _process_app_requests_logged, access_token, request_ids, user_id, app)
+    except PoolFull:
+        logger.warn("App requests pool is full, not processing requests %s"
+                    % ','.join(request_ids))
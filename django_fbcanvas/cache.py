@@ -0,0 +1,311 @@
+"""django_fbcanvas - cache
+
+Caching of Graph API responses.
+
+:py:class:`GraphResponseCache` is an opt-in read-through cache for
+``GET`` requests performed by :py:meth:`django_fbcanvas.fb_api.OpenFacebook.get`.
+Responses are kept in an in-process LRU and, optionally, in a shared
+Django cache backend. The time-to-live of each response is chosen from
+``FACEBOOK_CACHE_TTL_RULES``, a list of ``(regex, ttl)`` tuples matched
+against the request path; paths not matching any rule are not cached.
+
+Example settings::
+
+    FACEBOOK_CACHE_ENABLED = True
+    FACEBOOK_CACHE_TTL_RULES = [
+        (r'^me/permissions$', 0),   ## Never cache
+        (r'^me(/.*)?$', 60),
+        (r'^\d+$', 3600),           ## Public objects: pages, apps, ...
+    ]
+    FACEBOOK_CACHE_BACKEND = 'default'
+"""
+
+import re
+import copy
+import time
+import uuid
+import hashlib
+import logging
+import threading
+
+from django_fbcanvas import settings as fb_settings
+from django_fbcanvas.utils import smart_str
+
+try:
+    from collections import OrderedDict
+except ImportError:
+    from django.utils.datastructures import SortedDict as OrderedDict
+
+logger = logging.getLogger(__name__)
+
+
+class LRUCache(object):
+    """Thread-safe, bounded, in-process LRU cache with per-entry
+    expiration.
+
+    :param maxsize: Maximum number of entries
+    """
+
+    def __init__(self, maxsize=1000):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, default=None):
+        """Return the value for ``key``, or ``default`` if it is
+        missing or expired.
+        """
+        with self._lock:
+            try:
+                expires, value = self._data.pop(key)
+            except KeyError:
+                self.misses += 1
+                return default
+            if expires is not None and expires <= time.time():
+                self.misses += 1
+                return default
+            ## Re-insert to mark as most recently used
+            self._data[key] = (expires, value)
+            self.hits += 1
+            return value
+
+    def set(self, key, value, expires=None):
+        """Store ``value`` for ``key``.
+
+        :param expires: Absolute (unix) time after which the entry
+            is discarded, or ``None`` to keep it until evicted.
+        """
+        with self._lock:
+            self._data.pop(key, None)
+            self._data[key] = (expires, value)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def delete_if(self, predicate):
+        """Delete all the entries for which ``predicate(key, value)``
+        is true; returns the number of deleted entries.
+        """
+        with self._lock:
+            keys = [key for key, (expires, value) in self._data.iteritems()
+                    if predicate(key, value)]
+            for key in keys:
+                del self._data[key]
+        return len(keys)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+    def stats(self):
+        """Returns a dict with hit/miss counters and the current size"""
+        return {'hits': self.hits, 'misses': self.misses, 'size': len(self._data)}
+
+
+def _token_id(access_token):
+    """Hash of an access token, so that tokens are never used as keys"""
+    return hashlib.sha1(smart_str(access_token)).hexdigest()
+
+
+def get_django_cache(alias):
+    """Returns the Django cache backend with the given alias"""
+    try:
+        from django.core.cache import caches
+        return caches[alias]
+    except ImportError:
+        ## Django < 1.7
+        from django.core.cache import get_cache
+        return get_cache(alias)
+
+
+## Marks missing entries in the local copies of shared values
+_MISSING = object()
+
+
+class SharedValues(object):
+    """Values stored in a Django cache shared by all the processes, read
+    through a local copy kept for ``check_interval`` seconds, so that the
+    shared cache is not queried on each request.
+
+    :param cache: The Django cache backend
+    :param maxsize: Maximum number of values kept locally
+    :param check_interval: Seconds after which values are read again
+        from the shared cache; defaults to ``FACEBOOK_DEAUTHORIZE_CHECK_INTERVAL``
+    """
+
+    def __init__(self, cache, maxsize=1000, check_interval=None):
+        if check_interval is None:
+            check_interval = fb_settings.FACEBOOK_DEAUTHORIZE_CHECK_INTERVAL
+        self.cache = cache
+        self.check_interval = check_interval
+        self.local = LRUCache(maxsize)
+
+    def get(self, key):
+        value = self.local.get(key, _MISSING)
+        if value is _MISSING:
+            value = self.cache.get(key)
+            self.local.set(key, value, time.time() + self.check_interval)
+        return value
+
+    def set(self, key, value, timeout):
+        self.cache.set(key, value, timeout)
+        self.local.set(key, value, time.time() + self.check_interval)
+
+
+class GraphResponseCache(object):
+    """Two-tier (in-process LRU + shared Django cache) cache for
+    Graph API ``GET`` responses.
+
+    :param ttl_rules: List of ``(regex, ttl)`` tuples. The first regex
+        matching the request path determines the TTL, in seconds,
+        for that response. A TTL of ``0`` means "don't cache".
+    :param maxsize: Maximum number of entries in the in-process LRU
+    :param backend: Alias of a Django cache backend used as shared
+        tier, or ``None`` to use the in-process tier only.
+    :param generations_backend: Alias of a Django cache backend, shared
+        by all the processes, storing the generation of each access
+        token (see :py:meth:`invalidate_token`), or ``None``. Generations
+        are read through :py:class:`SharedValues`.
+    """
+
+    def __init__(self, ttl_rules=None, maxsize=None, backend=None,
+                 generations_backend=None):
+        if ttl_rules is None:
+            ttl_rules = fb_settings.FACEBOOK_CACHE_TTL_RULES
+        if maxsize is None:
+            maxsize = fb_settings.FACEBOOK_CACHE_MAX_ENTRIES
+        self.ttl_rules = [(re.compile(regex), ttl) for regex, ttl in ttl_rules]
+        self.max_ttl = max([ttl for regex, ttl in ttl_rules] or [0])
+        self.local = LRUCache(maxsize)
+        ## Keys of the responses stored by this process, by token
+        ## (see :py:meth:`invalidate_token`)
+        self._token_keys = LRUCache(maxsize)
+        self._token_keys_lock = threading.Lock()
+        self.shared = get_django_cache(backend) if backend else None
+        self.generations = None
+        if generations_backend:
+            self.generations = SharedValues(get_django_cache(generations_backend), maxsize)
+        self.shared_hits = 0
+        self.stores = 0
+
+    def get_ttl(self, path):
+        """Returns the TTL for responses for ``path``"""
+        path = path.strip('/')
+        for regex, ttl in self.ttl_rules:
+            if regex.match(path):
+                return ttl
+        return 0
+
+    def _generation_key(self, token_id):
+        return 'fbcanvas:token_generation:%s' % token_id
+
+    def make_key(self, path, params, access_token=None):
+        """Build the cache key for a request.
+
+        The access token is hashed, so tokens never end up in
+        the (shared) cache.
+        """
+        items = sorted((smart_str(k), smart_str(v)) for k, v in params.items())
+        token_id = '-'
+        if access_token:
+            token_id = _token_id(access_token)
+            if self.generations is not None:
+                token_id = '%s|%s' % (token_id, self.generations.get(self._generation_key(token_id)))
+        raw_key = '%s|%s|%s' % (smart_str(path.strip('/')), items, token_id)
+        return 'fbcanvas:graph:%s' % hashlib.sha1(raw_key).hexdigest()
+
+    def get_or_fetch(self, path, params, access_token, fetch):
+        """Return the cached response for the request, or call
+        ``fetch()`` and cache its result.
+
+        A copy of the cached object is returned, so that callers
+        can't alter the cache contents.
+        """
+        ttl = self.get_ttl(path)
+        if not ttl:
+            return fetch()
+
+        key = self.make_key(path, params, access_token)
+        response = self.local.get(key)
+        if response is None and self.shared is not None:
+            response = self.shared.get(key)
+            if response is not None:
+                self.shared_hits += 1
+                self.local.set(key, response, time.time() + ttl)
+        if response is None:
+            response = fetch()
+            self.stores += 1
+            self.local.set(key, response, time.time() + ttl)
+            if self.shared is not None:
+                self.shared.set(key, response, ttl)
+            if access_token:
+                self._remember_key(access_token, key)
+        return copy.deepcopy(response)
+
+    def _remember_key(self, access_token, key):
+        token_id = _token_id(access_token)
+        with self._token_keys_lock:
+            keys = self._token_keys.get(token_id) or set()
+            keys.add(key)
+            self._token_keys.set(token_id, keys, time.time() + self.max_ttl)
+
+    def invalidate_token(self, access_token):
+        """Discard the responses cached for ``access_token``, eg. when
+        the user deauthorizes the app.
+
+        If ``generations_backend`` is set, the generation of the token
+        is changed, so that all the processes stop finding the responses
+        cached for it, which then expire with their TTL. Else, only the
+        responses stored by this process are discarded.
+        """
+        token_id = _token_id(access_token)
+        if self.generations is not None and self.max_ttl:
+            ## Old generations must not come back before all the
+            ## responses cached with them have expired
+            self.generations.set(self._generation_key(token_id),
+                                 uuid.uuid4().hex, self.max_ttl)
+        with self._token_keys_lock:
+            keys = self._token_keys.get(token_id)
+            self._token_keys.delete(token_id)
+        if not keys:
+            return
+        for key in keys:
+            self.local.delete(key)
+        if self.shared is not None:
+            self.shared.delete_many(list(keys))
+
+    def clear(self):
+        """Clear the in-process tier"""
+        self.local.clear()
+
+    def stats(self):
+        """Returns a dict with the cache counters"""
+        stats = self.local.stats()
+        stats['shared_hits'] = self.shared_hits
+        stats['stores'] = self.stores
+        return stats
+
+
+_response_cache = None
+_response_cache_lock = threading.Lock()
+
+def get_response_cache():
+    """Returns the process-wide :py:class:`GraphResponseCache`
+    configured from settings.
+    """
+    global _response_cache
+    if _response_cache is None:
+        with _response_cache_lock:
+            if _response_cache is None:
+                _response_cache = GraphResponseCache(
+                    backend=fb_settings.FACEBOOK_CACHE_BACKEND,
+                    generations_backend=fb_settings.FACEBOOK_DEAUTHORIZE_CACHE_BACKEND)
+    return _response_cache
@@ -0,0 +1,175 @@
+"""django_fbcanvas - circuitbreaker
+
+Circuit breakers for requests to the Facebook APIs.
+
+When too many requests to a host (and, optionally, path prefix) fail
+or are too slow, the circuit "opens" and further requests fail
+immediately with :py:class:`django_fbcanvas.exceptions.CircuitOpenException`,
+instead of holding a worker for the whole timeout. After
+``FACEBOOK_CIRCUIT_RESET_TIMEOUT`` seconds, a limited number of "probe"
+requests is let through (half-open state): if they succeed the circuit
+is closed again, else it is re-opened.
+"""
+
+import time
+import logging
+import threading
+import urlparse
+
+import django_fbcanvas.settings as fb_settings
+
+logger = logging.getLogger(__name__)
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half-open'
+
+
+class _Probe(object):
+    """Returned by :py:meth:`CircuitBreaker.allow_request` for requests
+    let through as probes, in the half-open period ``epoch``
+    """
+
+    def __init__(self, epoch):
+        self.epoch = epoch
+
+
+class CircuitBreaker(object):
+    """A single circuit breaker.
+
+    :param name: Name of the circuit, for logging
+    :param failure_threshold: Number of consecutive failures (or slow
+        calls) after which the circuit opens
+    :param slow_call_threshold: Duration, in seconds, above which a
+        successful call is counted as a failure; ``None`` to disable
+    :param reset_timeout: Seconds after which an open circuit lets
+        probe requests through
+    :param half_open_max_calls: Number of concurrent probe requests
+        allowed in half-open state
+    """
+
+    def __init__(self, name, failure_threshold=5, slow_call_threshold=None,
+                 reset_timeout=30, half_open_max_calls=1):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.slow_call_threshold = slow_call_threshold
+        self.reset_timeout = reset_timeout
+        self.half_open_max_calls = half_open_max_calls
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = None
+        self._probes = 0
+        self._epoch = 0
+        self._lock = threading.Lock()
+
+    def allow_request(self):
+        """Whether a request can be performed now.
+        
+        :returns: ``False`` if the request must not be performed, else
+            a true value that must be passed back to :py:meth:`record`
+            with the outcome of the request.
+        """
+        with self._lock:
+            if self.state == CLOSED:
+                return True
+            if self.state == OPEN:
+                if time.time() - self.opened_at < self.reset_timeout:
+                    return False
+                logger.info("Circuit %s is half-open, sending probe requests", self.name)
+                self.state = HALF_OPEN
+                self._probes = 0
+                self._epoch += 1
+            if self._probes >= self.half_open_max_calls:
+                return False
+            self._probes += 1
+            return _Probe(self._epoch)
+
+    def record(self, success, duration=None, allowed=True):
+        """Report the outcome of a request.
+        
+        :param allowed: The value returned by :py:meth:`allow_request`
+            for the request
+        """
+        if success and self.slow_call_threshold is not None and \
+                duration is not None and duration > self.slow_call_threshold:
+            success = False
+        with self._lock:
+            if isinstance(allowed, _Probe) and allowed.epoch == self._epoch \
+                    and self.state == HALF_OPEN:
+                ## Only probes of the current half-open period count
+                ## against half_open_max_calls: calls let through while
+                ## closed may finish when already half-open
+                self._probes -= 1
+            if success:
+                if self.state != CLOSED:
+                    logger.info("Circuit %s closed", self.name)
+                self.state = CLOSED
+                self.failures = 0
+                return
+            self.failures += 1
+            if self.state == HALF_OPEN or self.failures >= self.failure_threshold:
+                if self.state != OPEN:
+                    logger.warn("Circuit %s opened after %d failures", self.name, self.failures)
+                self.state = OPEN
+                self.opened_at = time.time()
+
+    def retry_after(self):
+        """Seconds before the circuit will let probes through"""
+        if self.state != OPEN:
+            return 0
+        return max(0, self.reset_timeout - (time.time() - self.opened_at))
+
+
+class CircuitBreakerRegistry(object):
+    """Keeps a :py:class:`CircuitBreaker` for each host or, if
+    ``path_prefixes`` is given, for each host and path prefix.
+
+    :param path_prefixes: List of path prefixes (eg. ``['fql.query']``)
+        tracked by circuits separated from the rest of their host
+    """
+
+    def __init__(self, path_prefixes=None, **breaker_kwargs):
+        self.path_prefixes = [p.strip('/') for p in (path_prefixes or [])]
+        self.breaker_kwargs = breaker_kwargs
+        self._breakers = {}
+        self._lock = threading.Lock()
+
+    def get_key(self, url):
+        parsed = urlparse.urlsplit(url)
+        path = parsed.path.lstrip('/')
+        for prefix in self.path_prefixes:
+            if path.startswith(prefix):
+                return '%s/%s' % (parsed.netloc, prefix)
+        return parsed.netloc
+
+    def get_breaker(self, url):
+        """Returns the breaker for the given URL"""
+        key = self.get_key(url)
+        breaker = self._breakers.get(key)
+        if breaker is None:
+            with self._lock:
+                breaker = self._breakers.get(key)
+                if breaker is None:
+                    breaker = self._breakers[key] = CircuitBreaker(key, **self.breaker_kwargs)
+        return breaker
+
+
+_registry = None
+_registry_lock = threading.Lock()
+
+def get_circuit_breakers():
+    """Returns the process-wide :py:class:`CircuitBreakerRegistry`
+    configured in settings, or ``None`` if disabled.
+    """
+    global _registry
+    if not fb_settings.FACEBOOK_CIRCUIT_BREAKER:
+        return None
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                _registry = CircuitBreakerRegistry(
+                    path_prefixes=fb_settings.FACEBOOK_CIRCUIT_PATH_PREFIXES,
+                    failure_threshold=fb_settings.FACEBOOK_CIRCUIT_FAILURE_THRESHOLD,
+                    slow_call_threshold=fb_settings.FACEBOOK_CIRCUIT_SLOW_CALL_THRESHOLD,
+                    reset_timeout=fb_settings.FACEBOOK_CIRCUIT_RESET_TIMEOUT)
+    return _registry
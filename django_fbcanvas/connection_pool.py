@@ -0,0 +1,327 @@
+"""django_fbcanvas - connection_pool
+
+Pool of persistent (keep-alive) HTTPS connections to the Facebook API
+hosts, used to avoid a new TCP connection and TLS handshake on each
+Graph API request.
+
+Connections are kept per ``(scheme, host, port)``, are thread-safe to
+check in / check out, idle connections are reaped after
+``FACEBOOK_HTTP_POOL_IDLE_TIMEOUT`` seconds and the whole pool is
+discarded when a process is forked (eg. by prefork workers), since
+sockets must not be shared between processes.
+"""
+
+import os
+import time
+import socket
+import httplib
+import logging
+import threading
+import urlparse
+
+import django_fbcanvas.settings as fb_settings
+
+logger = logging.getLogger(__name__)
+
+
+class HostConnectionPool(object):
+    """Pool of persistent connections to a single host.
+
+    :param scheme: Either ``"http"`` or ``"https"``
+    :param host: Host name
+    :param port: Port number, or ``None`` for the scheme default
+    :param maxsize: Maximum number of idle connections kept
+    :param idle_timeout: Seconds after which an idle connection
+        is closed instead of being reused.
+    """
+
+    def __init__(self, scheme, host, port=None, maxsize=10, idle_timeout=60):
+        self.scheme = scheme
+        self.host = host
+        self.port = port
+        self.maxsize = maxsize
+        self.idle_timeout = idle_timeout
+        self._lock = threading.Lock()
+        ## Stack of (last_used, connection), most recently used last
+        self._idle = []
+        self._last_reap = time.time()
+
+    def new_connection(self, timeout=None):
+        """Open a new connection, not taken from the idle ones"""
+        if self.scheme == 'https':
+            conn_class = httplib.HTTPSConnection
+        else:
+            conn_class = httplib.HTTPConnection
+        logger.debug("Opening new connection to %s://%s", self.scheme, self.host)
+        return conn_class(self.host, self.port, timeout=timeout)
+
+    def _pop_stale(self, now):
+        """Remove the connections idle for too long from the stack and
+        return them; must be called holding the lock.
+        """
+        stale = [c for t, c in self._idle if now - t > self.idle_timeout]
+        if stale:
+            self._idle = [(t, c) for t, c in self._idle if now - t <= self.idle_timeout]
+        self._last_reap = now
+        return stale
+
+    def get(self, timeout=None):
+        """Check out a connection, reusing an idle one if available"""
+        now = time.time()
+        stale = []
+        conn = None
+        with self._lock:
+            ## The oldest connections, at the bottom of the stack, are
+            ## not reached below under steady load: reap them periodically
+            if now - self._last_reap > self.idle_timeout:
+                stale = self._pop_stale(now)
+            while self._idle:
+                last_used, _conn = self._idle.pop()
+                if now - last_used > self.idle_timeout:
+                    stale.append(_conn)
+                else:
+                    conn = _conn
+                    break
+        for _conn in stale:
+            _conn.close()
+        if conn is None:
+            conn = self.new_connection(timeout)
+        else:
+            ## Apply the timeout for this request to the reused socket
+            conn.timeout = timeout
+            if conn.sock is not None:
+                conn.sock.settimeout(timeout)
+        return conn
+
+    def put(self, conn):
+        """Return a connection to the pool, closing it if the pool is full"""
+        with self._lock:
+            if len(self._idle) < self.maxsize:
+                self._idle.append((time.time(), conn))
+                return
+        conn.close()
+
+    def reap(self):
+        """Close all the connections that have been idle for too long"""
+        with self._lock:
+            stale = self._pop_stale(time.time())
+        for conn in stale:
+            conn.close()
+        return len(stale)
+
+    def close(self):
+        """Close all the idle connections"""
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for t, conn in idle:
+            conn.close()
+
+
+class ConnectionPoolManager(object):
+    """Keeps a :py:class:`HostConnectionPool` for each host, and takes
+    care of resetting them after a ``fork()``.
+    """
+
+    def __init__(self, maxsize=None, idle_timeout=None):
+        if maxsize is None:
+            maxsize = fb_settings.FACEBOOK_HTTP_POOL_SIZE
+        if idle_timeout is None:
+            idle_timeout = fb_settings.FACEBOOK_HTTP_POOL_IDLE_TIMEOUT
+        self.maxsize = maxsize
+        self.idle_timeout = idle_timeout
+        self._lock = threading.Lock()
+        self._pools = {}
+        self._pid = os.getpid()
+
+    def _check_fork(self):
+        """Drop pools inherited from the parent process.
+
+        The sockets are *not* closed, since they are still in use
+        by the parent: we just forget about them.
+        """
+        pid = os.getpid()
+        if pid != self._pid:
+            with self._lock:
+                if pid != self._pid:
+                    logger.debug("Fork detected, resetting connection pools")
+                    self._pools = {}
+                    self._lock = threading.Lock()
+                    self._pid = pid
+
+    def get_pool(self, scheme, host, port=None):
+        """Get the pool for the given host, creating it if needed"""
+        self._check_fork()
+        key = (scheme, host, port)
+        pool = self._pools.get(key)
+        if pool is None:
+            with self._lock:
+                pool = self._pools.get(key)
+                if pool is None:
+                    pool = self._pools[key] = HostConnectionPool(
+                        scheme, host, port, maxsize=self.maxsize,
+                        idle_timeout=self.idle_timeout)
+        return pool
+
+    def reap(self):
+        """Close idle connections on all the pools"""
+        self._check_fork()
+        return sum(pool.reap() for pool in self._pools.values())
+
+    def clear(self):
+        """Close all the idle connections and drop all the pools"""
+        with self._lock:
+            pools, self._pools = self._pools, {}
+        for pool in pools.values():
+            pool.close()
+
+    def urlopen(self, url, post_string=None, headers=None, timeout=None):
+        """Perform a request to ``url`` using a pooled connection.
+
+        :param url: The full URL to be requested
+        :param post_string: Already-encoded POST body. If ``None``,
+            a GET request is performed.
+        :param headers: Dict of extra HTTP headers
+        :param timeout: Socket timeout, in seconds
+        :returns: a ``(status, body)`` tuple
+        :raises: :py:class:`ConnectError` if the connection to the host
+            could not be established, so that the request was never sent;
+            ``socket.error`` (including ``socket.timeout``) or
+            ``httplib.HTTPException`` on errors after that.
+        """
+        response = self.urlopen_stream(url, post_string, headers, timeout)
+        try:
+            return response.status, response.read()
+        finally:
+            response.close()
+
+    def urlopen_stream(self, url, post_string=None, headers=None, timeout=None):
+        """Like :py:meth:`urlopen`, but returns a :py:class:`PooledResponse`
+        from which the body can be read incrementally.
+        """
+        parsed = urlparse.urlsplit(url)
+        pool = self.get_pool(parsed.scheme, parsed.hostname, parsed.port)
+        path = parsed.path or '/'
+        if parsed.query:
+            path += '?' + parsed.query
+
+        _headers = {'Connection': 'keep-alive'}
+        if headers:
+            _headers.update(headers)
+        if post_string is not None:
+            method = 'POST'
+            _headers.setdefault('Content-Type', 'application/x-www-form-urlencoded')
+        else:
+            method = 'GET'
+
+        conn = pool.get(timeout)
+        try:
+            response = self._send(conn, method, path, post_string, _headers)
+        except _StaleConnection:
+            ## The server closed the idle connection on its side, before
+            ## receiving the request: send it again on a new connection
+            logger.debug("Pooled connection to %s was dropped, reconnecting", parsed.hostname)
+            conn = pool.new_connection(timeout)
+            response = self._send(conn, method, path, post_string, _headers)
+        return PooledResponse(pool, conn, response)
+
+    def _send(self, conn, method, path, body, headers):
+        """Send a request and read the response headers.
+
+        :raises: :py:class:`_StaleConnection` if the request failed on a
+            reused connection in a way meaning that it never reached the
+            server, and it can be safely sent again (only for ``GET``).
+        """
+        ## Connections never used yet have no socket
+        resendable = conn.sock is not None and method == 'GET'
+        if conn.sock is None:
+            try:
+                conn.connect()
+            except socket.error, e:
+                conn.close()
+                raise ConnectError(e)
+        try:
+            conn.request(method, path, body, headers)
+        except socket.timeout:
+            conn.close()
+            raise
+        except socket.error:
+            ## eg. broken pipe or connection reset, when sending
+            conn.close()
+            if resendable:
+                raise _StaleConnection()
+            raise
+        try:
+            return conn.getresponse()
+        except httplib.BadStatusLine, e:
+            conn.close()
+            ## Connection closed without sending any response bytes
+            ## (the message changed in Python 2.7.15)
+            if resendable and (not e.line.strip("'\"") or e.line.startswith('No status line')):
+                raise _StaleConnection()
+            raise
+        except (socket.error, httplib.HTTPException):
+            ## Including timeouts: the request may have been processed
+            conn.close()
+            raise
+
+
+class ConnectError(Exception):
+    """Raised when the connection to the host could not be established,
+    so that the request was never sent.
+
+    :param reason: The original ``socket.error``
+    """
+
+    def __init__(self, reason):
+        Exception.__init__(self, reason)
+        self.reason = reason
+
+
+class _StaleConnection(Exception):
+    """Raised when a request failed on a connection closed by the server"""
+
+
+class PooledResponse(object):
+    """File-like response from a pooled connection.
+
+    The connection is returned to the pool on :py:meth:`close`, if the
+    body was read completely; else it is closed.
+    """
+
+    def __init__(self, pool, conn, response):
+        self.pool = pool
+        self.conn = conn
+        self.response = response
+        self.status = response.status
+
+    def read(self, size=None):
+        try:
+            if size is None:
+                return self.response.read()
+            return self.response.read(size)
+        except (socket.error, httplib.HTTPException):
+            self.conn.close()
+            self.conn = None
+            raise
+
+    def close(self):
+        conn, self.conn = self.conn, None
+        if conn is None:
+            return
+        if self.response.isclosed() and not self.response.will_close:
+            self.pool.put(conn)
+        else:
+            conn.close()
+
+
+_pool_manager = None
+_pool_manager_lock = threading.Lock()
+
+def get_pool_manager():
+    """Returns the process-wide :py:class:`ConnectionPoolManager`"""
+    global _pool_manager
+    if _pool_manager is None:
+        with _pool_manager_lock:
+            if _pool_manager is None:
+                _pool_manager = ConnectionPoolManager()
+    return _pool_manager
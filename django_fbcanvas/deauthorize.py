@@ -0,0 +1,176 @@
+"""django_fbcanvas - deauthorize
+
+Processing of app deauthorizations.
+
+The deauthorize callback (:py:func:`django_fbcanvas.views.fb_deauthorize`)
+only verifies the signed request and stores the user into the
+:py:class:`django_fbcanvas.models.DeauthorizeQueueEntry` table, so that
+it answers in milliseconds even during bursts.
+
+The queue is then processed in batches of ``FACEBOOK_DEAUTHORIZE_BATCH_SIZE``
+by :py:func:`process_queue`, either by the
+``fbcanvas_process_deauthorizations`` management command::
+
+    ./manage.py fbcanvas_process_deauthorizations --interval 10
+
+or, if ``FACEBOOK_DEAUTHORIZE_IN_PROCESS`` is enabled, in a background
+thread started by the callback itself.
+
+For each batch, the access tokens and permissions of the users are
+cleared with a single ``UPDATE``, the cached data of the users is
+discarded and :py:data:`django_fbcanvas.signals.facebook_user_deauthorized`
+is sent for each user.
+
+Since the queue may be processed by another process, deauthorizations
+are announced to all the processes through the Django cache
+``FACEBOOK_DEAUTHORIZE_CACHE_BACKEND``, if set, which must be shared by
+them (each process reads it at most every
+``FACEBOOK_DEAUTHORIZE_CHECK_INTERVAL`` seconds for each user):
+
+- the callback stores the deauthorization time of the user, and signed
+  requests issued before it are rejected (see :py:func:`is_deauthorized`)
+- the generation of the access tokens of the users is changed, so that
+  the Graph API responses cached for them are not found anymore (see
+  :py:meth:`django_fbcanvas.cache.GraphResponseCache.invalidate_token`)
+"""
+
+import time
+import logging
+
+import django_fbcanvas.settings as fb_settings
+from django_fbcanvas.models import FacebookUser, DeauthorizeQueueEntry
+from django_fbcanvas.signals import facebook_user_deauthorized
+from django_fbcanvas.cache import get_response_cache, get_django_cache, SharedValues
+from django_fbcanvas.workers import get_worker_pool, PoolFull
+from django_fbcanvas.app_registry import get_app
+
+logger = logging.getLogger(__name__)
+
+
+_deauthorize_cache = None
+
+def get_deauthorize_cache():
+    """Returns the :py:class:`django_fbcanvas.cache.SharedValues` for
+    the Django cache shared by all the processes, or ``None``
+    """
+    global _deauthorize_cache
+    if not fb_settings.FACEBOOK_DEAUTHORIZE_CACHE_BACKEND:
+        return None
+    if _deauthorize_cache is None:
+        _deauthorize_cache = SharedValues(
+            get_django_cache(fb_settings.FACEBOOK_DEAUTHORIZE_CACHE_BACKEND),
+            fb_settings.FACEBOOK_SIGNED_REQUEST_CACHE_SIZE)
+    return _deauthorize_cache
+
+
+def _deauthorized_key(app_id, facebook_id):
+    return 'fbcanvas:deauthorized:%s:%s' % (app_id, facebook_id)
+
+
+def is_deauthorized(app_id, facebook_id, issued_at=None):
+    """Whether the user deauthorized the app after ``issued_at``
+    (eg. the time a signed request was issued), or at all if ``None``.
+    """
+    cache = get_deauthorize_cache()
+    if cache is None:
+        return False
+    deauthorized_at = cache.get(_deauthorized_key(app_id, facebook_id))
+    if deauthorized_at is None:
+        return False
+    return issued_at is None or issued_at <= deauthorized_at
+
+
+def enqueue_deauthorization(facebook_id, app_id=''):
+    """Queue the deauthorization of the app by a user"""
+    app_id = app_id or get_app().app_id
+    cache = get_deauthorize_cache()
+    if cache is not None:
+        cache.set(_deauthorized_key(app_id, facebook_id), time.time(),
+                  fb_settings.FACEBOOK_DEAUTHORIZE_MARKER_TTL)
+    DeauthorizeQueueEntry.objects.create(facebook_id=facebook_id, app_id=app_id)
+    if fb_settings.FACEBOOK_DEAUTHORIZE_IN_PROCESS:
+        process_queue_async()
+
+
+def deauthorize_users(facebook_ids, app_id=''):
+    """Clear the access tokens and permissions of the given users,
+    and discard their cached data.
+
+    :param app_id: ID of the app the users deauthorized
+    :returns: The number of updated users
+    """
+    facebook_ids = list(facebook_ids)
+    users = FacebookUser.objects.filter(facebook_id__in=facebook_ids)
+    access_tokens = list(users.exclude(access_token='').values_list('access_token', flat=True))
+    updated = users.update(access_token='', granted_permissions='')
+
+    ## Cached Graph API responses for the users
+    if fb_settings.FACEBOOK_CACHE_ENABLED:
+        response_cache = get_response_cache()
+        for access_token in access_tokens:
+            response_cache.invalidate_token(access_token)
+
+    ## Verified signed requests for the users cached by this process;
+    ## other processes reject them using is_deauthorized()
+    from django_fbcanvas.middleware import signed_request_cache
+    user_ids = set(str(facebook_id) for facebook_id in facebook_ids)
+    signed_request_cache.delete_if(
+        lambda key, data: (not app_id or key[0] == app_id) and
+        str(data.get('user_id')) in user_ids)
+
+    for facebook_id in facebook_ids:
+        facebook_user_deauthorized.send(sender=FacebookUser, facebook_id=facebook_id,
+                                        app_id=app_id)
+    return updated
+
+
+def process_queue(batch_size=None):
+    """Process all the queued deauthorizations, in batches.
+
+    Processing is idempotent, so that running more consumers at once,
+    or again after a failure, is safe.
+
+    :returns: The number of processed queue entries
+    """
+    if batch_size is None:
+        batch_size = fb_settings.FACEBOOK_DEAUTHORIZE_BATCH_SIZE
+    processed = 0
+    while True:
+        entries = list(DeauthorizeQueueEntry.objects.order_by('pk')
+                       .values_list('pk', 'facebook_id', 'app_id')[:batch_size])
+        if not entries:
+            return processed
+        pks = [pk for pk, facebook_id, app_id in entries]
+        by_app = {}
+        for pk, facebook_id, app_id in entries:
+            by_app.setdefault(app_id, set()).add(facebook_id)
+        updated = 0
+        for app_id, facebook_ids in by_app.items():
+            updated += deauthorize_users(facebook_ids, app_id)
+        DeauthorizeQueueEntry.objects.filter(pk__in=pks).delete()
+        logger.info("Processed %d deauthorizations (%d users updated)" % (len(pks), updated))
+        processed += len(pks)
+
+
+def _process_queue_logged():
+    """Run :py:func:`process_queue`, logging failures, since
+    nobody waits for background jobs
+    """
+    try:
+        return process_queue()
+    except Exception:
+        logger.exception("Failed processing deauthorizations")
+        raise
+
+
+def process_queue_async():
+    """Run :py:func:`process_queue` in a background thread, unless
+    one is already scheduled.
+    """
+    ## One job running, plus one scheduled to pick up the entries
+    ## queued after the running one finished reading them
+    pool = get_worker_pool('deauthorize', 1, 2)
+    try:
+        return pool.try_submit(_process_queue_logged)
+    except PoolFull:
+        pass
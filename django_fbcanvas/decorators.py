@@ -10,11 +10,12 @@ from django_fbcanvas import settings as fb_settings
 from django_fbcanvas.utils import str_to_list
 from django_fbcanvas.exceptions import OpenFacebookException
 from django_fbcanvas.fb_api import oauth_start
+from django_fbcanvas.app_registry import get_app
 
 logger = logging.getLogger(__name__)
 
 
-def facebook_required(view_func=None, scope=fb_settings.FACEBOOK_DEFAULT_SCOPE,
+def facebook_required(view_func=None, scope=None,
                       redirect_field_name=REDIRECT_FIELD_NAME, login_url=None,
                       extra_params=None):
     """Decorator which makes the view require the given Facebook
@@ -29,7 +30,9 @@ def facebook_required(view_func=None, scope=fb_settings.FACEBOOK_DEFAULT_SCOPE,
        on each request..
 
     :param view_func: The view function that will be decorated
-    :param scope: List of names of permissions that will be required
+    :param scope: List of names of permissions that will be required.
+        Defaults to the ``default_scope`` of the app serving the request
+        (see :py:mod:`django_fbcanvas.app_registry`).
     :param redirect_field_name:
     :param login_url: URL of the login page, in case permissions
         checking fails.
@@ -39,18 +42,27 @@ def facebook_required(view_func=None, scope=fb_settings.FACEBOOK_DEFAULT_SCOPE,
     if scope:
         scope_list = str_to_list(scope, separator=",")
     else:
-        scope_list = fb_settings.FACEBOOK_DEFAULT_SCOPE
+        scope_list = None
     
     def actual_decorator(view_func):
         @wraps(view_func, assigned=available_attrs(view_func))
         def _wrapped_view(request, *args, **kwargs):
+            _scope_list = scope_list
+            if _scope_list is None:
+                _scope_list = (getattr(request, 'fb_app', None) or get_app()).default_scope
+            
+            ## Log in the user from the signed request, if any, in case
+            ## the middleware didn't process it yet
+            fb_info = getattr(request, 'fb_info', None)
+            if hasattr(fb_info, 'evaluate'):
+                fb_info.evaluate()
             
             ## If the user is not logged in -> go to oauth
             ## If the logged-in user is not connected with facebook -> go to oauth
             
             if not request.user.is_authenticated() \
                 or not request.user.facebookuser.access_token:
-                return oauth_start(request, scope=scope_list)
+                return oauth_start(request, scope=_scope_list)
             
             
             return view_func(request, *args, **kwargs)
@@ -62,7 +74,7 @@ def facebook_required(view_func=None, scope=fb_settings.FACEBOOK_DEFAULT_SCOPE,
                 ## if so, re-raise exception.
                 ## Else, redirect to oauth url
                 
-                return oauth_start(request, scope=scope_list)
+                return oauth_start(request, scope=_scope_list)
             
 #            oauth_url, redirect_uri = get_oauth_url(request, scope_list)
 #            if test_permissions(request, scope_list, redirect_uri):
@@ -81,6 +93,22 @@ def facebook_required(view_func=None, scope=fb_settings.FACEBOOK_DEFAULT_SCOPE,
     return actual_decorator
 
 
+def facebook_eager(view_func):
+    """Mark a view as requiring ``request.fb_info`` to be evaluated
+    before it is called, even when the middleware evaluates it lazily.
+    
+    Useful for views that need the user to be logged in from a signed
+    request before they run, or the CSRF bypass for signed requests.
+    
+    .. NOTE::
+       ``FacebookRequestMiddleware`` must go before CsrfMiddleware.
+    """
+    def wrapped_view(*args, **kwargs):
+        return view_func(*args, **kwargs)
+    wrapped_view.facebook_eager = True
+    return wraps(view_func, assigned=available_attrs(view_func))(wrapped_view)
+
+
 #def facebook_required_lazy(view_func=None,
 #                           scope=fb_settings.FACEBOOK_DEFAULT_SCOPE,
 #                           redirect_field_name=REDIRECT_FIELD_NAME,
@@ -3,6 +3,8 @@
 See also: http://fbdevwiki.com/wiki/Error_codes#User_Permission_Errors
 """
 
+import sys
+import bisect
 import logging
 logger = logging.getLogger(__name__)
 
@@ -57,6 +59,56 @@ class UnknownException(OpenFacebookException):
     codes = 1
 
 
+class TransientException(OpenFacebookException):
+    """Base class for temporary errors: the same request may succeed
+    if retried later.
+    """
+    pass
+
+
+class ServiceUnavailableException(TransientException):
+    """Service temporarily unavailable.
+    
+    Codes: ``2``
+    """
+    codes = 2
+
+
+class TooManyCallsException(TransientException):
+    """Application or user request limit reached.
+    
+    Codes: ``4, 17``
+    """
+    codes = [4, 17]
+
+
+class RateLimitExceeded(OpenFacebookException):
+    """Raised when a request is not performed because the client-side
+    rate limit was reached (see :py:mod:`django_fbcanvas.ratelimit`).
+    
+    ``retry_after`` is the number of seconds after which the request
+    could be performed, if known.
+    """
+    
+    def __init__(self, message, retry_after=None):
+        super(RateLimitExceeded, self).__init__(message)
+        self.retry_after = retry_after
+
+
+class CircuitOpenException(OpenFacebookException):
+    """Raised without performing the request when the circuit breaker
+    for the API host is open, ie. when too many recent requests failed
+    (see :py:mod:`django_fbcanvas.circuitbreaker`).
+    
+    ``retry_after`` is the number of seconds after which requests
+    will be attempted again.
+    """
+    
+    def __init__(self, message, retry_after=None):
+        super(CircuitOpenException, self).__init__(message)
+        self.retry_after = retry_after
+
+
 class OAuthException(OpenFacebookException):
     """Base exception for OAuth errors"""
     pass
@@ -107,3 +159,97 @@ class AliasException(OpenFacebookException):
     Codes: ``803``
     """
     codes = 803
+
+
+class InvalidSignedRequest(ValueError):
+    """Raised when a ``signed_request`` is malformed or its signature
+    doesn't match (see :py:class:`django_fbcanvas.utils.SignedRequestVerifier`).
+    """
+    pass
+
+
+class ErrorCodeIndex(object):
+    """Precomputed mapping of error codes to exception classes.
+    
+    Built once from the ``codes`` of the exception classes, so that
+    finding the class for an error doesn't require scanning all of
+    them. As a class may match many codes, the most specific one
+    (ie. the one with the smallest :py:meth:`OpenFacebookException.errorcode_range`)
+    wins.
+    
+    - Single codes are kept in a dict.
+    - Code ranges are split into non-overlapping intervals, looked
+      up by bisection.
+    - String codes (matched against the error message) are kept in
+      a list, in order of specificity.
+    """
+    
+    def __init__(self, exception_classes):
+        exception_classes = sorted(exception_classes, key=lambda e: e.errorcode_range())
+        self.codes = {}
+        self.strings = []
+        ranges = []
+        for rank, class_ in enumerate(exception_classes):
+            for code in class_.codes_list():
+                if isinstance(code, basestring):
+                    self.strings.append((rank, code, class_))
+                elif isinstance(code, tuple):
+                    ranges.append((rank, code[0], code[1], class_))
+                elif isinstance(code, (int, long)):
+                    self.codes.setdefault(int(code), (rank, class_))
+                else:
+                    raise ValueError('Dont know how to handle %s of ' \
+                                     'type %s' % (code, type(code)))
+        self._build_intervals(ranges)
+    
+    def _build_intervals(self, ranges):
+        """Split (possibly overlapping) ranges into sorted, disjoint
+        intervals, each one assigned to the most specific class.
+        """
+        bounds = sorted(set([r[1] for r in ranges] + [r[2] + 1 for r in ranges]))
+        self.interval_starts = []
+        self.intervals = []
+        for start, next_start in zip(bounds, bounds[1:]):
+            matching = [(rank, class_) for rank, r_start, r_stop, class_ in ranges
+                        if r_start <= start and next_start - 1 <= r_stop]
+            if matching:
+                self.interval_starts.append(start)
+                self.intervals.append((start, next_start - 1, min(matching)))
+    
+    def _find_code(self, code):
+        found = self.codes.get(code)
+        idx = bisect.bisect_right(self.interval_starts, code) - 1
+        if idx >= 0:
+            start, stop, match = self.intervals[idx]
+            if code <= stop and (found is None or match[0] < found[0]):
+                found = match
+        return found
+    
+    def get_class(self, code=None, message=None):
+        """Returns the exception class for the given error code
+        and/or message, or ``None``.
+        """
+        found = self._find_code(code) if code is not None else None
+        if message:
+            for rank, key, class_ in self.strings:
+                if found is not None and found[0] < rank:
+                    break
+                if key in message:
+                    found = (rank, class_)
+                    break
+        return found[1] if found else None
+    
+    @classmethod
+    def from_module(cls, module):
+        """Build an index from all the :py:class:`OpenFacebookException`
+        subclasses defining ``codes`` in ``module``.
+        """
+        exception_classes = [
+            e for e in [getattr(module, name) for name in dir(module)]
+            if isinstance(e, type) and issubclass(e, OpenFacebookException)
+            and getattr(e, 'codes', None)]
+        return cls(exception_classes)
+
+
+## Index of the exceptions defined in this module
+error_code_index = ErrorCodeIndex.from_module(sys.modules[__name__])
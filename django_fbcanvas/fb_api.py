@@ -3,14 +3,27 @@
 Utilities to connect to Facebook API"""
 
 import logging
-import urllib, urllib2
+import urllib
+import urlparse
+import time
 
 from django.http import QueryDict, HttpResponseRedirect
 
 import django_fbcanvas.exceptions as facebook_exceptions
+import django_fbcanvas.api_exceptions as api_exceptions
 from django_fbcanvas.utils import encode_params, to_int, json, str_to_list
 from django.core.urlresolvers import reverse
 import django_fbcanvas.settings as fb_settings
+from django_fbcanvas.transports import get_default_transport
+from django_fbcanvas.cache import get_response_cache
+from django_fbcanvas.singleflight import SingleFlight
+from django_fbcanvas.loader import GraphLoader
+from django_fbcanvas.jsonstream import iter_items
+from django_fbcanvas.retry import get_default_retry_policy, NO_RETRY
+from django_fbcanvas.ratelimit import get_rate_limiter
+from django_fbcanvas.circuitbreaker import get_circuit_breakers
+from django_fbcanvas.app_registry import get_app
+from django_fbcanvas.workers import get_worker_pool, CompletedResult, PoolFull
 import uuid
 import hashlib
 import re
@@ -40,7 +53,7 @@ def get_facebook(request, access_token=None):
     
     ## TODO: If the access_token is expired, raise an exception an redirect to OAuth
             
-    return OpenFacebook(access_token=access_token)
+    return OpenFacebook(access_token=access_token, app=getattr(request, 'fb_app', None))
     
 
 def oauth_start(request, scope=None, redirect_to=None):
@@ -60,9 +73,11 @@ def oauth_start(request, scope=None, redirect_to=None):
     _args['next'] = redirect_to
     _oauth_page += "?%s" % _args.urlencode()
     
+    app = getattr(request, 'fb_app', None) or get_app()
+    
     ## Permissions to be asked (aka SCOPE)
     if scope is None:
-        scope = fb_settings.FACEBOOK_DEFAULT_SCOPE
+        scope = app.default_scope
     else:
         scope = str_to_list(scope)
     
@@ -72,7 +87,7 @@ def oauth_start(request, scope=None, redirect_to=None):
     
     ## Build OAuth dialog URL
     qd = QueryDict('', True)
-    qd['client_id'] = fb_settings.FACEBOOK_APP_ID
+    qd['client_id'] = app.app_id
     qd['redirect_uri'] = _oauth_page
     qd['state'] = _state
     qd['scope'] = scope
@@ -81,16 +96,21 @@ def oauth_start(request, scope=None, redirect_to=None):
     
     return HttpResponseRedirect(dialog_url)
     
-def oauth_at_from_code(code, redirect_uri):
-    """Converts an intermediate OAuth code into access_token"""
+def oauth_at_from_code(code, redirect_uri, app=None):
+    """Converts an intermediate OAuth code into access_token
+    
+    :param app: The :py:class:`django_fbcanvas.app_registry.FacebookApp`;
+        defaults to the default app
+    """
+    app = app or get_app()
     return FacebookConnection.request(
         'oauth/access_token',
-        client_id=fb_settings.FACEBOOK_APP_ID,
-        client_secret=fb_settings.FACEBOOK_APP_SECRET,
+        client_id=app.app_id,
+        client_secret=app.secret,
         code=code,
         redirect_uri=redirect_uri)
 
-def get_app_access_token():
+def get_app_access_token(app=None):
     """
     Get the access_token for the app that can be used for
     insights and creating test users
@@ -98,10 +118,11 @@ def get_app_access_token():
     application_secret = retrieved from the developer page
     returns the application access_token
     """
+    app = app or get_app()
     kwargs = {
         'grant_type': 'client_credentials',
-        'client_id': fb_settings.FACEBOOK_APP_ID,
-        'client_secret': fb_settings.FACEBOOK_APP_SECRET,
+        'client_id': app.app_id,
+        'client_secret': app.secret,
     }
     response = FacebookConnection.request('oauth/access_token', **kwargs)
     return response['access_token']
@@ -129,7 +150,48 @@ def get_api_error_class(api_response):
     pass
 
 REQUEST_TIMEOUT = 8
-REQUEST_ATTEMPTS = 2
+## Default number of attempts, for backwards compatibility: use the
+## ``FACEBOOK_RETRY_MAX_ATTEMPTS`` setting or a custom retry policy
+REQUEST_ATTEMPTS = fb_settings.FACEBOOK_RETRY_MAX_ATTEMPTS
+
+## Identical GET requests in flight are coalesced through this
+_single_flight = SingleFlight(timeout=fb_settings.FACEBOOK_SINGLE_FLIGHT_TIMEOUT)
+
+def _is_read_request(url, post_data=None):
+    """Whether the request for ``url`` is a read-only GET request.
+    
+    Graph API writes may be performed via GET, using the ``method``
+    query parameter.
+    """
+    if post_data:
+        return False
+    query = urlparse.urlsplit(url).query
+    return 'method' not in urlparse.parse_qs(query)
+
+## Error codes inside API error messages look like ``(#NNN)``
+_error_code_re = re.compile(r'\(#(\d+)\)')
+
+## Maximum number of operations allowed in a single batch request
+BATCH_MAX_SIZE = 50
+
+def _batch_operation(operation):
+    """Convert an operation passed to :py:meth:`OpenFacebook.batch`
+    to the format expected by the Graph API batch endpoint.
+    """
+    if isinstance(operation, dict):
+        return operation
+    if isinstance(operation, basestring):
+        operation = ('GET', operation)
+    method, path = operation[0].upper(), operation[1]
+    params = operation[2] if len(operation) > 2 else None
+    op = {'method': method, 'relative_url': path}
+    if params:
+        encoded_params = urllib.urlencode(encode_params(params))
+        if method == 'POST':
+            op['body'] = encoded_params
+        else:
+            op['relative_url'] = '%s?%s' % (path, encoded_params)
+    return op
 
 class FacebookConnection(object):
     """Class for sending requests to Facebook and parsing
@@ -142,68 +204,177 @@ class FacebookConnection(object):
     ## This older URL is still used for FQL requests
     old_api_url = 'https://api.facebook.com/method/'
 
+    ## Transport used to perform HTTP requests; ``None`` means the
+    ## default one from settings (see :py:mod:`django_fbcanvas.transports`)
+    transport = None
+
+    ## Retry policy for requests; ``None`` means the default one
+    ## from settings (see :py:mod:`django_fbcanvas.retry`)
+    retry_policy = None
+
+    ## What to do when the rate limit is reached; ``None`` means the
+    ## default from settings (see :py:mod:`django_fbcanvas.ratelimit`)
+    rate_limit_mode = None
+
+    ## The :py:class:`django_fbcanvas.app_registry.FacebookApp` requests
+    ## are made for; ``None`` means the default one
+    app = None
+
     @classmethod
-    def request(cls, path='', post_data=None, use_old_api_url=False, **params):
+    def request(cls, path='', post_data=None, use_old_api_url=False, retry_policy=None, **params):
         """Main method used to send requests directly.
         
         :param path: The path for which to perform the request
         :param post_data: Data to be sent via POST
         :param use_old_api_url: Whether to use the old API url or the new one.
             Defaults to ``False`` (meaning use the new one).
-        :param timeout: Timeout for the ``urllib2`` request
-        :param attempts: Maximum number of attempts
+        :param retry_policy: The :py:class:`django_fbcanvas.retry.RetryPolicy`
+            for this request. Write requests are not retried by default.
         """
         
         api_base_url = cls.old_api_url if use_old_api_url else cls.api_url
         if getattr(cls, 'access_token', None):
             params['access_token'] = cls.access_token
         url = '%s%s?%s' % (api_base_url, path, urllib.urlencode(params))
-        response = cls._request(url, post_data)
+        if retry_policy is None and _is_read_request(url, post_data):
+            retry_policy = cls.retry_policy
+        response = cls._request(url, post_data, transport=cls.transport,
+                                retry_policy=retry_policy,
+                                rate_limit_mode=cls.rate_limit_mode,
+                                app_id=cls.app.app_id if cls.app else None)
         return response
 
     @classmethod
-    def _request(cls, url, post_data=None, timeout=REQUEST_TIMEOUT, attempts=REQUEST_ATTEMPTS):
+    def _request(cls, url, post_data=None, timeout=REQUEST_TIMEOUT, attempts=None,
+                 transport=None, retry_policy=None, rate_limit_mode=None, app_id=None,
+                 check_rate_limit=True):
         """Perform a HTTP request to the given URL and parse it as JSON.
         
-        ``urllib2`` raises errors on different status codes so we
-        use a ``try .. except`` clause here.
+        :param attempts: Maximum number of attempts, overriding the
+            one from the retry policy
+        :param transport: The :py:mod:`django_fbcanvas.transports`
+            transport used to perform the request. Defaults to the
+            one configured in settings.
+        :param retry_policy: The :py:class:`django_fbcanvas.retry.RetryPolicy`
+            deciding whether and when failed requests are retried.
+            Defaults to the one configured in settings for reads, and
+            to :py:data:`django_fbcanvas.retry.NO_RETRY` for writes.
+        :param rate_limit_mode: Either ``block`` or ``fail``;
+            see :py:mod:`django_fbcanvas.ratelimit`.
+        :param app_id: ID of the app the request is made for, used for
+            rate limiting. Defaults to the default app.
+        :param check_rate_limit: ``False`` if a token was already taken
+            from the rate limiter for this request
         """
         logger.info('requesting url %s with post data %s', url, post_data)
-        opener = urllib2.build_opener()
-        opener.addheaders = [('User-agent', 'Open Facebook Python')]
-        # give it a few shots, connection is buggy at times
+        if transport is None:
+            transport = get_default_transport()
+        if retry_policy is None:
+            if _is_read_request(url, post_data):
+                retry_policy = get_default_retry_policy()
+            else:
+                retry_policy = NO_RETRY
+        if attempts is not None:
+            retry_policy = retry_policy.copy(max_attempts=attempts)
+
+        rate_limiter = get_rate_limiter()
+        def do_request(post_data):
+            if rate_limiter is not None and check_rate_limit:
+                cls._check_rate_limit(rate_limiter, url, rate_limit_mode, app_id)
+            return cls._do_request(url, post_data, timeout, retry_policy, transport)
+
+        if fb_settings.FACEBOOK_SINGLE_FLIGHT and _is_read_request(url, post_data):
+            ## Identical reads already in flight are shared: only the
+            ## request actually performed takes a rate limit token
+            return _single_flight.do((id(transport), url), lambda: do_request(None))
+        return do_request(post_data)
+
+    @classmethod
+    def _check_rate_limit(cls, rate_limiter, url, mode=None, app_id=None):
+        """Take a token from the rate limiter buckets for the request,
+        waiting for it in ``block`` mode.
+        
+        :raises: :py:class:`django_fbcanvas.exceptions.RateLimitExceeded`
+        """
+        if mode is None:
+            mode = fb_settings.FACEBOOK_RATE_LIMIT_MODE
+        query = urlparse.parse_qs(urlparse.urlsplit(url).query)
+        access_token = query.get('access_token', [None])[0]
+        if app_id is None:
+            app_id = get_app().app_id
+        
+        if mode == 'block':
+            if not rate_limiter.acquire(app_id, access_token,
+                                        max_wait=fb_settings.FACEBOOK_RATE_LIMIT_MAX_WAIT):
+                raise facebook_exceptions.RateLimitExceeded(
+                    "Rate limit reached, maximum wait time exceeded")
+            return
+        
+        wait = rate_limiter.try_acquire(app_id, access_token)
+        if wait:
+            raise facebook_exceptions.RateLimitExceeded(
+                "Rate limit reached, retry in %.2f seconds" % wait, retry_after=wait)
 
+    @classmethod
+    def _do_request(cls, url, post_data, timeout, retry_policy, transport):
+        """Actually perform the request for :py:meth:`_request`"""
         encoded_params = encode_params(post_data) if post_data else None
         post_string = (urllib.urlencode(encoded_params) if post_data else None)
-        
-        response = None
 
-        while attempts:
-            response_file = None
-            try:
-                try:
-                    ## For older Python versions you could leave out
-                    ## the timeout
-                    #response_file = opener.open(url, post_string)
-                    response_file = opener.open(url, post_string, timeout=timeout)
-                except (urllib2.HTTPError,), e:
-                    ## Catch the silly status code errors
-                    if 'http error' in str(e).lower():
-                        response_file = e
-                    else:
-                        raise
-                response = response_file.read().decode('utf8')
-                break
-            except (urllib2.HTTPError, urllib2.URLError), e:
-                logger.warn('Facebook Graph API request: error or timeout: %s', unicode(e))
-                attempts -= 1
-                if attempts <= 0:
-                    ## Maximum number of attempts reached, stop retrying 
-                    raise
-            finally:
-                if response_file:
-                    response_file.close()
+        def attempt():
+            response = transport.request(url, post_string, timeout=timeout)
+            return cls._parse_response(response)
 
+        ## API errors are raised by _parse_response(), so that they
+        ## can be retried too, depending on their class
+        return cls._call_with_breaker(url, attempt, retry_policy)
+
+    @classmethod
+    def _call_with_breaker(cls, url, attempt, retry_policy):
+        """Call ``attempt()`` according to ``retry_policy``, through
+        the circuit breaker for ``url``, if enabled.
+        """
+        breakers = get_circuit_breakers()
+        breaker = breakers.get_breaker(url) if breakers is not None else None
+        if breaker is None:
+            return retry_policy.call(attempt)
+
+        ## The circuit is checked, and the outcome recorded, once for
+        ## the whole request: retries of a failing request are not
+        ## counted as more failures
+        allowed = breaker.allow_request()
+        if not allowed:
+            raise facebook_exceptions.CircuitOpenException(
+                "Circuit %s is open, not performing request" % breaker.name,
+                retry_after=breaker.retry_after())
+        start = [time.time()]
+        def timed_attempt():
+            start[0] = time.time()
+            return attempt()
+
+        success = False
+        try:
+            result = retry_policy.call(timed_attempt)
+            success = True
+            return result
+        except facebook_exceptions.TooManyCallsException:
+            ## Per-user or per-app limit: the host is fine
+            success = True
+            raise
+        except facebook_exceptions.TransientException:
+            raise
+        except facebook_exceptions.OpenFacebookException:
+            ## The API answered, even if with an error
+            success = True
+            raise
+        finally:
+            breaker.record(success, time.time() - start[0], allowed)
+
+    @classmethod
+    def _parse_response(cls, response):
+        """Parse the body of an API response, raising the appropriate
+        exception if it contains an error.
+        """
         try:
             parsed_response = json.loads(response)
             logger.info('Facebook Graph API response: %s' % parsed_response)
@@ -216,85 +387,60 @@ class FacebookConnection(object):
         if parsed_response and isinstance(parsed_response, dict):
             ## of course we have two different syntaxes
             if parsed_response.get('error'):
-                cls.raise_error(parsed_response['error']['type'], parsed_response['error']['message'])
+                error = parsed_response['error']
+                cls.raise_error(error['type'], error['message'],
+                                code=error.get('code'), subcode=error.get('error_subcode'))
             elif parsed_response.get('error_code'):
                 cls.raise_error(parsed_response['error_code'], parsed_response['error_msg'])
 
         return parsed_response
 
     @classmethod
-    def raise_error(cls, error_type, message):
+    def raise_error(cls, error_type, message, code=None, subcode=None):
         """Search for a corresponding error class or fall back to
         generic :py:class:`django_fbcanvas.exceptions.OpenFacebookException`
+        
+        The error code is taken from ``code`` (the ``error.code`` field
+        of Graph API errors) or ``error_type`` (old REST API), falling
+        back to the ``(#NNN)`` found inside the message for responses
+        missing them. Known codes raise their specific class from
+        :py:mod:`django_fbcanvas.api_exceptions`; other codes are looked
+        up in :py:data:`django_fbcanvas.exceptions.error_code_index`.
+        
+        The raised exception has ``error_code`` and ``error_subcode``
+        attributes.
         """
-        import re
         error_class = None
-        if not isinstance(error_type, int):
+        error_code = to_int(code, None) if code is not None else None
+        if isinstance(error_type, (int, long)):
+            if error_code is None:
+                error_code = error_type
+        else:
             error_class = getattr(facebook_exceptions, error_type, None)
-        if error_class and not issubclass(error_class,
-                                          facebook_exceptions.OpenFacebookException):
-            error_class = None
-        
-        ## map error classes to facebook error IDs
-        ## define a string to match a single error,
-        ## use ranges for more complex cases
-        ## also see http://fbdevwiki.com/wiki/Error_codes#User_Permission_Errors
-        
-        ##----------------------------------------------------------------------
-        ## Get all the exception classes from django_fbcanvas.exceptions
-        ## that are subclass of OpenFacebookException and define a `codes`
-        ## attribute (will contain error codes).
-        ##----------------------------------------------------------------------
-        exception_classes = sorted([
-            e for e in [getattr(facebook_exceptions, e, None) for e in dir(facebook_exceptions)]
-            if (getattr(e, 'codes', None) and issubclass(e, facebook_exceptions.OpenFacebookException))
-        ], key=lambda e: e.range())
-
+            if not (isinstance(error_class, type) and
+                    issubclass(error_class, facebook_exceptions.OpenFacebookException)):
+                error_class = None
+        
         ## Find the error code inside the message..
-        ## TODO: Isn't there a better way to do this??
-        error_code = None
-        error_code_re = re.compile('\(#(\d+)\)')
-        matches = error_code_re.match(message)
-        matching_groups = matches.groups() if matches else None
-        if matching_groups:
-            error_code = to_int(matching_groups[0]) or None
-
-        for class_ in exception_classes:
-            codes_list = class_.codes_list()
-            # match the error class
-            matching_error_class = None
-            for code in codes_list:
-                if isinstance(code, basestring):
-                    # match on string
-                    key = code
-                    if key in message:
-                        matching_error_class = class_
-                        break
-                elif isinstance(code, tuple):
-                    start, stop = code
-                    if error_code and start <= error_code <= stop:
-                        matching_error_class = class_
-                        break
-                elif isinstance(code, (int, long)):
-                    if int(code) == error_code:
-                        matching_error_class = class_
-                        break
-                else:
-                    raise(
-                        ValueError, 'Dont know how to handle %s of ' \
-                        'type %s' % (code, type(code)))
-            #tell about the happy news if we found something
-            if matching_error_class:
-                error_class = matching_error_class
-                break
-
+        if error_code is None:
+            matches = _error_code_re.match(message)
+            if matches:
+                error_code = to_int(matches.group(1)) or None
+        
+        error_class = api_exceptions.ERROR_CODE_CLASSES.get(error_code) \
+            or facebook_exceptions.error_code_index.get_class(error_code, message) \
+            or error_class
+        
         if 'Missing' in message and 'parameter' in message:
             error_class = facebook_exceptions.MissingParameter
-
+        
         if not error_class:
             error_class = facebook_exceptions.OpenFacebookException
-
-        raise error_class(message)
+        
+        exception = error_class(message)
+        exception.error_code = error_code
+        exception.error_subcode = to_int(subcode, None) if subcode is not None else None
+        raise exception
 
 class OpenFacebook(FacebookConnection):
     """Main object used to handle Facebook API requests.
@@ -371,9 +517,34 @@ class OpenFacebook(FacebookConnection):
                                picture=photo, url='http://www.fashiolista.com')
     """
     def __init__(self, access_token=None, prefetched_data=None,
-                 expires=None, current_user_id=None):
+                 expires=None, current_user_id=None, transport=None,
+                 cache=None, retry_policy=None,
+                 rate_limit_mode=None, app=None):
         self.access_token = access_token
         
+        ## The app this connection is for (see
+        ## :py:mod:`django_fbcanvas.app_registry`); ``None`` for the default
+        self.app = app
+        
+        ## Transport used for requests, if different from the default one
+        self.transport = transport
+        
+        ## Cache for GET responses: ``None`` to use the one from settings,
+        ## ``False`` to disable, or a ``GraphResponseCache`` instance
+        self.cache = cache
+        
+        ## Loader merging the ``load()`` calls into ``?ids=`` requests
+        ## (see :py:mod:`django_fbcanvas.loader`)
+        self._loader = None
+        
+        ## Retry policy for read requests, if different from the default
+        ## one (writes are only retried if asked for the single request)
+        self.retry_policy = retry_policy
+        
+        ## What to do when the rate limit is reached, if different
+        ## from the default (see :py:mod:`django_fbcanvas.ratelimit`)
+        self.rate_limit_mode = rate_limit_mode
+        
         ## extra data coming from signed cookies
         self.prefetched_data = prefetched_data
 
@@ -394,15 +565,108 @@ class OpenFacebook(FacebookConnection):
         return authenticated
 
     def get(self, path, **kwargs):
-        """Performs a GET request on the Graph API"""
+        """Performs a GET request on the Graph API.
+        
+        If caching is enabled, the response may be served from the
+        :py:mod:`django_fbcanvas.cache`.
+        """
+        cache = self._get_cache()
+        if cache:
+            return cache.get_or_fetch(path, kwargs, self.access_token,
+                                      lambda: self.request(path, **kwargs))
         response = self.request(path, **kwargs)
         return response
+
+    def _get_cache(self):
+        """Returns the response cache to be used, or ``None``"""
+        if self.cache is None:
+            if fb_settings.FACEBOOK_CACHE_ENABLED:
+                return get_response_cache()
+            return None
+        return self.cache or None
     
     def get_many(self, *ids, **kwargs):
         """Performs a "multiple" GET request on the Graph API"""
         kwargs['ids'] = ','.join(ids)
         return self.request(**kwargs)
 
+    def iterate(self, path, max_items=None, max_pages=None, prefetch=False, **params):
+        """Iterate over the items of a paginated Graph API edge, such as
+        ``me/friends``, following the ``paging.next`` links.
+        
+        Pages are requested lazily, so only one page at a time is kept
+        in memory (two, when prefetching).
+        
+        :param path: Path of the edge
+        :param max_items: Stop after yielding this many items
+        :param max_pages: Stop after requesting this many pages
+        :param prefetch: Whether to request the next page in background
+            while the items of the current one are being consumed; when
+            the background pool is full (or when called from one of its
+            workers) the next page is requested when needed
+        
+        Extra kwargs are used as GET parameters for the first request
+        (eg. ``limit``).
+        """
+        page = self.get(path, **params)
+        request_kwargs = dict(transport=self.transport, retry_policy=self.retry_policy,
+                              rate_limit_mode=self.rate_limit_mode,
+                              app_id=self.app.app_id if self.app else None)
+        pool = None
+        if prefetch:
+            from django_fbcanvas.fb_async import get_async_pool
+            pool = get_async_pool()
+            if pool.in_worker():
+                pool = None
+        pages, count = 1, 0
+        while True:
+            next_url = (page.get('paging') or {}).get('next')
+            if max_pages is not None and pages >= max_pages:
+                next_url = None
+            next_page = None
+            if next_url and pool is not None:
+                try:
+                    next_page = pool.try_submit(self._request, next_url, **request_kwargs)
+                except PoolFull:
+                    pass
+            for item in page.get('data') or []:
+                yield item
+                count += 1
+                if max_items is not None and count >= max_items:
+                    return
+            if not next_url:
+                return
+            if next_page is not None:
+                page = next_page.get()
+            else:
+                page = self._request(next_url, **request_kwargs)
+            pages += 1
+            if not page.get('data'):
+                return
+
+    def get_loader(self):
+        """Returns the :py:class:`django_fbcanvas.loader.GraphLoader`
+        bound to this instance, used to merge single-object requests.
+        """
+        if self._loader is None:
+            self._loader = GraphLoader(self, window=fb_settings.FACEBOOK_LOADER_WINDOW)
+        return self._loader
+
+    def load(self, id):
+        """Lazily get the object with the given id; requests for
+        many objects are merged in a single ``?ids=`` request.
+        
+        :returns: a :py:class:`django_fbcanvas.loader.LazyGraphObject`
+        """
+        return self.get_loader().load(id)
+
+    def load_many(self, ids):
+        """Lazily get many objects; see :py:meth:`load`
+        
+        :returns: a list of :py:class:`django_fbcanvas.loader.LazyGraphObject`
+        """
+        return self.get_loader().load_many(ids)
+
     def post(self, path, params=None, **post_data):
         """Performs a POST request on the Graph API"""
         assert self.access_token, 'Write operations require an access token'
@@ -450,10 +714,64 @@ class OpenFacebook(FacebookConnection):
     
     def get_permissions(self):
         """Get a list of permissions the user granted us"""
-        perms = self.get('me/permissions')['data'][0]
-        return sorted([p[0] for p in perms if p[1] == '1'])
+        return self.parse_permissions(self.get('me/permissions'))
+    
+    @staticmethod
+    def parse_permissions(response):
+        """Get the list of granted permissions from a ``me/permissions``
+        response (eg. obtained through :py:meth:`batch`)
+        """
+        perms = response['data'][0]
+        return sorted([name for name, granted in perms.items() if str(granted) == '1'])
+
+    def batch(self, operations):
+        """Performs many operations using the Graph API batch endpoint.
+        
+        Operations are sent in chunks of at most :py:data:`BATCH_MAX_SIZE`,
+        each chunk in a single HTTP request.
+        
+        Each operation can be either:
+        
+        - a string, meaning a GET request for that path
+        - a ``(method, path)`` or ``(method, path, params)`` tuple,
+          where ``method`` is one of ``GET``, ``POST`` or ``DELETE``
+        - a dict, that will be sent as-is (see Facebook documentation
+          about batch requests for the format)
+        
+        Example::
+        
+            me, perms, friends = facebook.batch([
+                'me', 'me/permissions', ('GET', 'me/friends', {'limit': 10})])
+        
+        :returns: A list with, for each operation, in the same order,
+            either the parsed response or an instance of the
+            :py:class:`django_fbcanvas.exceptions.OpenFacebookException`
+            subclass matching the returned error. Exceptions are
+            returned, not raised.
+        """
+        operations = [_batch_operation(op) for op in operations]
+        results = []
+        for i in range(0, len(operations), BATCH_MAX_SIZE):
+            chunk = operations[i:i + BATCH_MAX_SIZE]
+            response = self.request(post_data={'batch': json.dumps(chunk)})
+            for item in response:
+                results.append(self._parse_batch_item(item))
+        return results
+
+    @classmethod
+    def _parse_batch_item(cls, item):
+        """Parse a single response from a batch request"""
+        if item is None:
+            ## Operations not completed in time are returned as null
+            return facebook_exceptions.OpenFacebookException(
+                "Batch operation was not completed")
+        try:
+            return cls._parse_response(item.get('body') or 'null')
+        except facebook_exceptions.OpenFacebookException, e:
+            return e
 
-    def request(self, path='', post_data=None, get_data=None, use_old_api_url=False, **params):
+    def request(self, path='', post_data=None, get_data=None, use_old_api_url=False,
+                retry_policy=None, **params):
         """Main function for sending requests to Facebook APIs
         
         :param path: Either the object path for REST Graph API, or
@@ -464,10 +782,59 @@ class OpenFacebook(FacebookConnection):
             Data that will be used to build the GET query.
         :param use_old_api_url: If set to ``True``, uses the old API URL
             (still valid for FQL requests).
+        :param retry_policy: The :py:class:`django_fbcanvas.retry.RetryPolicy`
+            for this request, overriding the instance one. Write requests
+            are not retried, unless a policy is passed here.
         
         Extra kwargs will be used to build the GET query.
         
         """
+        url = self._build_url(path, get_data, use_old_api_url, **params)
+        logger.debug('Requesting URL: %s', url)
+        if retry_policy is None and _is_read_request(url, post_data):
+            ## Writes are only retried if asked for the single request
+            retry_policy = self.retry_policy
+        response = self._request(url, post_data, transport=self.transport,
+                                 retry_policy=retry_policy,
+                                 rate_limit_mode=self.rate_limit_mode,
+                                 app_id=self.app.app_id if self.app else None)
+        return response
+
+    def request_deferred(self, path='', post_data=None, **params):
+        """Like :py:meth:`request`, but never waits for the rate limit:
+        if it was reached, the request is performed in background as
+        soon as possible.
+        
+        :returns: An ``AsyncResult``; call its ``get()`` method to get
+            the response (or raise the error)
+        :raises: :py:class:`django_fbcanvas.exceptions.RateLimitExceeded`
+            if too many requests are already waiting in background
+        """
+        url = self._build_url(path, None, **params)
+        app_id = self.app.app_id if self.app else get_app().app_id
+        retry_policy = self.retry_policy if _is_read_request(url, post_data) else None
+        kwargs = dict(transport=self.transport, retry_policy=retry_policy,
+                      app_id=app_id)
+        
+        rate_limiter = get_rate_limiter()
+        wait = rate_limiter.try_acquire(app_id, getattr(self, 'access_token', None)) \
+            if rate_limiter else 0
+        if not wait:
+            return CompletedResult.call(self._request, url, post_data,
+                                        check_rate_limit=False, **kwargs)
+        
+        pool = get_worker_pool('rate_limit_deferred',
+                               fb_settings.FACEBOOK_RATE_LIMIT_DEFER_POOL_SIZE,
+                               fb_settings.FACEBOOK_RATE_LIMIT_DEFER_MAX_PENDING)
+        try:
+            return pool.try_submit(self._request, url, post_data,
+                                   rate_limit_mode='block', **kwargs)
+        except PoolFull:
+            raise facebook_exceptions.RateLimitExceeded(
+                "Rate limit reached, too many deferred requests", retry_after=wait)
+
+    def _build_url(self, path='', get_data=None, use_old_api_url=False, **params):
+        """Build the URL for a request; see :py:meth:`request`"""
         api_base_url = self.api_url
         if use_old_api_url:
             api_base_url = self.old_api_url
@@ -480,17 +847,53 @@ class OpenFacebook(FacebookConnection):
         
         get_data.update(params)
         
-        url = '%s%s%s' % (api_base_url, path, ("?%s" % urllib.urlencode(get_data)) if get_data else "")
-        logger.debug('Requesting URL: %s', url)
-        response = self._request(url, post_data)
-        return response
+        return '%s%s%s' % (api_base_url, path, ("?%s" % urllib.urlencode(get_data)) if get_data else "")
+
+    def stream(self, path, use_old_api_url=False, **params):
+        """Performs a GET request, decoding the response incrementally
+        and yielding the elements of its ``data`` array (or of the
+        response itself, for FQL queries) as soon as they are received.
+        
+        Use this instead of :py:meth:`get` for big responses (eg. long
+        friend lists or insights), as the whole response is never kept
+        in memory. Only the first page is returned; see :py:meth:`iterate`.
+        
+        Errors returned by the API are raised after the response has
+        been read. Like other requests, streamed ones are subject to the
+        rate limit and to the circuit breakers.
+        """
+        url = self._build_url(path, None, use_old_api_url, **params)
+        logger.debug('Streaming URL: %s', url)
+        transport = self.transport or get_default_transport()
+        retry_policy = self.retry_policy or get_default_retry_policy()
+        rate_limiter = get_rate_limiter()
+        if rate_limiter is not None:
+            self._check_rate_limit(rate_limiter, url, self.rate_limit_mode,
+                                   self.app.app_id if self.app else None)
+        response_file = self._call_with_breaker(
+            url, lambda: transport.open(url, timeout=REQUEST_TIMEOUT), retry_policy)
+        try:
+            for item in iter_items(response_file, on_error=self._raise_stream_error):
+                yield item
+        finally:
+            response_file.close()
+
+    @classmethod
+    def _raise_stream_error(cls, errors):
+        """Raise the exception for an error found by :py:meth:`stream`"""
+        if errors.get('error'):
+            error = errors['error']
+            cls.raise_error(error['type'], error['message'],
+                            code=error.get('code'), subcode=error.get('error_subcode'))
+        elif errors.get('error_code'):
+            cls.raise_error(errors['error_code'], errors.get('error_msg', ''))
 
 
 class FacebookAuthorization(FacebookConnection):
     """Authorization stuff"""
     
     @classmethod
-    def get_app_access_token(cls):
+    def get_app_access_token(cls, app=None):
         """
         Get the access_token for the app that can be used for
         insights and creating test users
@@ -498,10 +901,11 @@ class FacebookAuthorization(FacebookConnection):
         application_secret = retrieved from the developer page
         returns the application access_token
         """
+        app = app or cls.app or get_app()
         kwargs = {
             'grant_type': 'client_credentials',
-            'client_id': fb_settings.FACEBOOK_APP_ID,
-            'client_secret': fb_settings.FACEBOOK_APP_SECRET,
+            'client_id': app.app_id,
+            'client_secret': app.secret,
         }
         response = cls.request('oauth/access_token', **kwargs)
         return response['access_token']
@@ -0,0 +1,98 @@
+"""django_fbcanvas - fb_async
+
+Non-blocking counterpart of :py:class:`django_fbcanvas.fb_api.OpenFacebook`.
+
+Requests are run on a shared pool of worker threads (using the
+keep-alive connections from :py:mod:`django_fbcanvas.connection_pool`),
+so that a single process can keep many Graph API calls in flight.
+Every method returns immediately with an ``AsyncResult``, whose
+``get()`` method waits for the response, and raises the same
+exceptions as the blocking client.
+
+Example::
+
+    facebook = AsyncOpenFacebook(access_token)
+    me, perms = facebook.me(), facebook.get_permissions()
+    friends = facebook.get('me/friends')
+    print me.get(), perms.get(), friends.get()
+"""
+
+import logging
+
+import django_fbcanvas.settings as fb_settings
+from django_fbcanvas.fb_api import OpenFacebook
+from django_fbcanvas.workers import get_worker_pool
+
+logger = logging.getLogger(__name__)
+
+
+def get_async_pool():
+    """Returns the worker pool shared by all the
+    :py:class:`AsyncOpenFacebook` instances.
+    """
+    return get_worker_pool('graph_api', fb_settings.FACEBOOK_ASYNC_POOL_SIZE,
+                           fb_settings.FACEBOOK_ASYNC_MAX_PENDING)
+
+
+def wait_all(results, timeout=None):
+    """Wait for a list of ``AsyncResult`` and return their values.
+
+    The first exception raised by a request is re-raised.
+    """
+    return [r.get(timeout) for r in results]
+
+
+class AsyncOpenFacebook(object):
+    """Non-blocking client for the Facebook APIs.
+
+    Accepts the same arguments as
+    :py:class:`django_fbcanvas.fb_api.OpenFacebook`, plus an optional
+    ``pool`` (a :py:class:`django_fbcanvas.workers.WorkerPool`) on
+    which to run the requests.
+    """
+
+    def __init__(self, access_token=None, pool=None, **kwargs):
+        self.facebook = OpenFacebook(access_token, **kwargs)
+        self.pool = pool or get_async_pool()
+
+    @property
+    def access_token(self):
+        return self.facebook.access_token
+
+    def _submit(self, func, *args, **kwargs):
+        return self.pool.submit(func, *args, **kwargs)
+
+    def get(self, path, **kwargs):
+        """Performs a GET request on the Graph API"""
+        return self._submit(self.facebook.get, path, **kwargs)
+
+    def get_many(self, *ids, **kwargs):
+        """Performs a "multiple" GET request on the Graph API"""
+        return self._submit(self.facebook.get_many, *ids, **kwargs)
+
+    def post(self, path, params=None, **post_data):
+        """Performs a POST request on the Graph API"""
+        return self._submit(self.facebook.post, path, params, **post_data)
+
+    set = post
+    update = post
+
+    def delete(self, *args, **kwargs):
+        """Performs a DELETE request on the Graph API"""
+        return self._submit(self.facebook.delete, *args, **kwargs)
+
+    def fql(self, query, **kwargs):
+        """Executes a FQL query using the Facebook FQL API"""
+        return self._submit(self.facebook.fql, query, **kwargs)
+
+    def me(self):
+        """Cached method of requesting information about me"""
+        return self._submit(self.facebook.me)
+
+    def get_permissions(self):
+        """Get a list of permissions the user granted us"""
+        return self._submit(self.facebook.get_permissions)
+
+    def batch(self, operations):
+        """Performs many operations using the Graph API batch endpoint"""
+        return self._submit(self.facebook.batch, operations)
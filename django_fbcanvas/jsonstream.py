@@ -0,0 +1,152 @@
+"""django_fbcanvas - jsonstream
+
+Incremental decoding of large JSON API responses.
+
+:py:func:`iter_items` reads a JSON document from a file-like object,
+one chunk at a time, and yields the elements of its top-level ``data``
+array (or of the top-level array itself, as returned by FQL queries)
+as soon as each of them has been received. Only the element being
+decoded and the current chunk are kept in memory, instead of the
+whole response.
+"""
+
+import re
+import codecs
+import json as _json
+
+_whitespace_re = re.compile(r'[ \t\n\r]*')
+## Characters which may follow the part of a number decoded so far
+_number_tail_re = re.compile(r'[0-9.eE+-]*')
+_decoder = _json.JSONDecoder()
+
+DEFAULT_CHUNK_SIZE = 16384
+
+
+class _Reader(object):
+    """Buffered reader over a file-like object returning UTF-8 bytes"""
+
+    def __init__(self, fileobj, chunk_size=DEFAULT_CHUNK_SIZE):
+        self.fileobj = fileobj
+        self.chunk_size = chunk_size
+        self.text_decoder = codecs.getincrementaldecoder('utf8')()
+        self.buf = u''
+        self.pos = 0
+        self.eof = False
+
+    def fill(self):
+        """Read more data into the buffer, dropping the consumed part.
+
+        :returns: ``False`` if the end of the file was reached
+        """
+        if self.eof:
+            return False
+        ## Read at least as much as we already have, so that decoding a
+        ## large value is retried a logarithmic number of times
+        size = max(self.chunk_size, len(self.buf) - self.pos)
+        data = self.fileobj.read(size)
+        if not data:
+            self.eof = True
+            self.buf = self.buf[self.pos:] + self.text_decoder.decode('', True)
+        else:
+            self.buf = self.buf[self.pos:] + self.text_decoder.decode(data)
+        self.pos = 0
+        return not self.eof
+
+    def peek(self):
+        """Skip whitespace and return the next character, without
+        consuming it. Returns ``None`` at the end of the file.
+        """
+        while True:
+            self.pos = _whitespace_re.match(self.buf, self.pos).end()
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self.fill():
+                return None
+
+    def expect(self, char):
+        """Consume ``char``, raising ``ValueError`` if the next
+        character is a different one.
+        """
+        found = self.peek()
+        if found != char:
+            raise ValueError("Expected %r, found %r" % (char, found))
+        self.pos += 1
+
+    def decode(self):
+        """Decode and consume the next JSON value"""
+        self.peek()
+        while True:
+            try:
+                value, end = _decoder.raw_decode(self.buf, self.pos)
+            except ValueError:
+                ## Probably an incomplete value: read some more
+                if not self.fill():
+                    raise
+                continue
+            if isinstance(value, (int, long, float)) and not isinstance(value, bool) and \
+                    _number_tail_re.match(self.buf, end).end() == len(self.buf) and \
+                    self.fill():
+                ## The number may continue in the next chunk: eg. ``1234.``
+                ## is decoded as ``1234``, leaving the ``.`` unconsumed
+                continue
+            self.pos = end
+            return value
+
+
+def _iter_array(reader):
+    reader.expect('[')
+    if reader.peek() == ']':
+        reader.pos += 1
+        return
+    while True:
+        yield reader.decode()
+        char = reader.peek()
+        reader.pos += 1
+        if char == ']':
+            return
+        if char != ',':
+            raise ValueError("Expected ',' or ']', found %r" % char)
+
+
+def iter_items(fileobj, key='data', on_error=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Incrementally decode a JSON document, yielding the elements of
+    the array stored in its top-level ``key``, or of the document itself
+    if it is an array.
+
+    :param fileobj: File-like object with a ``read(size)`` method,
+        returning UTF-8 encoded data
+    :param key: Name of the key containing the array
+    :param on_error: Callable, called with the value of an ``error``
+        (or ``error_code``) top-level key, if any. Errors are usually
+        returned alone, so nothing is yielded in that case.
+    :param chunk_size: Number of bytes read at a time
+    """
+    reader = _Reader(fileobj, chunk_size)
+    if reader.peek() == '[':
+        for item in _iter_array(reader):
+            yield item
+        return
+
+    reader.expect('{')
+    errors = {}
+    if reader.peek() == '}':
+        return
+    while True:
+        name = reader.decode()
+        reader.expect(':')
+        if name == key and reader.peek() == '[':
+            for item in _iter_array(reader):
+                yield item
+        else:
+            value = reader.decode()
+            if name in ('error', 'error_code', 'error_msg'):
+                errors[name] = value
+        char = reader.peek()
+        reader.pos += 1
+        if char == '}':
+            break
+        if char != ',':
+            raise ValueError("Expected ',' or '}', found %r" % char)
+
+    if errors and on_error is not None:
+        on_error(errors)
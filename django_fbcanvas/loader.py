@@ -0,0 +1,198 @@
+"""django_fbcanvas - loader
+
+Micro-batching of Graph API object requests.
+
+A :py:class:`GraphLoader` collects the ids of the objects requested
+through :py:meth:`GraphLoader.load` and fetches them all at once using
+a single ``?ids=`` request (see :py:meth:`django_fbcanvas.fb_api.OpenFacebook.get_many`),
+split in chunks of ``max_batch`` ids.
+
+``load()`` returns a lazy object; the pending ids are fetched either
+when the first lazy object is accessed, or, if ``window`` is set, after
+``window`` seconds from the first ``load()``, whichever comes first.
+The second mode allows merging requests coming from different threads.
+
+Use :py:meth:`django_fbcanvas.fb_api.OpenFacebook.load` and
+:py:meth:`django_fbcanvas.fb_api.OpenFacebook.load_many`; plain ``get()``
+calls are never merged, since they have to return the object at once.
+
+Example::
+
+    friends = facebook.load_many(friend_ids)
+    ## A single request is performed here, on first access
+    names = [f['name'] for f in friends]
+
+.. NOTE::
+    Objects fetched by the loader are not stored in, nor served from,
+    the response cache (:py:mod:`django_fbcanvas.cache`).
+"""
+
+import logging
+import threading
+
+from django_fbcanvas.exceptions import OpenFacebookException
+from django_fbcanvas.cache import LRUCache
+
+logger = logging.getLogger(__name__)
+
+## Maximum number of ids in a single ``?ids=`` request
+LOADER_MAX_BATCH = 50
+
+## Maximum number of fetched objects remembered by a loader
+LOADER_MAX_OBJECTS = 1000
+
+
+class _Pending(object):
+    """An object requested through the loader"""
+
+    def __init__(self, id):
+        self.id = id
+        self.done = threading.Event()
+        self.result = None
+        self.exception = None
+
+
+class LazyGraphObject(object):
+    """Placeholder for a Graph API object being fetched by a
+    :py:class:`GraphLoader`. Behaves like the (read-only) dict
+    returned by the API, fetching it on first access.
+    """
+
+    def __init__(self, loader, pending):
+        self._loader = loader
+        self._pending = pending
+
+    @property
+    def id(self):
+        return self._pending.id
+
+    def result(self):
+        """Return the fetched object, fetching it if needed.
+
+        :raises: the exception raised while fetching the object.
+        """
+        pending = self._pending
+        if not pending.done.is_set():
+            self._loader.dispatch()
+            pending.done.wait()
+        if pending.exception is not None:
+            raise pending.exception
+        return pending.result
+
+    def __getitem__(self, key):
+        return self.result()[key]
+
+    def __contains__(self, key):
+        return key in self.result()
+
+    def __iter__(self):
+        return iter(self.result())
+
+    def __len__(self):
+        return len(self.result())
+
+    def __nonzero__(self):
+        return bool(self.result())
+
+    def get(self, key, default=None):
+        return self.result().get(key, default)
+
+    def keys(self):
+        return self.result().keys()
+
+    def items(self):
+        return self.result().items()
+
+    def __repr__(self):
+        if self._pending.done.is_set():
+            return '<LazyGraphObject %s: %r>' % (self.id, self._pending.result)
+        return '<LazyGraphObject %s (pending)>' % self.id
+
+
+class GraphLoader(object):
+    """Collects single-object requests and performs them in batches.
+
+    The last ``max_objects`` fetched objects are remembered, so that
+    loading them again doesn't perform any request; objects which
+    couldn't be fetched are forgotten, and requested again by the
+    next ``load()``.
+
+    :param facebook: The :py:class:`django_fbcanvas.fb_api.OpenFacebook`
+        instance used to perform the requests.
+    :param window: If set, pending ids are fetched automatically
+        this many seconds after the first of them was requested.
+    :param max_batch: Maximum number of ids in each request
+    :param max_objects: Maximum number of objects remembered
+    """
+
+    def __init__(self, facebook, window=None, max_batch=LOADER_MAX_BATCH,
+                 max_objects=LOADER_MAX_OBJECTS):
+        self.facebook = facebook
+        self.window = window
+        self.max_batch = max_batch
+        self._lock = threading.Lock()
+        self._objects = LRUCache(max_objects)
+        self._queue = []
+        self._timer = None
+
+    def load(self, id):
+        """Request the object with the given id.
+
+        :returns: a :py:class:`LazyGraphObject`
+        """
+        id = str(id)
+        with self._lock:
+            pending = self._objects.get(id)
+            if pending is None:
+                pending = _Pending(id)
+                self._objects.set(id, pending)
+                self._queue.append(pending)
+                if self.window and self._timer is None:
+                    self._timer = threading.Timer(self.window, self.dispatch)
+                    self._timer.daemon = True
+                    self._timer.start()
+        return LazyGraphObject(self, pending)
+
+    def load_many(self, ids):
+        """Request many objects; returns a list of :py:class:`LazyGraphObject`"""
+        return [self.load(id) for id in ids]
+
+    def dispatch(self):
+        """Fetch all the pending objects"""
+        with self._lock:
+            queue, self._queue = self._queue, []
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+        for i in range(0, len(queue), self.max_batch):
+            self._fetch(queue[i:i + self.max_batch])
+
+    def _fetch(self, chunk):
+        logger.debug("Loading %d objects in a single request", len(chunk))
+        try:
+            try:
+                response = self.facebook.get_many(*[p.id for p in chunk])
+            except OpenFacebookException, e:
+                for pending in chunk:
+                    pending.exception = e
+                return
+            for pending in chunk:
+                try:
+                    pending.result = response[pending.id]
+                except (KeyError, TypeError):
+                    pending.exception = OpenFacebookException(
+                        "Object %s was not returned by the API" % pending.id)
+        except Exception, e:
+            ## Never leave callers waiting forever
+            for pending in chunk:
+                if pending.result is None and pending.exception is None:
+                    pending.exception = e
+            raise
+        finally:
+            with self._lock:
+                for pending in chunk:
+                    if pending.exception is not None and \
+                            self._objects.get(pending.id) is pending:
+                        self._objects.delete(pending.id)
+            for pending in chunk:
+                pending.done.set()
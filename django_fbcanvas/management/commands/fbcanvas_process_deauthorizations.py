@@ -0,0 +1,28 @@
+"""django_fbcanvas - process queued app deauthorizations"""
+
+import time
+from optparse import make_option
+
+from django.core.management.base import BaseCommand
+
+from django_fbcanvas.deauthorize import process_queue
+
+
+class Command(BaseCommand):
+    help = "Process the app deauthorizations queued by the deauthorize callback"
+    
+    option_list = BaseCommand.option_list + (
+        make_option('--batch-size', type='int', dest='batch_size', default=None,
+                    help="Number of deauthorizations processed with each bulk update"),
+        make_option('--interval', type='float', dest='interval', default=None,
+                    help="Keep running, checking the queue every INTERVAL seconds"),
+    )
+    
+    def handle(self, *args, **options):
+        while True:
+            processed = process_queue(options['batch_size'])
+            if processed or not options['interval']:
+                self.stdout.write("Processed %d deauthorizations\n" % processed)
+            if not options['interval']:
+                return
+            time.sleep(options['interval'])
@@ -1,65 +1,273 @@
 """django_fbcanvas - middleware"""
 
+import time
 import logging
-from django_fbcanvas.user_mgmt import connect_user
+from django_fbcanvas.user_mgmt import connect_user, is_user_connected
 logger = logging.getLogger(__name__)
 
 import django_fbcanvas.settings as facebook_settings
-from django_fbcanvas.utils import parse_signed_data
- 
+from django_fbcanvas.cache import LRUCache
+from django_fbcanvas.app_registry import get_app, get_app_registry
+from django_fbcanvas.app_requests import process_app_requests_async
+from django_fbcanvas.deauthorize import is_deauthorized
+from django_fbcanvas.signals import facebook_app_request_received
+
+## Verified signed request payloads, by app ID and raw signed request.
+## When using the JS SDK, the same ``fbsr_`` cookie is sent with many
+## requests: this avoids decoding and verifying it each time.
+## Hit/miss counters are available from ``signed_request_cache.stats()``.
+signed_request_cache = LRUCache(facebook_settings.FACEBOOK_SIGNED_REQUEST_CACHE_SIZE)
+
+
+def parse_signed_request_cached(signed_request, app=None):
+    """Verify and decode a signed request for ``app`` (defaults to the
+    default app), using :py:data:`signed_request_cache`.
+    
+    Payloads are cached until they expire, according to their
+    ``expires`` field, or at most ``FACEBOOK_SIGNED_REQUEST_CACHE_TTL``
+    seconds after their ``issued_at`` time.
+    
+    Payloads issued before the user deauthorized the app are rejected.
+    """
+    if app is None:
+        app = get_app()
+    data = _parse_signed_request_cached(signed_request, app)
+    if data and data.get('user_id') and \
+            is_deauthorized(app.app_id, data['user_id'], data.get('issued_at') or 0):
+        logger.info("Rejecting signed request of user %s, who deauthorized app %s"
+                    % (data['user_id'], app.app_id))
+        return None
+    return data
+
+
+def _parse_signed_request_cached(signed_request, app):
+    if not signed_request_cache.maxsize:
+        return app.parse_signed_request(signed_request)
+    
+    key = (app.app_id, signed_request)
+    data = signed_request_cache.get(key)
+    if data is not None:
+        return data
+    
+    data = app.parse_signed_request(signed_request)
+    if data:
+        expires_at = time.time() + facebook_settings.FACEBOOK_SIGNED_REQUEST_CACHE_TTL
+        if data.get('issued_at'):
+            expires_at = min(expires_at, data['issued_at'] + facebook_settings.FACEBOOK_SIGNED_REQUEST_CACHE_TTL)
+        if data.get('expires'):
+            expires_at = min(expires_at, data['expires'])
+        if expires_at > time.time():
+            signed_request_cache.set(key, data, expires_at)
+    return data
+
+
+class LazyFacebookInfo(object):
+    """The ``request.fb_info`` dict, filled by calling ``process(info)``
+    the first time one of its keys is accessed.
+    
+    The dict is made available before ``process`` is called, so that
+    it can be accessed (partially filled) while processing.
+    """
+    
+    def __init__(self, process, defaults):
+        self._process = process
+        self._defaults = defaults
+        self._info = None
+    
+    @property
+    def evaluated(self):
+        return self._info is not None
+    
+    def evaluate(self):
+        """Fill the dict, if not done yet, and return it"""
+        if self._info is None:
+            self._info = dict(self._defaults)
+            self._process(self._info)
+        return self._info
+    
+    def __getitem__(self, key):
+        return self.evaluate()[key]
+    
+    def __setitem__(self, key, value):
+        self.evaluate()[key] = value
+    
+    def __contains__(self, key):
+        return key in self.evaluate()
+    
+    def has_key(self, key):
+        return key in self.evaluate()
+    
+    def __iter__(self):
+        return iter(self.evaluate())
+    
+    def __len__(self):
+        return len(self.evaluate())
+    
+    def get(self, key, default=None):
+        return self.evaluate().get(key, default)
+    
+    def keys(self):
+        return self.evaluate().keys()
+    
+    def items(self):
+        return self.evaluate().items()
+    
+    def __repr__(self):
+        if self._info is None:
+            return '<LazyFacebookInfo (not evaluated)>'
+        return '<LazyFacebookInfo: %r>' % self._info
+
+
+def _has_form_data(request):
+    """Whether the request is a POST with a form-encoded body, that
+    may contain a ``signed_request`` parameter.
+    
+    Other bodies (file uploads, JSON, ...) and bodies larger than
+    ``FACEBOOK_SIGNED_REQUEST_MAX_BODY_SIZE`` are never parsed by the
+    middleware, and are left to the view.
+    """
+    if request.method != 'POST':
+        return False
+    content_type = request.META.get('CONTENT_TYPE', '')
+    if not content_type.startswith('application/x-www-form-urlencoded'):
+        return False
+    try:
+        content_length = int(request.META.get('CONTENT_LENGTH') or 0)
+    except ValueError:
+        return False
+    return content_length <= facebook_settings.FACEBOOK_SIGNED_REQUEST_MAX_BODY_SIZE
+
+
+def _get_app_request_ids(request):
+    """Returns the IDs of the app requests passed via GET, or ``None``"""
+    if request.GET.has_key('request_ids'):
+        return request.GET['request_ids'].split(',')
+    return None
+
+
+def _has_signed_request(request):
+    """Whether a signed request was passed via GET or cookie"""
+    return request.GET.has_key('signed_request') \
+        or request.fb_app.cookie_name in request.COOKIES
+
 
 class FacebookRequestMiddleware:
+    """Process requests for Facebook apps. This is expecially
+    useful for canvas apps, since it handles signed_request logins,
+    application requests, etc.
+    
+    Information about the current interaction status with Facebook
+    is stored into ``request.fb_info`` as a dict with following
+    keys:
+    
+    - ``is_canvas`` - Whether we are running inside canvas or not.
+      This is determined by the presence of a signed request
+      via POST.
+    - ``is_signed_request`` - Whether we received a signed request,
+      either via POST parameter (canvas) or cookie (js sdk method).
+    - ``signed_request_type`` - ``"post"``, ``"get"`` or ``"cookie"``
+    - ``app_request_ids`` - If a ``request_ids`` GET was passed,
+      the IDs of requests to be processed. The
+      ``facebook_app_request_received`` signal is sent before calling
+      the view and, if ``FACEBOOK_PROCESS_APP_REQUESTS`` is enabled, the
+      requests are processed in background (see
+      :py:mod:`django_fbcanvas.app_requests`).
+    - ``is_authenticated`` - Whether we have a valid access_token
+      for this user, or not.
+    
+    The app serving the request (see :py:mod:`django_fbcanvas.app_registry`)
+    is stored into ``request.fb_app``.
+    
+    When a valid signed request is found, the user is logged in
+    and CSRF validation is skipped for the request.
+    
+    Unless ``FACEBOOK_LAZY_REQUEST_INFO`` is disabled, ``request.fb_info``
+    is lazy: the signed request is looked for and verified only when it
+    is first accessed, so that views not using it pay almost nothing.
+    It is evaluated before calling the view (eager mode) only:
+    
+    - for form-encoded POST requests, since Facebook POSTs
+      the signed request to canvas pages and they need the CSRF bypass
+    - for requests carrying a signed request in the GET parameters or
+      in the app cookie (set by the JS SDK), so that the user is logged
+      in before the view checks ``request.user``
+    - for views decorated with
+      :py:func:`django_fbcanvas.decorators.facebook_eager`
+    - for requests carrying ``request_ids``, if
+      ``FACEBOOK_PROCESS_APP_REQUESTS`` is enabled, since the access
+      token is needed to process them
+    
+    :py:func:`django_fbcanvas.decorators.facebook_required` also
+    evaluates it, before checking whether the user is logged in.
+    
+    .. NOTE::
+        This middleware should go before CsrfMiddleware in order
+        to skip CSRF validation for POSTs inside canvas apps,
+        in case a valid signed_request was received.
+    """
+    
     def process_request(self, request):
-        """Process requests for Facebook apps. This is expecially
-        useful for canvas apps, since it handles signed_request logins,
-        application requests, etc.
+        logger.debug("Running FacebookRequest Middleware")
         
-        Information about the current interaction status with Facebook
-        is stored into ``request.fb_info`` as a dict with following
-        keys:
+        request.fb_app = get_app_registry().for_request(request)
         
-        - ``is_canvas`` - Whether we are running inside canvas or not.
-          This is determined by the presence of a signed request
-          via POST.
-        - ``is_signed_request`` - Whether we received a signed request,
-          either via POST parameter (canvas) or cookie (js sdk method).
-        - ``signed_request_type`` - ``"post"`` or ``"cookie"``
-        - ``app_request_ids`` - If a ``request_ids`` GET was passed,
-          the IDs of requests to be processed.
-        - ``is_authenticated`` - Whether we have a valid access_token
-          for this user, or not.
+        ## Add some facebook-related information to request
+        request.fb_info = LazyFacebookInfo(
+            lambda info: self.process_fb_info(request, info), {
+                "is_canvas": False,
+                "is_signed_request": None,
+                "signed_request_type": None,
+                "app_request_ids": _get_app_request_ids(request),
+                "is_authenticated": None,
+                "access_token": None,
+            })
+        if not facebook_settings.FACEBOOK_LAZY_REQUEST_INFO:
+            request.fb_info.evaluate()
+    
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        fb_info = getattr(request, 'fb_info', None)
+        if fb_info is None:
+            return
+        if isinstance(fb_info, LazyFacebookInfo) and not fb_info.evaluated:
+            if getattr(view_func, 'facebook_eager', False) or _has_form_data(request) \
+                    or _has_signed_request(request):
+                fb_info.evaluate()
+        
+        ## Application requests, whether or not the view uses fb_info
+        request_ids = _get_app_request_ids(request)
+        if request_ids:
+            self.process_app_requests(request, request_ids)
+    
+    def process_app_requests(self, request, request_ids):
+        """Send the ``facebook_app_request_received`` signal and, if
+        ``FACEBOOK_PROCESS_APP_REQUESTS`` is enabled, fetch and delete
+        the requests in background.
+        """
+        facebook_app_request_received.send(
+            sender=self.__class__, request=request, request_ids=request_ids)
+        
+        if facebook_settings.FACEBOOK_PROCESS_APP_REQUESTS:
+            ## The access token comes from the signed request
+            access_token = request.fb_info['access_token']
+            if access_token:
+                process_app_requests_async(access_token, request_ids,
+                                           request.fb_info.get('user_id'), request.fb_app)
+    
+    def process_fb_info(self, request, info):
+        """Fill the ``request.fb_info`` dict:
         
         - Validate signed requests from Facebook
           - Login when running in canvas
           - For the deauthorize_callback ping
-        - Process the requests execution when a request_ids parameter
-          is passed -> redirect to somewhere
-        - We should also prevent CSRF code to be checked if the request
+        - Prevent CSRF code to be checked if the request
           is using ``signed_request``.
-        
-        .. NOTE::
-            This middleware should go before CsrfMiddleware in order
-            to skip CSRF validation for POSTs inside canvas apps,
-            in case a valid signed_request was received.
         """
         
-        logger.debug("Running FacebookRequest Middleware")
-        
-        ## Add some facebook-related information to request
-        request.fb_info = {
-            "is_canvas": False,
-            "is_signed_request": None,
-            "signed_request_type": None,
-            "app_request_ids": None,
-            "is_authenticated": None,
-            "access_token": None,
-        }
-        
         ## Check signed request ------------------------------------------------
         _sr_from = None
         _sr_data = None
         
-        if request.POST.has_key('signed_request'):
+        if _has_form_data(request) and request.POST.has_key('signed_request'):
             logger.debug("Got a signed_request via POST")
             _sr_from = 'post'
             _sr_data = request.POST['signed_request']
@@ -68,8 +276,7 @@ class FacebookRequestMiddleware:
             _sr_from = 'get'
             _sr_data = request.GET['signed_request']
         else:
-            cookie_name = 'fbsr_%s' % facebook_settings.FACEBOOK_APP_ID
-            cookie_data = request.COOKIES.get(cookie_name)
+            cookie_data = request.COOKIES.get(request.fb_app.cookie_name)
             if cookie_data:
                 logger.debug("Got a signed_request via cookie")
                 _sr_from = 'cookie'
@@ -77,24 +284,15 @@ class FacebookRequestMiddleware:
         
         if _sr_data:
             logger.debug("Parsing signed request: %r" % _sr_data)
-            parsed_data = parse_signed_data(_sr_data)
+            parsed_data = parse_signed_request_cached(_sr_data, request.fb_app)
             if parsed_data:
-                
-                ##--------------------------------------------------------------
-                ## TODO: To avoid parsing the whole stuff each time
-                ##       we should just check the ``user_id`` in the
-                ##       received data. If the user is already logged in,
-                ##       and the Facebook ID matches, just skip all the
-                ##       verification stuff, unless specifically needed..
-                ##-------------------------------------------------------------- 
-                
                 logger.debug("Valid signed data: %r" % parsed_data)
                 if _sr_from in ('post', 'get'):
-                    request.fb_info['is_canvas'] = True
-                request.fb_info['is_signed_request'] = True
-                request.fb_info['signed_request_type'] = _sr_from
-                request.fb_info['access_token'] = parsed_data['oauth_token']
-                request.fb_info['user_id'] = parsed_data['user_id']
+                    info['is_canvas'] = True
+                info['is_signed_request'] = True
+                info['signed_request_type'] = _sr_from
+                info['access_token'] = parsed_data.get('oauth_token')
+                info['user_id'] = parsed_data.get('user_id')
                 
                 ## Parsed data usually looks like this:
                 ## WARNING! We need some permissions to get email|a_t|etc..!!
@@ -109,14 +307,14 @@ class FacebookRequestMiddleware:
                 ## Skip CSRF validation in case of valid signed request
                 request.csrf_processing_done = True
                 
-                ## TODO: Log in the user
-                connect_user(request, facebook_id=parsed_data['user_id'])
-        
-        ## --- Application requests --------------------------------------------
-        if request.REQUEST.has_key('request_ids'):
-            request.fb_info['app_request_ids'] = request.REQUEST['request_ids'].split(',')
-            ##TODO: Emit the facebook_app_request_received signal here
-
-
-        return###===================================== STOP HERE ===============
-        
+                ## Log in the user, unless already logged in with
+                ## the same Facebook ID (avoids querying the database
+                ## and rewriting the session on each request).
+                ## Signed requests for users who didn't authorize the
+                ## app (or for deauthorize pings) carry no ``oauth_token``.
+                if not (info['user_id'] and info['access_token']):
+                    pass
+                elif is_user_connected(request, info['user_id']):
+                    logger.debug("User %s already connected" % info['user_id'])
+                else:
+                    connect_user(request, facebook_id=info['user_id'])
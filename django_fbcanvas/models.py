@@ -42,3 +42,22 @@ class FacebookUser(models.Model):
 
     def __unicode__(self):
         return "[User: %s - FBUser: %s]" % (self.user.username, self.facebook_id)
+
+
+class DeauthorizeQueueEntry(models.Model):
+    """Deauthorization of the app by a Facebook user, received by the
+    deauthorize callback and waiting to be processed (see
+    :py:mod:`django_fbcanvas.deauthorize`).
+    """
+    
+    ## Facebook ID of the user who deauthorized the app
+    facebook_id = models.BigIntegerField()
+    
+    ## ID of the app that was deauthorized
+    app_id = models.CharField(max_length=64, blank=True)
+    
+    ## When the deauthorize callback was received
+    received_at = models.DateTimeField(auto_now_add=True)
+
+    def __unicode__(self):
+        return "[Deauthorize: %s - App: %s]" % (self.facebook_id, self.app_id)
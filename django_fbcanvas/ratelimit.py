@@ -0,0 +1,185 @@
+"""django_fbcanvas - ratelimit
+
+Client-side rate limiting of requests to the Facebook APIs, to avoid
+hitting the application and user request limits (error codes 4 and 17).
+
+Requests are limited by two token buckets: one per application and
+one per access token. Limits are given as ``(rate, burst)`` tuples,
+where ``rate`` is the number of requests per second allowed on average
+and ``burst`` the maximum number of requests allowed at once::
+
+    FACEBOOK_RATE_LIMIT_APP = (100, 500)
+    FACEBOOK_RATE_LIMIT_USER = (0.05, 50)   ## ~200 requests/hour
+
+Buckets are kept in-process, or shared among processes through a Django
+cache backend (``FACEBOOK_RATE_LIMIT_BACKEND``); in the latter case,
+each bucket is approximated by a counter over a fixed window of
+``burst / rate`` seconds.
+
+When a bucket is empty, depending on the mode (``FACEBOOK_RATE_LIMIT_MODE``
+or the ``rate_limit_mode`` argument of ``OpenFacebook``), the request:
+
+- ``block`` - waits until it can be performed
+- ``fail`` - raises :py:class:`django_fbcanvas.exceptions.RateLimitExceeded`
+
+Callers that would rather not wait can use
+:py:meth:`django_fbcanvas.fb_api.OpenFacebook.request_deferred`, which
+returns an ``AsyncResult`` and performs the request in background if
+the rate limit was reached.
+"""
+
+import time
+import hashlib
+import logging
+import threading
+
+import django_fbcanvas.settings as fb_settings
+from django_fbcanvas.cache import LRUCache, get_django_cache
+from django_fbcanvas.utils import smart_str
+
+logger = logging.getLogger(__name__)
+
+RATE_LIMIT_MODES = ('block', 'fail')
+
+
+class TokenBucket(object):
+    """A token bucket, refilled at ``rate`` tokens per second,
+    holding at most ``capacity`` tokens.
+    """
+
+    def __init__(self, rate, capacity):
+        self.rate = float(rate)
+        self.capacity = float(capacity)
+        self._tokens = self.capacity
+        self._last = time.time()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Take a token from the bucket.
+
+        :returns: ``0`` if a token was taken, else the number of
+            seconds to wait before one will be available.
+        """
+        with self._lock:
+            now = time.time()
+            self._tokens = min(self.capacity, self._tokens + (now - self._last) * self.rate)
+            self._last = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return 0
+            return (1 - self._tokens) / self.rate
+
+
+class LocalBucketStore(object):
+    """In-process buckets. Per-token buckets are kept in a LRU, so
+    that memory doesn't grow with the number of users.
+    """
+
+    def __init__(self, maxsize=10000):
+        self._buckets = LRUCache(maxsize)
+
+    def acquire(self, key, rate, burst):
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = TokenBucket(rate, burst)
+            self._buckets.set(key, bucket)
+        return bucket.acquire()
+
+
+class SharedBucketStore(object):
+    """Buckets shared through a Django cache backend, approximated
+    by counters over fixed windows of ``burst / rate`` seconds.
+    """
+
+    def __init__(self, backend):
+        self.cache = get_django_cache(backend)
+
+    def acquire(self, key, rate, burst):
+        window = float(burst) / rate
+        now = time.time()
+        window_id = int(now / window)
+        cache_key = 'fbcanvas:ratelimit:%s:%d' % (key, window_id)
+        self.cache.add(cache_key, 0, int(window) + 1)
+        try:
+            count = self.cache.incr(cache_key)
+        except ValueError:
+            ## Key expired in the meantime
+            self.cache.add(cache_key, 1, int(window) + 1)
+            count = 1
+        if count <= burst:
+            return 0
+        return (window_id + 1) * window - now
+
+
+class RateLimiter(object):
+    """Rate limiter with buckets per application and per access token.
+
+    :param app_limit: ``(rate, burst)`` for each application,
+        or ``None`` for no limit
+    :param user_limit: ``(rate, burst)`` for each access token,
+        or ``None`` for no limit
+    :param backend: Alias of the Django cache backend used to share
+        the buckets, or ``None`` to keep them in-process
+    """
+
+    def __init__(self, app_limit=None, user_limit=None, backend=None):
+        self.app_limit = app_limit
+        self.user_limit = user_limit
+        if backend:
+            self.store = SharedBucketStore(backend)
+        else:
+            self.store = LocalBucketStore()
+
+    def try_acquire(self, app_id=None, access_token=None):
+        """Try to take a token from the buckets for the request.
+
+        :returns: ``0`` if the request can be performed now, else the
+            number of seconds to wait before trying again.
+        """
+        if self.user_limit and access_token:
+            token_id = hashlib.sha1(smart_str(access_token)).hexdigest()
+            wait = self.store.acquire('user:%s' % token_id, *self.user_limit)
+            if wait:
+                return wait
+        if self.app_limit and app_id:
+            wait = self.store.acquire('app:%s' % app_id, *self.app_limit)
+            if wait:
+                return wait
+        return 0
+
+    def acquire(self, app_id=None, access_token=None, max_wait=None):
+        """Wait until the request can be performed.
+
+        :returns: ``True`` if the request can be performed, ``False``
+            if that would require waiting more than ``max_wait``
+            seconds in total.
+        """
+        waited = 0
+        while True:
+            wait = self.try_acquire(app_id, access_token)
+            if not wait:
+                return True
+            if max_wait is not None and waited + wait > max_wait:
+                return False
+            logger.debug("Rate limit reached, waiting %.2fs", wait)
+            time.sleep(wait)
+            waited += wait
+
+
+_rate_limiter = None
+_rate_limiter_lock = threading.Lock()
+
+def get_rate_limiter():
+    """Returns the process-wide :py:class:`RateLimiter` configured
+    in settings, or ``None`` if no limits were configured.
+    """
+    global _rate_limiter
+    if not (fb_settings.FACEBOOK_RATE_LIMIT_APP or fb_settings.FACEBOOK_RATE_LIMIT_USER):
+        return None
+    if _rate_limiter is None:
+        with _rate_limiter_lock:
+            if _rate_limiter is None:
+                _rate_limiter = RateLimiter(fb_settings.FACEBOOK_RATE_LIMIT_APP,
+                                            fb_settings.FACEBOOK_RATE_LIMIT_USER,
+                                            fb_settings.FACEBOOK_RATE_LIMIT_BACKEND)
+    return _rate_limiter
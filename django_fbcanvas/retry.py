@@ -0,0 +1,159 @@
+"""django_fbcanvas - retry
+
+Retry policies for Facebook API requests.
+
+A :py:class:`RetryPolicy` decides whether a failed request should be
+retried, by looking at the class of the raised exception, and how long
+to wait before retrying (exponential backoff with "full jitter").
+
+Retries are also limited by a process-wide :py:class:`RetryBudget`:
+each request earns a fraction of a retry, so that during an outage
+retries can't multiply the load on the API.
+
+The default policy is built from the ``FACEBOOK_RETRY_*`` settings;
+a different one can be passed to ``OpenFacebook`` or to a single
+request.
+
+Write requests (with POST data, or a ``method`` parameter) may have
+been processed even if they failed, so they use :py:data:`NO_RETRY`
+unless a policy is passed for the single request::
+
+    facebook = OpenFacebook(access_token, retry_policy=RetryPolicy(max_attempts=5))
+    facebook.request('me/feed', post_data=data, retry_policy=RetryPolicy(max_attempts=2))
+"""
+
+import time
+import random
+import urllib2
+import logging
+import threading
+
+import django_fbcanvas.settings as fb_settings
+from django_fbcanvas.exceptions import TransientException
+from django_fbcanvas.utils import import_by_path
+
+logger = logging.getLogger(__name__)
+
+
+class RetryBudget(object):
+    """Limits retries to a fraction of the requests.
+
+    :param ratio: Retries earned for each request (eg. ``0.1`` allows
+        retrying up to 10% of requests)
+    :param min_per_second: Retries allowed each second regardless of
+        the number of requests, so that low-traffic processes can
+        still retry
+    :param max_tokens: Maximum number of retries that can be saved
+    """
+
+    def __init__(self, ratio=0.1, min_per_second=1.0, max_tokens=10.0):
+        self.ratio = ratio
+        self.min_per_second = min_per_second
+        self.max_tokens = max_tokens
+        self._tokens = max_tokens
+        self._last = time.time()
+        self._lock = threading.Lock()
+
+    def _refill(self, amount=0.0):
+        now = time.time()
+        amount += (now - self._last) * self.min_per_second
+        self._last = now
+        self._tokens = min(self.max_tokens, self._tokens + amount)
+
+    def deposit(self):
+        """Called for each new request"""
+        with self._lock:
+            self._refill(self.ratio)
+
+    def withdraw(self):
+        """Called before retrying; returns ``False`` if the budget
+        is exhausted and the request must not be retried.
+        """
+        with self._lock:
+            self._refill()
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return True
+            return False
+
+
+class RetryPolicy(object):
+    """Retry policy with exponential backoff and full jitter.
+
+    :param max_attempts: Maximum number of attempts, including the first
+    :param base_delay: Delay before the first retry, in seconds; it is
+        doubled on each subsequent retry
+    :param max_delay: Maximum delay between attempts, in seconds
+    :param retry_on: Tuple of exception classes considered retryable
+    :param budget: The :py:class:`RetryBudget` shared with other
+        requests, or ``None`` for no limit
+    """
+
+    def __init__(self, max_attempts=2, base_delay=0.1, max_delay=2.0,
+                 retry_on=(urllib2.URLError, TransientException), budget=None):
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.retry_on = tuple(retry_on)
+        self.budget = budget
+
+    def copy(self, **kwargs):
+        """Returns a copy of this policy, with some arguments changed"""
+        args = dict(max_attempts=self.max_attempts, base_delay=self.base_delay,
+                    max_delay=self.max_delay, retry_on=self.retry_on,
+                    budget=self.budget)
+        args.update(kwargs)
+        return RetryPolicy(**args)
+
+    def is_retryable(self, exception):
+        """Whether a request that raised ``exception`` can be retried"""
+        return isinstance(exception, self.retry_on)
+
+    def get_delay(self, retry):
+        """Returns the delay before the ``retry``-th retry (from 1)"""
+        ceiling = min(self.max_delay, self.base_delay * (2 ** (retry - 1)))
+        return random.uniform(0, ceiling)
+
+    def call(self, func):
+        """Call ``func()``, retrying it according to this policy"""
+        if self.budget is not None:
+            self.budget.deposit()
+        attempt = 1
+        while True:
+            try:
+                return func()
+            except Exception, e:
+                if attempt >= self.max_attempts or not self.is_retryable(e):
+                    raise
+                if self.budget is not None and not self.budget.withdraw():
+                    logger.warn('Retry budget exhausted, not retrying: %s', unicode(e))
+                    raise
+                delay = self.get_delay(attempt)
+                logger.warn('Facebook API request failed (attempt %d of %d), '
+                            'retrying in %.2fs: %s', attempt, self.max_attempts,
+                            delay, unicode(e))
+            time.sleep(delay)
+            attempt += 1
+
+
+## Policy never retrying, eg. for non-idempotent requests
+NO_RETRY = RetryPolicy(max_attempts=1)
+
+
+_default_policy = None
+
+def get_default_retry_policy():
+    """Returns the retry policy configured in settings"""
+    global _default_policy
+    if _default_policy is None:
+        retry_on = [import_by_path(path) for path in fb_settings.FACEBOOK_RETRY_ON]
+        budget = None
+        if fb_settings.FACEBOOK_RETRY_BUDGET_RATIO is not None:
+            budget = RetryBudget(fb_settings.FACEBOOK_RETRY_BUDGET_RATIO,
+                                 fb_settings.FACEBOOK_RETRY_BUDGET_MIN_PER_SECOND)
+        _default_policy = RetryPolicy(
+            max_attempts=fb_settings.FACEBOOK_RETRY_MAX_ATTEMPTS,
+            base_delay=fb_settings.FACEBOOK_RETRY_BASE_DELAY,
+            max_delay=fb_settings.FACEBOOK_RETRY_MAX_DELAY,
+            retry_on=retry_on, budget=budget)
+    return _default_policy
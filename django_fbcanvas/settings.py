@@ -13,6 +13,12 @@ from django.core.exceptions import ImproperlyConfigured
 FACEBOOK_APP_ID = getattr(settings, 'FACEBOOK_APP_ID', None)
 FACEBOOK_APP_SECRET = getattr(settings, 'FACEBOOK_APP_SECRET', None)
 
+## Settings for serving many apps from the same deployment, as a list
+## of dicts with ``app_id``, ``secret`` and optionally ``hosts``,
+## ``path_prefixes``, ``canvas_page``, ``default_scope`` keys;
+## see ``django_fbcanvas.app_registry``
+FACEBOOK_APPS = getattr(settings, 'FACEBOOK_APPS', [])
+
 ## Default permissions that will be asked when the user first
 ## authorizes the application
 FACEBOOK_DEFAULT_SCOPE = getattr(settings, 'FACEBOOK_DEFAULT_SCOPE', ['email', 'user_about_me', 'user_birthday'])
@@ -28,10 +34,200 @@ FACEBOOK_FORCE_CANVAS = getattr(settings, 'FACEBOOK_FORCE_CANVAS', True)
 FACEBOOK_FORCE_CANVAS_SIGNED = getattr(settings, 'FACEBOOK_FORCE_CANVAS_SIGNED', False)
 FACEBOOK_FORCE_CANVAS_JSFRAME = getattr(settings, 'FACEBOOK_FORCE_CANVAS_JSFRAME', True)
 
+## Dotted path to the transport class used to perform HTTP requests
+## to Facebook (see ``django_fbcanvas.transports``). If ``None``, it
+## is chosen depending on ``FACEBOOK_HTTP_KEEPALIVE``.
+FACEBOOK_TRANSPORT = getattr(settings, 'FACEBOOK_TRANSPORT', None)
+
+## Whether to use a pool of persistent (keep-alive) connections for
+## requests to the Facebook APIs, instead of opening a new connection
+## (and performing a new TLS handshake) for each request
+FACEBOOK_HTTP_KEEPALIVE = getattr(settings, 'FACEBOOK_HTTP_KEEPALIVE', True)
+
+## Maximum number of idle connections kept in the pool, for each host
+FACEBOOK_HTTP_POOL_SIZE = getattr(settings, 'FACEBOOK_HTTP_POOL_SIZE', 10)
+
+## Seconds after which an idle pooled connection is closed
+FACEBOOK_HTTP_POOL_IDLE_TIMEOUT = getattr(settings, 'FACEBOOK_HTTP_POOL_IDLE_TIMEOUT', 60)
+
+## Number of worker threads used by ``AsyncOpenFacebook`` to run
+## requests, ie. the maximum number of requests in flight per process
+FACEBOOK_ASYNC_POOL_SIZE = getattr(settings, 'FACEBOOK_ASYNC_POOL_SIZE', 100)
+
+## Maximum number of ``AsyncOpenFacebook`` requests queued or running
+## at the same time; submitting more blocks until one completes
+FACEBOOK_ASYNC_MAX_PENDING = getattr(settings, 'FACEBOOK_ASYNC_MAX_PENDING', 1000)
+
+## Whether to cache responses to GET requests performed via
+## ``OpenFacebook.get()``. See ``django_fbcanvas.cache``.
+FACEBOOK_CACHE_ENABLED = getattr(settings, 'FACEBOOK_CACHE_ENABLED', False)
+
+## List of ``(regex, ttl)`` tuples: the first regex matching the request
+## path determines for how many seconds the response is cached.
+## Paths not matching any rule are never cached.
+FACEBOOK_CACHE_TTL_RULES = getattr(settings, 'FACEBOOK_CACHE_TTL_RULES', [])
+
+## Maximum number of responses kept in the in-process cache
+FACEBOOK_CACHE_MAX_ENTRIES = getattr(settings, 'FACEBOOK_CACHE_MAX_ENTRIES', 1000)
+
+## Alias of a Django cache backend (eg. ``'default'``) used to share
+## cached responses between processes, or ``None`` to disable
+FACEBOOK_CACHE_BACKEND = getattr(settings, 'FACEBOOK_CACHE_BACKEND', None)
+
+
+## Whether identical GET requests running at the same time in different
+## threads should be coalesced into a single request
+FACEBOOK_SINGLE_FLIGHT = getattr(settings, 'FACEBOOK_SINGLE_FLIGHT', True)
+
+## Maximum number of seconds a coalesced request waits for the one
+## in flight, before performing the request itself
+FACEBOOK_SINGLE_FLIGHT_TIMEOUT = getattr(settings, 'FACEBOOK_SINGLE_FLIGHT_TIMEOUT', 10)
+
+
+## Seconds ``OpenFacebook.load()`` waits for other requests to merge
+## into the same ``?ids=`` request, or ``None`` to wait until the
+## first result is accessed
+FACEBOOK_LOADER_WINDOW = getattr(settings, 'FACEBOOK_LOADER_WINDOW', 0.005)
+
+
+## Maximum number of attempts for each request to the Facebook APIs,
+## including the first one
+FACEBOOK_RETRY_MAX_ATTEMPTS = getattr(settings, 'FACEBOOK_RETRY_MAX_ATTEMPTS', 2)
+
+## Delay before the first retry, in seconds. Delays are doubled on each
+## retry, up to ``FACEBOOK_RETRY_MAX_DELAY``, and randomized ("jitter")
+FACEBOOK_RETRY_BASE_DELAY = getattr(settings, 'FACEBOOK_RETRY_BASE_DELAY', 0.1)
+FACEBOOK_RETRY_MAX_DELAY = getattr(settings, 'FACEBOOK_RETRY_MAX_DELAY', 2.0)
+
+## Dotted paths of the exception classes for which requests are retried
+FACEBOOK_RETRY_ON = getattr(settings, 'FACEBOOK_RETRY_ON', [
+    'urllib2.URLError',
+    'django_fbcanvas.exceptions.TransientException',
+])
+
+## Retries allowed per request, process-wide (eg. ``0.1`` means at most
+## one retry every ten requests, on average), plus a number of retries
+## allowed each second anyway. Set the ratio to ``None`` for no limits.
+FACEBOOK_RETRY_BUDGET_RATIO = getattr(settings, 'FACEBOOK_RETRY_BUDGET_RATIO', 0.1)
+FACEBOOK_RETRY_BUDGET_MIN_PER_SECOND = getattr(settings, 'FACEBOOK_RETRY_BUDGET_MIN_PER_SECOND', 1.0)
+
+
+## Client-side rate limits for requests to Facebook, for each application
+## and for each access token, as ``(requests_per_second, burst)`` tuples,
+## or ``None`` for no limit. See ``django_fbcanvas.ratelimit``.
+FACEBOOK_RATE_LIMIT_APP = getattr(settings, 'FACEBOOK_RATE_LIMIT_APP', None)
+FACEBOOK_RATE_LIMIT_USER = getattr(settings, 'FACEBOOK_RATE_LIMIT_USER', None)
+
+## Alias of a Django cache backend used to share rate limits among
+## processes, or ``None`` to keep them per-process
+FACEBOOK_RATE_LIMIT_BACKEND = getattr(settings, 'FACEBOOK_RATE_LIMIT_BACKEND', None)
+
+## What to do when the rate limit is reached: ``'block'`` (wait)
+## or ``'fail'`` (raise ``RateLimitExceeded``)
+FACEBOOK_RATE_LIMIT_MODE = getattr(settings, 'FACEBOOK_RATE_LIMIT_MODE', 'block')
+
+## Maximum number of seconds to wait in ``'block'`` mode, before
+## raising ``RateLimitExceeded``
+FACEBOOK_RATE_LIMIT_MAX_WAIT = getattr(settings, 'FACEBOOK_RATE_LIMIT_MAX_WAIT', 10)
+
+## Number of worker threads performing the requests deferred by
+## ``OpenFacebook.request_deferred()`` because of the rate limit
+FACEBOOK_RATE_LIMIT_DEFER_POOL_SIZE = getattr(settings, 'FACEBOOK_RATE_LIMIT_DEFER_POOL_SIZE', 4)
+
+## Maximum number of deferred requests; when reached,
+## ``request_deferred()`` raises ``RateLimitExceeded``
+FACEBOOK_RATE_LIMIT_DEFER_MAX_PENDING = getattr(settings, 'FACEBOOK_RATE_LIMIT_DEFER_MAX_PENDING', 100)
+
+
+## Whether to use circuit breakers (see ``django_fbcanvas.circuitbreaker``)
+## to fail fast when the Facebook APIs are down or too slow
+FACEBOOK_CIRCUIT_BREAKER = getattr(settings, 'FACEBOOK_CIRCUIT_BREAKER', True)
+
+## Number of consecutive failed (or slow) requests after which the
+## circuit opens, and requests fail without being performed
+FACEBOOK_CIRCUIT_FAILURE_THRESHOLD = getattr(settings, 'FACEBOOK_CIRCUIT_FAILURE_THRESHOLD', 5)
+
+## Requests taking longer than this many seconds are counted as failures;
+## ``None`` to only count errors
+FACEBOOK_CIRCUIT_SLOW_CALL_THRESHOLD = getattr(settings, 'FACEBOOK_CIRCUIT_SLOW_CALL_THRESHOLD', None)
+
+## Seconds after which an open circuit lets a probe request through
+FACEBOOK_CIRCUIT_RESET_TIMEOUT = getattr(settings, 'FACEBOOK_CIRCUIT_RESET_TIMEOUT', 30)
+
+## Path prefixes tracked by their own circuit, separately from the
+## rest of the host (eg. ``['fql.query']``)
+FACEBOOK_CIRCUIT_PATH_PREFIXES = getattr(settings, 'FACEBOOK_CIRCUIT_PATH_PREFIXES', [])
+
+
+## Maximum number of verified signed requests kept in memory by
+## ``FacebookRequestMiddleware``, to avoid verifying the same signed
+## request (eg. the JS SDK cookie) many times; ``0`` to disable
+FACEBOOK_SIGNED_REQUEST_CACHE_SIZE = getattr(settings, 'FACEBOOK_SIGNED_REQUEST_CACHE_SIZE', 10000)
+
+## Maximum number of seconds after its ``issued_at`` time for which a
+## verified signed request is cached (also, never after it ``expires``)
+FACEBOOK_SIGNED_REQUEST_CACHE_TTL = getattr(settings, 'FACEBOOK_SIGNED_REQUEST_CACHE_TTL', 600)
+
+## Maximum size, in bytes, of form-encoded POST bodies parsed by
+## ``FacebookRequestMiddleware`` looking for a ``signed_request``.
+## Larger bodies, and bodies of other types, are left to the view.
+FACEBOOK_SIGNED_REQUEST_MAX_BODY_SIZE = getattr(settings, 'FACEBOOK_SIGNED_REQUEST_MAX_BODY_SIZE', 64 * 1024)
+
+
+## Whether ``request.fb_info`` is evaluated lazily, on first access,
+## instead of on each request; see ``FacebookRequestMiddleware``
+FACEBOOK_LAZY_REQUEST_INFO = getattr(settings, 'FACEBOOK_LAZY_REQUEST_INFO', True)
+
+
+## Whether to fetch and delete the app requests whose ``request_ids``
+## are received, in background (see ``django_fbcanvas.app_requests``).
+## Requests carrying ``request_ids`` then always have their signed
+## request verified, to get the access token.
+FACEBOOK_PROCESS_APP_REQUESTS = getattr(settings, 'FACEBOOK_PROCESS_APP_REQUESTS', False)
+
+## Number of worker threads processing app requests
+FACEBOOK_APP_REQUESTS_POOL_SIZE = getattr(settings, 'FACEBOOK_APP_REQUESTS_POOL_SIZE', 4)
+
+## Maximum number of app requests jobs queued or running; when
+## reached, new jobs are dropped (the requests are left on Facebook)
+FACEBOOK_APP_REQUESTS_MAX_PENDING = getattr(settings, 'FACEBOOK_APP_REQUESTS_MAX_PENDING', 100)
+
+
+## Number of deauthorizations processed with each bulk update
+FACEBOOK_DEAUTHORIZE_BATCH_SIZE = getattr(settings, 'FACEBOOK_DEAUTHORIZE_BATCH_SIZE', 500)
+
+## Whether the deauthorize callback also starts processing the queue in
+## a background thread, instead of leaving it to the
+## ``fbcanvas_process_deauthorizations`` management command
+FACEBOOK_DEAUTHORIZE_IN_PROCESS = getattr(settings, 'FACEBOOK_DEAUTHORIZE_IN_PROCESS', False)
+
+## Alias of the Django cache backend, shared by all the processes, used
+## to tell them about deauthorizations (so that cached responses and
+## signed requests of deauthorized users are discarded everywhere), or
+## ``None`` to only discard the data cached by the processing process
+FACEBOOK_DEAUTHORIZE_CACHE_BACKEND = getattr(settings, 'FACEBOOK_DEAUTHORIZE_CACHE_BACKEND', None)
+
+## For how many seconds each process reuses the values it read from
+## ``FACEBOOK_DEAUTHORIZE_CACHE_BACKEND``, instead of querying it on
+## each request: deauthorizations may take this long to reach it
+FACEBOOK_DEAUTHORIZE_CHECK_INTERVAL = getattr(settings, 'FACEBOOK_DEAUTHORIZE_CHECK_INTERVAL', 10)
+
+## For how many seconds after a deauthorization the signed requests
+## issued before it are rejected
+FACEBOOK_DEAUTHORIZE_MARKER_TTL = getattr(settings, 'FACEBOOK_DEAUTHORIZE_MARKER_TTL', 24 * 3600)
+
 
 ## Validate settings -----------------------------------------------------------
 
 required_settings = ['FACEBOOK_APP_ID', 'FACEBOOK_APP_SECRET']
+if FACEBOOK_APPS:
+    ## App IDs and secrets are taken from FACEBOOK_APPS
+    required_settings = []
+    for app_config in FACEBOOK_APPS:
+        if not (app_config.get('app_id') and app_config.get('secret')):
+            raise ImproperlyConfigured("Each app in FACEBOOK_APPS must define 'app_id' and 'secret'.")
+if FACEBOOK_RATE_LIMIT_MODE not in ('block', 'fail'):
+    raise ImproperlyConfigured("FACEBOOK_RATE_LIMIT_MODE must be either 'block' or 'fail'.")
 for setting_name in required_settings:
     if not locals().get(setting_name):
         raise ImproperlyConfigured("%s must be defined in the settings while using django_fbcanvas." % setting_name)
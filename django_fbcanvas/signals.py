@@ -8,4 +8,13 @@ facebook_user_registered = Signal(providing_args=['user', 'facebook_data'])
 ## Sent by FacebookRequestMiddleware if request_ids are received.
 ## Allows attaching of hooks to handle requests (usually this will
 ## end up in a redirect to some request handling page)
-facebook_app_request_received = Signal(providing_args=['request_ids'])
+facebook_app_request_received = Signal(providing_args=['request', 'request_ids'])
+
+## Sent, from a background thread, after app requests have been fetched
+## and deleted (see ``django_fbcanvas.app_requests``). ``app_requests``
+## maps the full request IDs to the requests data.
+facebook_app_requests_processed = Signal(providing_args=['app_requests', 'request_ids', 'user_id', 'app'])
+
+## Sent, after clearing its access token, for each user who deauthorized
+## the app (see ``django_fbcanvas.deauthorize``)
+facebook_user_deauthorized = Signal(providing_args=['facebook_id', 'app_id'])
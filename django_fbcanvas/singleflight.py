@@ -0,0 +1,73 @@
+"""django_fbcanvas - singleflight
+
+Coalescing of identical concurrent calls ("single flight").
+
+When many threads ask for the same key at the same time, only the
+first one actually runs the function; the others wait for it and get
+the same result (or exception). This prevents a "thundering herd" of
+identical Graph API requests, eg. for a popular object on a cache miss.
+"""
+
+import sys
+import copy
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+
+class _Call(object):
+    """A call in flight"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.exc_info = None
+
+
+class SingleFlight(object):
+    """Group of calls coalesced by key.
+
+    :param timeout: Maximum number of seconds a follower waits for
+        the call in flight; after that, it runs the function itself.
+    """
+
+    def __init__(self, timeout=None):
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self._calls = {}
+        self.shared = 0
+
+    def do(self, key, func, timeout=None):
+        """Run ``func()``, unless a call with the same ``key`` is
+        already in flight: in that case wait for it, and return a
+        copy of its result or re-raise its exception.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+
+        if leader:
+            try:
+                call.result = func()
+            except:
+                call.exc_info = sys.exc_info()
+                raise
+            finally:
+                with self._lock:
+                    del self._calls[key]
+                call.done.set()
+            return call.result
+
+        if timeout is None:
+            timeout = self.timeout
+        if not call.done.wait(timeout):
+            logger.debug("Timed out waiting for call in flight: %r", key)
+            return func()
+        self.shared += 1
+        if call.exc_info is not None:
+            raise call.exc_info[0], call.exc_info[1], call.exc_info[2]
+        ## Each caller gets its own copy, as callers may alter the result
+        return copy.deepcopy(call.result)
@@ -0,0 +1,1350 @@
+"""django_fbcanvas - tests"""
+
+import os
+import hmac
+import json
+import base64
+import hashlib
+import time
+import tempfile
+import urlparse
+import socket
+import httplib
+import urllib2
+import unittest
+import threading
+from StringIO import StringIO
+from BaseHTTPServer import HTTPServer, BaseHTTPRequestHandler
+from SocketServer import ThreadingMixIn
+
+from django.contrib.auth import SESSION_KEY
+
+from django_fbcanvas import exceptions as facebook_exceptions
+from django_fbcanvas import api_exceptions
+from django_fbcanvas.exceptions import ErrorCodeIndex
+from django_fbcanvas import fb_api
+from django_fbcanvas.fb_api import FacebookConnection, OpenFacebook
+from django_fbcanvas.circuitbreaker import CircuitBreakerRegistry, CircuitBreaker
+from django_fbcanvas.retry import RetryPolicy
+from django_fbcanvas.loader import GraphLoader
+from django_fbcanvas.jsonstream import iter_items
+from django_fbcanvas.singleflight import SingleFlight
+from django_fbcanvas.cache import GraphResponseCache, SharedValues, LRUCache
+from django_fbcanvas import deauthorize
+from django_fbcanvas import middleware
+from django_fbcanvas.middleware import FacebookRequestMiddleware
+from django_fbcanvas.signals import facebook_app_request_received
+from django_fbcanvas.connection_pool import ConnectionPoolManager
+from django_fbcanvas.transports import PooledTransport, FakeTransport, RecordReplayTransport, \
+    Urllib2Transport
+from django_fbcanvas import decorators
+from django_fbcanvas.app_registry import FacebookApp, AppRegistry
+from django_fbcanvas import app_requests
+from django_fbcanvas import user_mgmt
+from django_fbcanvas.user_mgmt import is_user_connected, SESSION_FACEBOOK_ID_KEY
+from django_fbcanvas.fb_async import AsyncOpenFacebook, wait_all
+from django_fbcanvas.workers import WorkerPool, PoolFull
+from django_fbcanvas.utils import SignedRequestVerifier, parse_signed_data, \
+    parse_signed_data_many, urlsafe_b64decode_bytes
+
+
+class ApiExceptionsTest(unittest.TestCase):
+
+    def test_expired_token_is_oauth_exception(self):
+        ## Typical expired token error: no "(#190)" in the message
+        try:
+            FacebookConnection.raise_error(
+                'OAuthException', 'Error validating access token: Session has '
+                'expired at unix time 1327874400.', code=190)
+        except facebook_exceptions.OAuthException, e:
+            self.assertEqual(e.error_code, 190)
+        else:
+            self.fail("OAuthException not raised")
+
+    def test_generated_classes_are_oauth_exceptions(self):
+        for name in api_exceptions.__all__:
+            if name == 'ERROR_CODE_CLASSES':
+                continue
+            self.assertTrue(issubclass(getattr(api_exceptions, name),
+                                       facebook_exceptions.OAuthException), name)
+
+    def test_classes_created_on_first_access(self):
+        module = type(api_exceptions)(api_exceptions._original_module)
+        self.assertFalse('PermissionError' in module.__dict__)
+        self.assertTrue('PermissionError' in dir(module))
+        error_class = module.PermissionError
+        self.assertTrue(module.PermissionError is error_class)
+        self.assertTrue(module.ERROR_CODE_CLASSES[200] is error_class)
+        self.assertEqual((error_class.error_code, error_class.error_id), (200, 'PERMISSION'))
+        self.assertFalse('ParamError' in module.__dict__)
+        self.assertTrue(100 in module.ERROR_CODE_CLASSES)
+        self.assertEqual(module.ERROR_CODE_CLASSES.get(99999), None)
+        self.assertRaises(AttributeError, getattr, module, 'NoSuchError')
+
+
+
+class _FakeRateLimiter(object):
+
+    def __init__(self, wait):
+        self.wait = wait
+        self.acquired = 0
+        self.calls = []
+
+    def try_acquire(self, app_id=None, access_token=None):
+        self.calls.append(('try_acquire', app_id))
+        if not self.wait:
+            self.acquired += 1
+        return self.wait
+
+    def acquire(self, app_id=None, access_token=None, max_wait=None):
+        self.calls.append(('acquire', app_id))
+        self.acquired += 1
+        return True
+
+
+class RequestDeferredTest(unittest.TestCase):
+
+    def setUp(self):
+        self.calls = []
+        self._orig_get_rate_limiter = fb_api.get_rate_limiter
+        def _request(cls, url, post_data=None, **kwargs):
+            self.calls.append(kwargs)
+            return {'url': url}
+        OpenFacebook._request = classmethod(_request)
+
+    def tearDown(self):
+        del OpenFacebook._request
+        fb_api.get_rate_limiter = self._orig_get_rate_limiter
+
+    def test_performed_now_within_rate_limit(self):
+        fb_api.get_rate_limiter = lambda: _FakeRateLimiter(0)
+        result = OpenFacebook('token').request_deferred('me')
+        self.assertTrue(result.ready())
+        self.assertTrue('/me' in result.get()['url'])
+        self.assertEqual(self.calls[0]['check_rate_limit'], False)
+
+    def test_deferred_over_rate_limit(self):
+        fb_api.get_rate_limiter = lambda: _FakeRateLimiter(0.5)
+        result = OpenFacebook('token').request_deferred('me')
+        self.assertTrue('/me' in result.get(5)['url'])
+        self.assertEqual(self.calls[0]['rate_limit_mode'], 'block')
+
+
+
+class CircuitBreakerTest(unittest.TestCase):
+
+    url = 'https://graph.facebook.com/me'
+    too_many_calls = '{"error": {"type": "OAuthException", "code": 17, ' \
+        '"message": "(#17) User request limit reached"}}'
+
+    def setUp(self):
+        self._orig_get_circuit_breakers = fb_api.get_circuit_breakers
+        self.breakers = CircuitBreakerRegistry(failure_threshold=2)
+        fb_api.get_circuit_breakers = lambda: self.breakers
+        self.breaker = self.breakers.get_breaker(self.url)
+        self.retry_policy = RetryPolicy(max_attempts=3, base_delay=0, max_delay=0)
+
+    def tearDown(self):
+        fb_api.get_circuit_breakers = self._orig_get_circuit_breakers
+
+    def test_user_rate_limit_is_not_a_failure(self):
+        transport = FakeTransport({'me': self.too_many_calls})
+        for i in range(3):
+            self.assertRaises(facebook_exceptions.TooManyCallsException,
+                              FacebookConnection._do_request, self.url, None, 1,
+                              self.retry_policy, transport)
+        self.assertEqual(self.breaker.failures, 0)
+        self.assertTrue(self.breaker.allow_request())
+
+    def test_retries_are_recorded_once(self):
+        transport = FakeTransport({'me': {'error': {
+            'type': 'OAuthException', 'code': 2, 'message': 'Service unavailable'}}})
+        self.assertRaises(facebook_exceptions.TransientException,
+                          FacebookConnection._do_request, self.url, None, 1,
+                          self.retry_policy, transport)
+        self.assertEqual(self.breaker.failures, 1)
+        self.assertEqual(len(transport.requests), 3)
+
+    def test_half_open_probes(self):
+        breaker = CircuitBreaker('test', failure_threshold=1, reset_timeout=0,
+                                 half_open_max_calls=2)
+        closed_calls = [breaker.allow_request() for i in range(2)]
+        breaker.record(False, allowed=closed_calls[0])
+        probe = breaker.allow_request()
+        self.assertEqual(breaker.state, 'half-open')
+        ## Calls admitted while closed, finishing while half-open,
+        ## don't free probe slots
+        breaker.record(False, allowed=closed_calls[1])
+        self.assertEqual(breaker._probes, 1)
+        ## Nor do probes of a previous half-open period
+        second_probe = breaker.allow_request()
+        breaker.record(False, allowed=probe)
+        self.assertEqual(breaker._probes, 1)
+        breaker.allow_request()
+        breaker.record(True, allowed=second_probe)
+        self.assertEqual(breaker.state, 'closed')
+
+    def test_stream_uses_circuit(self):
+        for i in range(2):
+            self.breaker.record(False)
+        facebook = OpenFacebook('token', transport=FakeTransport({'me': {'data': [1]}}))
+        self.assertRaises(facebook_exceptions.CircuitOpenException,
+                          list, facebook.stream('me'))
+
+
+
+class _FakeFacebook(object):
+
+    def __init__(self, fail=False):
+        self.fail = fail
+        self.requests = []
+
+    def get_many(self, *ids):
+        self.requests.append(ids)
+        if self.fail:
+            raise facebook_exceptions.OpenFacebookException('Failed')
+        return dict((id, {'id': id}) for id in ids)
+
+
+class GraphLoaderTest(unittest.TestCase):
+
+    def test_single_request(self):
+        facebook = _FakeFacebook()
+        loader = GraphLoader(facebook)
+        objects = loader.load_many(['1', '2', '3'])
+        self.assertEqual([o['id'] for o in objects], ['1', '2', '3'])
+        self.assertEqual(loader.load('2')['id'], '2')
+        self.assertEqual(facebook.requests, [('1', '2', '3')])
+
+    def test_failed_objects_are_forgotten(self):
+        facebook = _FakeFacebook(fail=True)
+        loader = GraphLoader(facebook)
+        self.assertRaises(facebook_exceptions.OpenFacebookException,
+                          loader.load('1').result)
+        facebook.fail = False
+        self.assertEqual(loader.load('1')['id'], '1')
+        self.assertEqual(len(facebook.requests), 2)
+
+    def test_objects_are_bounded(self):
+        loader = GraphLoader(_FakeFacebook(), max_objects=10)
+        for id in range(100):
+            loader.load(id).result()
+        self.assertEqual(len(loader._objects), 10)
+
+
+
+class JsonStreamTest(unittest.TestCase):
+
+    documents = [
+        '{"data": [{"id": "1", "name": "caf\\u00e9"}, 1234.5, 7, -0.25e-3, 1E+10, '
+        'true, null, "x"], "paging": {"next": "http://example.com"}}',
+        '[12345678901234567890, 3.14159, 2e5, {"a": [1, 22, 333]}, false, 9]',
+        '{"error": {"code": 17, "message": "limit"}}',
+        '{"data": []}',
+        ' [ 1 , 2.0 , 300 ] ',
+    ]
+
+    def _expected(self, document):
+        parsed = json.loads(document)
+        if isinstance(parsed, list):
+            return parsed
+        return parsed.get('data', [])
+
+    def test_all_chunk_sizes(self):
+        for document in self.documents:
+            expected = self._expected(document)
+            for chunk_size in range(1, len(document) + 2):
+                items = list(iter_items(StringIO(document), chunk_size=chunk_size))
+                self.assertEqual(items, expected, (document, chunk_size))
+
+    def test_errors(self):
+        errors = []
+        list(iter_items(StringIO(self.documents[2]), on_error=errors.append))
+        self.assertEqual(errors, [{'error': {'code': 17, 'message': 'limit'}}])
+
+
+
+class _FakeDjangoCache(object):
+    """Dict-based stand-in for a Django cache shared by many processes"""
+
+    def __init__(self):
+        self.data = {}
+        self.gets = 0
+
+    def get(self, key, default=None):
+        self.gets += 1
+        return self.data.get(key, default)
+
+    def set(self, key, value, timeout=None):
+        self.data[key] = value
+
+    def delete_many(self, keys):
+        for key in keys:
+            self.data.pop(key, None)
+
+
+class SharedInvalidationTest(unittest.TestCase):
+
+    def setUp(self):
+        self.shared = _FakeDjangoCache()
+        self._orig_get_deauthorize_cache = deauthorize.get_deauthorize_cache
+        deauthorize.get_deauthorize_cache = lambda: self.shared
+
+    def tearDown(self):
+        deauthorize.get_deauthorize_cache = self._orig_get_deauthorize_cache
+
+    def _make_cache(self, check_interval=0):
+        cache = GraphResponseCache(ttl_rules=[(r'^me$', 60)])
+        cache.generations = SharedValues(self.shared, check_interval=check_interval)
+        return cache
+
+    def test_shared_cache_not_queried_on_each_hit(self):
+        cache = self._make_cache(check_interval=60)
+        for i in range(5):
+            cache.get_or_fetch('me', {}, 'token', lambda: {'id': '1'})
+        self.assertEqual(self.shared.gets, 1)
+
+    def test_invalidate_token_in_other_process(self):
+        web, worker = self._make_cache(), self._make_cache()
+        calls = []
+        fetch = lambda: calls.append(1) or {'id': '1'}
+        web.get_or_fetch('me', {}, 'token', fetch)
+        web.get_or_fetch('me', {}, 'token', fetch)
+        self.assertEqual(len(calls), 1)
+        worker.invalidate_token('token')
+        web.get_or_fetch('me', {}, 'token', fetch)
+        self.assertEqual(len(calls), 2)
+
+    def test_signed_requests_issued_before_deauthorization(self):
+        self.assertFalse(deauthorize.is_deauthorized('1', '42', 0))
+        self.shared.set(deauthorize._deauthorized_key('1', '42'), 1000)
+        self.assertTrue(deauthorize.is_deauthorized('1', '42', 999))
+        self.assertFalse(deauthorize.is_deauthorized('1', '42', 1001))
+        self.assertFalse(deauthorize.is_deauthorized('2', '42', 999))
+
+
+
+class _FakeRequest(object):
+
+    def __init__(self, GET=None):
+        self.method = 'GET'
+        self.path = '/'
+        self.GET = GET or {}
+        self.POST = {}
+        self.COOKIES = {}
+        self.META = {}
+
+
+class AppRequestsMiddlewareTest(unittest.TestCase):
+
+    def setUp(self):
+        self.received = []
+        facebook_app_request_received.connect(self._receiver)
+
+    def tearDown(self):
+        facebook_app_request_received.disconnect(self._receiver)
+
+    def _receiver(self, sender, request_ids, **kwargs):
+        self.received.append(request_ids)
+
+    def test_signal_sent_without_reading_fb_info(self):
+        middleware = FacebookRequestMiddleware()
+        request = _FakeRequest({'request_ids': '1,2'})
+        middleware.process_request(request)
+        middleware.process_view(request, lambda request: None, (), {})
+        self.assertEqual(self.received, [['1', '2']])
+        ## Processing is disabled by default, so no need to evaluate
+        self.assertFalse(request.fb_info.evaluated)
+
+
+
+class _TestServer(ThreadingMixIn, HTTPServer):
+    """Local HTTP server counting the requests it receives, and
+    answering them after ``delay`` seconds
+    """
+    daemon_threads = True
+
+    def __init__(self, delay=0, handler=None):
+        self.delay = delay
+        self.hits = 0
+        HTTPServer.__init__(self, ('127.0.0.1', 0), handler or _TestHandler)
+        self.url = 'http://127.0.0.1:%d/me' % self.server_address[1]
+        thread = threading.Thread(target=self.serve_forever)
+        thread.daemon = True
+        thread.start()
+
+    def handle_error(self, request, client_address):
+        ## Clients giving up on slow responses close their connection
+        pass
+
+
+class _TestHandler(BaseHTTPRequestHandler):
+
+    def _respond(self):
+        self.server.hits += 1
+        if self.command == 'POST':
+            self.rfile.read(int(self.headers.getheader('content-length') or 0))
+        time.sleep(self.server.delay)
+        body = '{"id": "1"}'
+        self.send_response(200)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    do_GET = do_POST = _respond
+
+    def log_message(self, *args):
+        pass
+
+
+class _ClosingHandler(_TestHandler):
+    """Handler closing keep-alive connections after each response,
+    like servers dropping idle connections
+    """
+    protocol_version = 'HTTP/1.1'
+
+    def _respond(self):
+        _TestHandler._respond(self)
+        self.close_connection = 1
+
+    do_GET = do_POST = _respond
+
+
+class PooledTransportTest(unittest.TestCase):
+
+    def test_request(self):
+        server = _TestServer()
+        try:
+            self.assertEqual(PooledTransport().request(server.url, timeout=5), u'{"id": "1"}')
+        finally:
+            server.shutdown()
+
+    def test_timed_out_post_is_not_resent(self):
+        server = _TestServer(delay=2)
+        retry_policy = RetryPolicy(max_attempts=3, base_delay=0, max_delay=0)
+        try:
+            self.assertRaises(socket.timeout, retry_policy.call,
+                              lambda: PooledTransport().request(server.url, 'a=1', timeout=1))
+            self.assertEqual(server.hits, 1)
+        finally:
+            server.shutdown()
+
+    def test_connect_error_is_url_error(self):
+        sock = socket.socket()
+        sock.bind(('127.0.0.1', 0))
+        port = sock.getsockname()[1]
+        sock.close()
+        self.assertRaises(urllib2.URLError, PooledTransport().request,
+                          'http://127.0.0.1:%d/me' % port, timeout=1)
+
+    def test_dropped_connection(self):
+        server = _TestServer(handler=_ClosingHandler)
+        manager = ConnectionPoolManager()
+        try:
+            self.assertEqual(manager.urlopen(server.url, timeout=5), (200, '{"id": "1"}'))
+            time.sleep(0.1)
+            ## GET requests are sent again on a new connection..
+            self.assertEqual(manager.urlopen(server.url, timeout=5), (200, '{"id": "1"}'))
+            self.assertEqual(server.hits, 2)
+            time.sleep(0.1)
+            ## ..but not POSTs, which may have been processed
+            self.assertRaises((socket.error, httplib.HTTPException),
+                              manager.urlopen, server.url, 'a=1', timeout=5)
+        finally:
+            manager.clear()
+            server.shutdown()
+
+
+
+class _FailingTransport(FakeTransport):
+    """Transport failing all the requests with ``URLError``"""
+
+    def request(self, url, post_string=None, timeout=None):
+        FakeTransport.request(self, url, post_string, timeout)
+        raise urllib2.URLError('Connection reset')
+
+
+class WriteRetryTest(unittest.TestCase):
+
+    def setUp(self):
+        self.transport = _FailingTransport()
+        retry_policy = RetryPolicy(max_attempts=3, base_delay=0, max_delay=0)
+        self.facebook = OpenFacebook('token', transport=self.transport,
+                                     retry_policy=retry_policy)
+
+    def test_reads_are_retried(self):
+        self.assertRaises(urllib2.URLError, self.facebook.request, 'me')
+        self.assertEqual(len(self.transport.requests), 3)
+
+    def test_writes_are_not_retried(self):
+        self.assertRaises(urllib2.URLError, self.facebook.request, 'me/feed',
+                          post_data={'message': 'Hi'})
+        self.assertRaises(urllib2.URLError, self.facebook.request, '1234', method='delete')
+        self.assertEqual(len(self.transport.requests), 2)
+
+    def test_writes_retried_on_request(self):
+        retry_policy = RetryPolicy(max_attempts=2, base_delay=0, max_delay=0)
+        self.assertRaises(urllib2.URLError, self.facebook.request, 'me/feed',
+                          post_data={'message': 'Hi'}, retry_policy=retry_policy)
+        self.assertEqual(len(self.transport.requests), 2)
+
+
+
+class _AnonymousUser(object):
+
+    def is_authenticated(self):
+        return False
+
+
+class FacebookRequiredTest(unittest.TestCase):
+
+    def setUp(self):
+        self.scopes = []
+        self._orig_oauth_start = decorators.oauth_start
+        decorators.oauth_start = lambda request, scope=None: self.scopes.append(scope)
+
+    def tearDown(self):
+        decorators.oauth_start = self._orig_oauth_start
+
+    def _call(self, view, app):
+        request = _FakeRequest()
+        request.user = _AnonymousUser()
+        request.fb_app = app
+        view(request)
+
+    def test_scope_of_the_request_app(self):
+        view = decorators.facebook_required(lambda request: None)
+        self._call(view, FacebookApp('1', 'secret', default_scope=['email']))
+        self._call(view, FacebookApp('2', 'secret', default_scope=['user_likes']))
+        self.assertEqual(self.scopes, [['email'], ['user_likes']])
+
+    def test_explicit_scope(self):
+        view = decorators.facebook_required(scope='publish_actions,email')(lambda request: None)
+        self._call(view, FacebookApp('1', 'secret', default_scope=['user_likes']))
+        self.assertEqual(self.scopes, [['publish_actions', 'email']])
+
+
+
+class _GraphTransport(FakeTransport):
+    """Transport answering ``?ids=`` requests with the objects listed in
+    ``objects``, and ``batch`` requests with ``true`` for each operation
+    """
+
+    def __init__(self, objects):
+        FakeTransport.__init__(self)
+        self.objects = objects
+
+    def request(self, url, post_string=None, timeout=None):
+        FakeTransport.request(self, url, post_string, timeout)
+        if post_string is not None:
+            batch = json.loads(urlparse.parse_qs(post_string)['batch'][0])
+            return json.dumps([{'code': 200, 'body': 'true'} for op in batch])
+        ids = urlparse.parse_qs(urlparse.urlsplit(url).query)['ids'][0].split(',')
+        if len(ids) > 50:
+            return json.dumps({'error': {'type': 'OAuthException', 'code': 100,
+                                         'message': '(#100) Too many IDs'}})
+        return json.dumps(dict((id, self.objects[id]) for id in ids if id in self.objects))
+
+
+class AppRequestsTest(unittest.TestCase):
+
+    def test_many_request_ids(self):
+        request_ids = [str(i) for i in range(120)]
+        transport = _GraphTransport(dict(('%s_42' % i, {'id': '%s_42' % i})
+                                         for i in range(0, 120, 2)))
+        app_requests.OpenFacebook = lambda access_token, app=None: \
+            OpenFacebook(access_token, app=app, transport=transport)
+        try:
+            fetched = app_requests.process_app_requests('token', request_ids, '42')
+        finally:
+            app_requests.OpenFacebook = OpenFacebook
+        self.assertEqual(len(fetched), 60)
+        deleted = []
+        for url, post_string in transport.requests:
+            if post_string is not None:
+                batch = json.loads(urlparse.parse_qs(post_string)['batch'][0])
+                deleted.extend(op['relative_url'] for op in batch)
+        self.assertEqual(sorted(deleted), sorted(fetched))
+
+
+
+class _SlowTransport(FakeTransport):
+
+    def request(self, url, post_string=None, timeout=None):
+        time.sleep(0.3)
+        return FakeTransport.request(self, url, post_string, timeout)
+
+
+class SingleFlightTest(unittest.TestCase):
+
+    def setUp(self):
+        self._orig_get_rate_limiter = fb_api.get_rate_limiter
+        self.rate_limiter = _FakeRateLimiter(0)
+        fb_api.get_rate_limiter = lambda: self.rate_limiter
+
+    def tearDown(self):
+        fb_api.get_rate_limiter = self._orig_get_rate_limiter
+
+    def test_coalesced_reads_take_one_token(self):
+        transport = _SlowTransport({'me': {'id': '1'}})
+        results = []
+        def get():
+            results.append(OpenFacebook('token', transport=transport,
+                                        rate_limit_mode='block').request('me'))
+        threads = [threading.Thread(target=get) for i in range(3)]
+        for thread in threads:
+            thread.start()
+            time.sleep(0.05)
+        for thread in threads:
+            thread.join()
+        self.assertEqual(results, [{'id': '1'}] * 3)
+        self.assertEqual(len(transport.requests), 1)
+        self.assertEqual(self.rate_limiter.acquired, 1)
+
+    def _run_concurrently(self, func, count=3):
+        results = []
+        def run():
+            try:
+                results.append(func())
+            except Exception, e:
+                results.append(e)
+        threads = [threading.Thread(target=run) for i in range(count)]
+        for thread in threads:
+            thread.start()
+            time.sleep(0.05)
+        for thread in threads:
+            thread.join()
+        return results
+
+    def test_coalescing(self):
+        group = SingleFlight()
+        calls = []
+        def func():
+            calls.append(1)
+            time.sleep(0.3)
+            return {'data': [1]}
+        results = self._run_concurrently(lambda: group.do('me', func))
+        self.assertEqual(results, [{'data': [1]}] * 3)
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(group.shared, 2)
+        ## Each caller gets its own copy
+        results[0]['data'].append(2)
+        self.assertEqual(results[1], {'data': [1]})
+        ## Later calls are not coalesced
+        group.do('me', func)
+        self.assertEqual(len(calls), 2)
+
+    def test_exceptions_are_shared(self):
+        group = SingleFlight()
+        def func():
+            time.sleep(0.3)
+            raise ValueError('failed')
+        results = self._run_concurrently(lambda: group.do('me', func))
+        self.assertEqual([type(r) for r in results], [ValueError] * 3)
+
+    def test_follower_timeout(self):
+        group = SingleFlight(timeout=0.05)
+        calls = []
+        def func():
+            calls.append(1)
+            time.sleep(0.3)
+            return 1
+        self.assertEqual(self._run_concurrently(lambda: group.do('me', func), 2), [1, 1])
+        self.assertEqual(len(calls), 2)
+        self.assertEqual(group.shared, 0)
+
+
+
+class RecordReplayTransportTest(unittest.TestCase):
+
+    def setUp(self):
+        fd, self.filename = tempfile.mkstemp(suffix='.json')
+        os.close(fd)
+
+    def tearDown(self):
+        os.unlink(self.filename)
+
+    def test_record_and_replay(self):
+        url = ('https://graph.facebook.com/oauth/access_token?client_id=1'
+               '&client_secret=SECRET&code=CODE&redirect_uri=http%3A%2F%2Fexample.com%2F')
+        fake = FakeTransport()
+        fake.add('oauth/access_token', 'access_token=TOKEN&expires=100')
+        with RecordReplayTransport(self.filename, 'record', fake) as transport:
+            transport.request(url)
+            transport.request('https://graph.facebook.com/me?access_token=TOKEN')
+            ## Written once, when done
+            self.assertEqual(os.path.getsize(self.filename), 0)
+        recordings = open(self.filename).read()
+        self.assertFalse('SECRET' in recordings or 'CODE' in recordings)
+
+        transport = RecordReplayTransport(self.filename)
+        self.assertEqual(transport.request(url), 'access_token=TOKEN&expires=100')
+        self.assertRaises(urllib2.URLError, transport.request,
+                          'https://graph.facebook.com/me/friends')
+
+
+
+def _paged_transport():
+    transport = FakeTransport()
+    transport.add('me/friends?limit=2', {'data': [1, 2], 'paging': {
+        'next': 'https://graph.facebook.com/me/friends?limit=2&after=A&access_token=token'}})
+    transport.add('me/friends?after=A&limit=2', {'data': [3, 4], 'paging': {
+        'next': 'https://graph.facebook.com/me/friends?limit=2&after=B&access_token=token'}})
+    transport.add('me/friends?after=B&limit=2', {'data': [5]})
+    return transport
+
+
+class IterateTest(unittest.TestCase):
+
+    def setUp(self):
+        self._orig_get_rate_limiter = fb_api.get_rate_limiter
+        self.rate_limiter = _FakeRateLimiter(0)
+        fb_api.get_rate_limiter = lambda: self.rate_limiter
+
+    def tearDown(self):
+        fb_api.get_rate_limiter = self._orig_get_rate_limiter
+
+    def _facebook(self, transport, **kwargs):
+        return OpenFacebook('token', transport=transport, **kwargs)
+
+    def test_all_pages(self):
+        for prefetch in (False, True):
+            facebook = self._facebook(_paged_transport())
+            items = list(facebook.iterate('me/friends', limit=2, prefetch=prefetch))
+            self.assertEqual(items, [1, 2, 3, 4, 5])
+
+    def test_limits(self):
+        transport = _paged_transport()
+        items = list(self._facebook(transport).iterate('me/friends', max_items=3, limit=2))
+        self.assertEqual(items, [1, 2, 3])
+        self.assertEqual(len(transport.requests), 2)
+        transport = _paged_transport()
+        items = list(self._facebook(transport).iterate('me/friends', max_pages=1, limit=2))
+        self.assertEqual(items, [1, 2])
+        self.assertEqual(len(transport.requests), 1)
+
+    def test_pages_use_rate_limit_mode_and_app(self):
+        facebook = self._facebook(_paged_transport(), rate_limit_mode='fail',
+                                  app=FacebookApp('77', 'secret'))
+        list(facebook.iterate('me/friends', limit=2))
+        self.assertEqual(self.rate_limiter.calls, [('try_acquire', '77')] * 3)
+
+    def test_prefetch_from_pool_worker(self):
+        from django_fbcanvas.fb_async import get_async_pool
+        facebook = self._facebook(_paged_transport())
+        result = get_async_pool().submit(
+            lambda: list(facebook.iterate('me/friends', limit=2, prefetch=True)))
+        self.assertEqual(result.get(5), [1, 2, 3, 4, 5])
+
+    def test_prefetch_with_full_pool(self):
+        from django_fbcanvas import fb_async
+        pool = WorkerPool(1, max_pending=1, name='test-full')
+        event = threading.Event()
+        orig_get_async_pool = fb_async.get_async_pool
+        fb_async.get_async_pool = lambda: pool
+        try:
+            pool.submit(event.wait, 5)
+            facebook = self._facebook(_paged_transport())
+            items = list(facebook.iterate('me/friends', limit=2, prefetch=True))
+            self.assertEqual(items, [1, 2, 3, 4, 5])
+        finally:
+            fb_async.get_async_pool = orig_get_async_pool
+            event.set()
+            pool.close()
+
+    def test_stops_on_empty_page(self):
+        transport = FakeTransport()
+        transport.add('me/friends', {'data': [1], 'paging': {
+            'next': 'https://graph.facebook.com/me/friends?after=A'}})
+        transport.add('me/friends?after=A', {'data': [], 'paging': {
+            'next': 'https://graph.facebook.com/me/friends?after=B'}})
+        self.assertEqual(list(self._facebook(transport).iterate('me/friends')), [1])
+        self.assertEqual(len(transport.requests), 2)
+
+
+
+class _BatchTransport(FakeTransport):
+    """Transport answering each batch operation with ``responses[url]``"""
+
+    def __init__(self, responses):
+        FakeTransport.__init__(self)
+        self.batch_responses = responses
+
+    def request(self, url, post_string=None, timeout=None):
+        FakeTransport.request(self, url, post_string, timeout)
+        batch = json.loads(urlparse.parse_qs(post_string)['batch'][0])
+        return json.dumps([self.batch_responses.get(op['relative_url']) for op in batch])
+
+
+class BatchTest(unittest.TestCase):
+
+    def test_chunks(self):
+        responses = dict((str(i), {'code': 200, 'body': json.dumps({'id': str(i)})})
+                         for i in range(120))
+        transport = _BatchTransport(responses)
+        results = OpenFacebook('token', transport=transport).batch(
+            [str(i) for i in range(120)])
+        self.assertEqual([r['id'] for r in results], [str(i) for i in range(120)])
+        self.assertEqual([len(json.loads(urlparse.parse_qs(post_string)['batch'][0]))
+                          for url, post_string in transport.requests], [50, 50, 20])
+
+    def test_operations(self):
+        transport = _BatchTransport({})
+        OpenFacebook('token', transport=transport).batch([
+            'me', ('DELETE', '123'), ('POST', 'me/feed', {'message': 'Hi'}),
+            ('GET', 'me/friends', {'limit': 10})])
+        batch = json.loads(urlparse.parse_qs(transport.requests[0][1])['batch'][0])
+        self.assertEqual(batch, [
+            {'method': 'GET', 'relative_url': 'me'},
+            {'method': 'DELETE', 'relative_url': '123'},
+            {'method': 'POST', 'relative_url': 'me/feed', 'body': 'message=Hi'},
+            {'method': 'GET', 'relative_url': 'me/friends?limit=10'}])
+
+    def test_per_item_errors(self):
+        transport = _BatchTransport({
+            'me': {'code': 200, 'body': '{"id": "1"}'},
+            'me/permissions': {'code': 403, 'body': json.dumps({'error': {
+                'type': 'OAuthException', 'code': 200, 'message': '(#200) Permissions error'}})},
+        })
+        me, permissions, missing = OpenFacebook('token', transport=transport).batch(
+            ['me', 'me/permissions', 'missing'])
+        self.assertEqual(me, {'id': '1'})
+        self.assertTrue(isinstance(permissions, facebook_exceptions.PermissionException))
+        ## Operations not completed in time are returned as null
+        self.assertTrue(isinstance(missing, facebook_exceptions.OpenFacebookException))
+
+
+
+class AsyncOpenFacebookTest(unittest.TestCase):
+
+    def setUp(self):
+        self.pool = WorkerPool(2, name='test')
+
+    def tearDown(self):
+        self.pool.close()
+
+    def test_requests(self):
+        transport = FakeTransport({'me': {'id': '1'}, 'me/friends': {'data': [1]}})
+        facebook = AsyncOpenFacebook('token', pool=self.pool, transport=transport)
+        me, friends = facebook.get('me'), facebook.get('me/friends')
+        self.assertEqual(wait_all([me, friends], 5), [{'id': '1'}, {'data': [1]}])
+        self.assertEqual(len(transport.requests), 2)
+
+    def test_errors(self):
+        transport = FakeTransport({'me': {'id': '1'}})
+        facebook = AsyncOpenFacebook('token', pool=self.pool, transport=transport)
+        results = [facebook.get('me'), facebook.get('missing')]
+        self.assertRaises(facebook_exceptions.OpenFacebookException,
+                          wait_all, results, 5)
+
+    def test_pool_full(self):
+        pool = WorkerPool(1, max_pending=1, name='test-full')
+        event = threading.Event()
+        try:
+            result = pool.submit(event.wait, 5)
+            self.assertRaises(PoolFull, pool.try_submit, len, [])
+            event.set()
+            result.get(5)
+            self.assertEqual(pool.try_submit(len, [1]).get(5), 1)
+        finally:
+            event.set()
+            pool.close()
+
+    def test_in_worker(self):
+        self.assertFalse(self.pool.in_worker())
+        self.assertTrue(self.pool.submit(self.pool.in_worker).get(5))
+        self.assertFalse(self.pool.submit(WorkerPool(1).in_worker).get(5))
+
+
+
+class TransportsTest(unittest.TestCase):
+
+    def test_fake_transport(self):
+        transport = FakeTransport({'me': {'id': '1'}})
+        transport.add('me/friends?limit=1', {'data': [1]})
+        transport.add('me/feed', {'id': '2'}, method='POST')
+        graph = 'https://graph.facebook.com/'
+        ## Secret parameters and the query order are ignored
+        self.assertEqual(transport.request(graph + 'me/friends?access_token=token&limit=1'),
+                         '{"data": [1]}')
+        ## Responses for the bare path match any query
+        self.assertEqual(transport.request(graph + 'me?fields=id'), '{"id": "1"}')
+        self.assertEqual(transport.request(graph + 'me/feed', 'message=Hi'), '{"id": "2"}')
+        self.assertTrue('error' in json.loads(transport.request(graph + 'me/feed')))
+        self.assertEqual(len(transport.requests), 4)
+        self.assertEqual(transport.open(graph + 'me').read(), '{"id": "1"}')
+
+    def test_urllib2_transport(self):
+        server = _TestServer()
+        try:
+            transport = Urllib2Transport()
+            self.assertEqual(transport.request(server.url, timeout=5), u'{"id": "1"}')
+            self.assertEqual(transport.request(server.url, 'a=1', timeout=5), u'{"id": "1"}')
+            self.assertEqual(server.hits, 2)
+        finally:
+            server.shutdown()
+
+    def test_pooled_transport_stream(self):
+        server = _TestServer()
+        try:
+            response = PooledTransport().open(server.url, timeout=5)
+            try:
+                self.assertEqual(response.read(), '{"id": "1"}')
+            finally:
+                response.close()
+        finally:
+            server.shutdown()
+
+    def test_replay_mode(self):
+        self.assertRaises(ValueError, RecordReplayTransport, 'recordings.json', 'bogus')
+
+
+
+class ResponseCacheTest(unittest.TestCase):
+
+    def test_lru_cache(self):
+        cache = LRUCache(maxsize=2)
+        cache.set('a', 1)
+        cache.set('b', 2)
+        cache.get('a')
+        cache.set('c', 3)
+        ## "b" was the least recently used
+        self.assertEqual([cache.get(key) for key in 'abc'], [1, None, 3])
+        cache.set('d', 4, time.time() - 1)
+        self.assertEqual(cache.get('d', 'expired'), 'expired')
+
+    def test_ttl_rules(self):
+        cache = GraphResponseCache(ttl_rules=[(r'^me/home', 0), (r'^me', 60)])
+        self.assertEqual(cache.get_ttl('/me/'), 60)
+        self.assertEqual(cache.get_ttl('me/home'), 0)
+        self.assertEqual(cache.get_ttl('123'), 0)
+        calls = []
+        fetch = lambda: calls.append(1) or {'data': []}
+        for i in range(2):
+            cache.get_or_fetch('me/home', {}, 'token', fetch)
+        self.assertEqual(len(calls), 2)
+
+    def test_hits(self):
+        transport = FakeTransport({'me': {'id': '1'}})
+        cache = GraphResponseCache(ttl_rules=[(r'^me$', 60)])
+        facebook = OpenFacebook('token', transport=transport, cache=cache)
+        me = facebook.get('me')
+        me['id'] = '2'
+        self.assertEqual(facebook.get('me'), {'id': '1'})
+        self.assertEqual(len(transport.requests), 1)
+        ## Parameters and tokens are part of the key
+        facebook.get('me', fields='id')
+        OpenFacebook('other', transport=transport, cache=cache).get('me')
+        self.assertEqual(len(transport.requests), 3)
+        self.assertEqual(cache.stats()['stores'], 3)
+
+    def test_shared_tier(self):
+        shared = _FakeDjangoCache()
+        web, worker = [GraphResponseCache(ttl_rules=[(r'^me$', 60)]) for i in range(2)]
+        web.shared = worker.shared = shared
+        calls = []
+        fetch = lambda: calls.append(1) or {'id': '1'}
+        web.get_or_fetch('me', {}, 'token', fetch)
+        self.assertEqual(worker.get_or_fetch('me', {}, 'token', fetch), {'id': '1'})
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(worker.stats()['shared_hits'], 1)
+        web.invalidate_token('token')
+        self.assertEqual(shared.data, {})
+
+    def test_invalidate_token(self):
+        cache = GraphResponseCache(ttl_rules=[(r'^me', 60)])
+        calls = []
+        fetch = lambda: calls.append(1) or {'id': '1'}
+        for path in ('me', 'me/friends'):
+            cache.get_or_fetch(path, {}, 'token', fetch)
+        cache.get_or_fetch('me', {}, 'other', fetch)
+        cache.invalidate_token('token')
+        for path in ('me', 'me/friends'):
+            cache.get_or_fetch(path, {}, 'token', fetch)
+        cache.get_or_fetch('me', {}, 'other', fetch)
+        self.assertEqual(len(calls), 5)
+
+
+
+class RaiseErrorTest(unittest.TestCase):
+
+    def _raise(self, *args, **kwargs):
+        try:
+            FacebookConnection.raise_error(*args, **kwargs)
+        except facebook_exceptions.OpenFacebookException, e:
+            return e
+        self.fail("No exception raised")
+
+    def test_dispatch(self):
+        ## Known codes raise their specific class
+        e = self._raise('OAuthException', 'Permissions error', code=250)
+        self.assertTrue(isinstance(e, api_exceptions.PermissionStatusUpdateError))
+        self.assertTrue(isinstance(e, facebook_exceptions.PermissionException))
+        e = self._raise(17, 'User request limit reached')
+        self.assertTrue(isinstance(e, facebook_exceptions.TooManyCallsException))
+        self.assertEqual(e.error_code, 17)
+        ## Else the code is found in the message
+        e = self._raise('OAuthException', '(#506) Duplicate status message')
+        self.assertTrue(isinstance(e, facebook_exceptions.DuplicateStatusMessage))
+        self.assertEqual(e.error_code, 506)
+        ## Codes without a class of their own match the ranges
+        e = self._raise('OAuthException', '(#399) Unknown permission error', subcode='7')
+        self.assertEqual(type(e), facebook_exceptions.UserPermissionException)
+        self.assertEqual(e.error_subcode, 7)
+
+    def test_fallbacks(self):
+        e = self._raise('OAuthException', '(#2500) Unknown path components')
+        self.assertEqual(type(e), facebook_exceptions.OAuthException)
+        self.assertEqual(e.error_code, 2500)
+        e = self._raise('UnknownType', 'Something went wrong')
+        self.assertEqual(type(e), facebook_exceptions.OpenFacebookException)
+        self.assertEqual(e.error_code, None)
+        e = self._raise('OAuthException', 'Missing redirect_uri parameter.')
+        self.assertEqual(type(e), facebook_exceptions.MissingParameter)
+
+    def test_error_code_index(self):
+        class Broad(facebook_exceptions.OpenFacebookException):
+            codes = [(100, 199), 'broad']
+        class Narrow(facebook_exceptions.OpenFacebookException):
+            codes = [(120, 129), 150]
+        class Message(facebook_exceptions.OpenFacebookException):
+            codes = 'specific'
+        index = ErrorCodeIndex([Broad, Narrow, Message])
+        self.assertEqual([index.get_class(code) for code in (99, 100, 119, 120, 129, 130, 150, 199, 200)],
+                         [None, Broad, Broad, Narrow, Narrow, Broad, Narrow, Broad, None])
+        self.assertEqual(index.get_class(message='a specific error'), Message)
+        self.assertEqual(index.get_class(110, 'a specific error'), Message)
+        self.assertEqual(index.get_class(150, 'a broad error'), Narrow)
+
+
+
+def _signed_request(data, secret='secret'):
+    """Sign ``data`` like Facebook does"""
+    payload = base64.urlsafe_b64encode(json.dumps(data)).rstrip('=')
+    signature = hmac.new(secret, payload, hashlib.sha256).digest()
+    return '%s.%s' % (base64.urlsafe_b64encode(signature).rstrip('='), payload)
+
+
+class SignedRequestCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        middleware.signed_request_cache.clear()
+        self.app = FacebookApp('1', 'secret')
+
+    def _parse_twice(self, data):
+        signed_request = _signed_request(data)
+        stats = middleware.signed_request_cache.stats()
+        for i in range(2):
+            self.assertEqual(middleware.parse_signed_request_cached(signed_request, self.app), data)
+        new_stats = middleware.signed_request_cache.stats()
+        return new_stats['hits'] - stats['hits']
+
+    def test_cached(self):
+        self.assertEqual(self._parse_twice({'algorithm': 'HMAC-SHA256', 'user_id': '42',
+                                            'issued_at': int(time.time())}), 1)
+        ## Each app has its own entries
+        signed_request = _signed_request({'algorithm': 'HMAC-SHA256'})
+        middleware.parse_signed_request_cached(signed_request, self.app)
+        self.assertEqual(middleware.parse_signed_request_cached(
+            signed_request, FacebookApp('2', 'other secret')), None)
+
+    def test_expired_payloads_are_not_cached(self):
+        now = time.time()
+        self.assertEqual(self._parse_twice({'algorithm': 'HMAC-SHA256', 'issued_at': now - 3600}), 0)
+        self.assertEqual(self._parse_twice({'algorithm': 'HMAC-SHA256', 'issued_at': now,
+                                            'expires': now - 1}), 0)
+
+    def test_entries_expire(self):
+        data = {'algorithm': 'HMAC-SHA256', 'expires': time.time() + 0.2}
+        self.assertEqual(self._parse_twice(data), 1)
+        time.sleep(0.3)
+        self.assertEqual(self._parse_twice(data), 0)
+        ## Invalid signed requests are not cached
+        signed_request = _signed_request(data, 'wrong secret')
+        for i in range(2):
+            self.assertEqual(middleware.parse_signed_request_cached(signed_request, self.app), None)
+        self.assertEqual(len(middleware.signed_request_cache), 0)
+
+
+
+class ConnectedUserTest(unittest.TestCase):
+
+    def setUp(self):
+        self.connected = []
+        self._orig_connect_user = middleware.connect_user
+        middleware.connect_user = lambda request, facebook_id: self.connected.append(facebook_id)
+
+    def tearDown(self):
+        middleware.connect_user = self._orig_connect_user
+
+    def _process(self, data, session):
+        request = _FakeRequest({'signed_request': _signed_request(data)})
+        request.session = session
+        FacebookRequestMiddleware().process_request(request)
+        request.fb_app = FacebookApp('1', 'secret')
+        request.fb_info.evaluate()
+        return request
+
+    def test_session_fast_path(self):
+        data = {'algorithm': 'HMAC-SHA256', 'user_id': '42', 'oauth_token': 'token'}
+        session = {SESSION_KEY: 1, SESSION_FACEBOOK_ID_KEY: '42'}
+        request = self._process(data, session)
+        self.assertEqual(request.fb_info['user_id'], '42')
+        self.assertEqual(self.connected, [])
+        ## Another Facebook user, or no logged in user
+        self._process(data, {SESSION_KEY: 1, SESSION_FACEBOOK_ID_KEY: '43'})
+        self._process(data, {SESSION_FACEBOOK_ID_KEY: '42'})
+        self.assertEqual(self.connected, ['42', '42'])
+
+    def test_users_without_token_are_not_connected(self):
+        self._process({'algorithm': 'HMAC-SHA256', 'user_id': '42'}, {})
+        self._process({'algorithm': 'HMAC-SHA256'}, {})
+        self.assertEqual(self.connected, [])
+
+    def test_is_user_connected(self):
+        request = _FakeRequest()
+        self.assertFalse(is_user_connected(request, 42))
+        request.session = {SESSION_KEY: 1, SESSION_FACEBOOK_ID_KEY: '42'}
+        self.assertTrue(is_user_connected(request, 42))
+        self.assertFalse(is_user_connected(request, '43'))
+
+
+
+class SignedRequestVerifierTest(unittest.TestCase):
+
+    def test_verify(self):
+        data = {'algorithm': 'HMAC-SHA256', 'user_id': '42'}
+        verifier = SignedRequestVerifier('secret')
+        self.assertEqual(verifier.verify(_signed_request(data)), data)
+        self.assertEqual(verifier.verify(unicode(_signed_request(data))), data)
+        self.assertEqual(parse_signed_data(_signed_request(data), 'secret'), data)
+
+    def test_invalid(self):
+        verifier = SignedRequestVerifier('secret')
+        signed_request = _signed_request({'algorithm': 'HMAC-SHA256', 'user_id': '42'})
+        signature, payload = signed_request.split('.')
+        forged = _signed_request({'algorithm': 'HMAC-SHA256', 'user_id': '1'}).split('.')[1]
+        for invalid in (None, '', 'no dot', u'\xe8.\xe8', '%s.%s' % (signature, forged),
+                        _signed_request({'algorithm': 'HMAC-SHA256'}, 'wrong secret'),
+                        _signed_request({'algorithm': 'HMAC-MD5'}),
+                        _signed_request(['not', 'a', 'dict'])):
+            self.assertRaises(facebook_exceptions.InvalidSignedRequest, verifier.verify, invalid)
+        self.assertEqual(parse_signed_data('%s.%s' % (signature, forged), 'secret'), None)
+
+    def test_urlsafe_b64decode_bytes(self):
+        for value in ('', 'a', 'ab', 'abc', '\xfb\xff\xfe'):
+            encoded = base64.urlsafe_b64encode(value)
+            self.assertEqual(urlsafe_b64decode_bytes(encoded), value)
+            self.assertEqual(urlsafe_b64decode_bytes(encoded.rstrip('=')), value)
+
+
+
+class ParseSignedDataManyTest(unittest.TestCase):
+
+    def _signed_requests(self, count):
+        for i in range(count):
+            if i % 3:
+                yield _signed_request({'algorithm': 'HMAC-SHA256', 'user_id': str(i)})
+            else:
+                yield _signed_request({'algorithm': 'HMAC-SHA256'}, 'wrong secret')
+
+    def _check(self, results, count):
+        self.assertEqual([index for index, result in results], range(count))
+        for index, result in results:
+            if index % 3:
+                self.assertEqual(result['user_id'], str(index))
+            else:
+                self.assertTrue(isinstance(result, facebook_exceptions.InvalidSignedRequest))
+
+    def test_in_process(self):
+        self._check(list(parse_signed_data_many(self._signed_requests(25), 'secret',
+                                                chunksize=10)), 25)
+
+    def test_processes(self):
+        self._check(list(parse_signed_data_many(self._signed_requests(100), 'secret',
+                                                processes=2, chunksize=10)), 100)
+
+    def test_input_consumed_lazily(self):
+        consumed = []
+        def signed_requests():
+            for signed_request in self._signed_requests(100):
+                consumed.append(1)
+                yield signed_request
+        results = parse_signed_data_many(signed_requests(), 'secret', chunksize=10)
+        results.next()
+        self.assertEqual(len(consumed), 10)
+
+
+
+class _PostRequest(object):
+    """POST request recording whether its body was parsed"""
+
+    def __init__(self, content_type, content_length, POST=None):
+        self.method = 'POST'
+        self.path = '/'
+        self.GET = {}
+        self.COOKIES = {}
+        self.META = {'CONTENT_TYPE': content_type, 'CONTENT_LENGTH': str(content_length)}
+        self._post = POST or {}
+        self.body_parsed = False
+
+    @property
+    def POST(self):
+        self.body_parsed = True
+        return self._post
+
+
+class FormDataTest(unittest.TestCase):
+
+    form = 'application/x-www-form-urlencoded; charset=UTF-8'
+
+    def _process(self, request):
+        request.session = {}
+        FacebookRequestMiddleware().process_request(request)
+        request.fb_app = FacebookApp('1', 'secret')
+        FacebookRequestMiddleware().process_view(request, lambda request: None, (), {})
+        return request
+
+    def test_canvas_post(self):
+        signed_request = _signed_request({'algorithm': 'HMAC-SHA256'})
+        request = self._process(_PostRequest(self.form, 100, {'signed_request': signed_request}))
+        self.assertTrue(request.body_parsed)
+        self.assertTrue(request.fb_info['is_canvas'])
+        self.assertTrue(request.csrf_processing_done)
+
+    def test_other_bodies_are_not_parsed(self):
+        max_size = middleware.facebook_settings.FACEBOOK_SIGNED_REQUEST_MAX_BODY_SIZE
+        for request in (_PostRequest('multipart/form-data; boundary=X', 100),
+                        _PostRequest('application/json', 100),
+                        _PostRequest(self.form, max_size + 1),
+                        _PostRequest(self.form, 'invalid')):
+            self._process(request)
+            self.assertFalse(request.fb_info['is_signed_request'])
+            self.assertFalse(request.body_parsed)
+
+
+
+class _FakeUserManager(object):
+
+    def __init__(self):
+        self.created = []
+
+    def filter(self, **kwargs):
+        return self
+
+    def values_list(self, *fields, **kwargs):
+        return [user.username for user in self.created]
+
+    def create_user(self, username, email, password):
+        user = _FakeUser(username, email, len(self.created) + 1)
+        self.created.append(user)
+        return user
+
+
+class _FakeUser(object):
+
+    def __init__(self, username, email, pk):
+        self.username = username
+        self.email = email
+        self.pk = pk
+
+
+class _FakeFacebookUser(object):
+    saved = []
+
+    def save(self):
+        self.saved.append(self)
+
+
+class ConnectUserTest(unittest.TestCase):
+
+    permissions = {'code': 200, 'body': json.dumps({'data': [
+        {'installed': 1, 'email': 1, 'publish_stream': 0}]})}
+
+    def setUp(self):
+        self._orig = user_mgmt.OpenFacebook, user_mgmt.User, user_mgmt.FacebookUser
+        user_mgmt.User = type('User', (object,), {'objects': _FakeUserManager()})
+        user_mgmt.FacebookUser = _FakeFacebookUser
+        _FakeFacebookUser.saved = []
+
+    def tearDown(self):
+        user_mgmt.OpenFacebook, user_mgmt.User, user_mgmt.FacebookUser = self._orig
+
+    def _connect(self, responses):
+        transport = _BatchTransport(responses)
+        user_mgmt.OpenFacebook = lambda access_token, **kwargs: OpenFacebook(
+            access_token, transport=transport, **kwargs)
+        request = _FakeRequest()
+        request.session = {}
+        request.fb_info = {'access_token': 'token'}
+        return request, transport, user_mgmt.connect_user(request, '42')
+
+    def test_register(self):
+        me = {'code': 200, 'body': json.dumps({
+            'id': '42', 'name': 'John Doe', 'email': 'john@example.com',
+            'link': 'https://www.facebook.com/john'})}
+        request, transport, user = self._connect({'me': me, 'me/permissions': self.permissions})
+        ## Profile and permissions are fetched with a single request
+        self.assertEqual(len(transport.requests), 1)
+        self.assertEqual((user.username, user.email), ('john-doe', 'john@example.com'))
+        fb_user, = _FakeFacebookUser.saved
+        self.assertEqual(fb_user.granted_permissions, 'email,installed')
+        self.assertEqual(request.session[SESSION_FACEBOOK_ID_KEY], '42')
+
+    def test_errors(self):
+        me = {'code': 400, 'body': json.dumps({'error': {
+            'type': 'OAuthException', 'code': 190, 'message': 'Invalid OAuth access token.'}})}
+        self.assertRaises(facebook_exceptions.OAuthException, self._connect,
+                          {'me': me, 'me/permissions': self.permissions})
+        self.assertEqual(_FakeFacebookUser.saved, [])
+
+    def test_parse_permissions(self):
+        self.assertEqual(OpenFacebook.parse_permissions(json.loads(self.permissions['body'])),
+                         ['email', 'installed'])
+
+
+
+class AppRegistryTest(unittest.TestCase):
+
+    def setUp(self):
+        self.poll = FacebookApp('1', 'secret1', hosts=['Poll.example.com'], path_prefixes=['/poll/'])
+        self.quiz = FacebookApp(2, 'secret2', path_prefixes=['quiz'], default_scope=['email'])
+        self.main = FacebookApp('3', 'secret3')
+        self.registry = AppRegistry([self.poll, self.quiz, self.main], default=self.main)
+
+    def _request(self, path='/', host='www.example.com', cookies=None):
+        request = _FakeRequest()
+        request.path = path
+        request.META = {'HTTP_HOST': host}
+        request.COOKIES = cookies or {}
+        return request
+
+    def test_for_request(self):
+        for_request = self.registry.for_request
+        self.assertTrue(for_request(self._request(host='poll.example.com:8000')) is self.poll)
+        self.assertTrue(for_request(self._request('/poll/1/')) is self.poll)
+        self.assertTrue(for_request(self._request('/quiz')) is self.quiz)
+        self.assertTrue(for_request(self._request('/quizzes/')) is self.main)
+        self.assertTrue(for_request(self._request(cookies={'fbsr_2': 'x'})) is self.quiz)
+        ## Hosts win over path prefixes and cookies
+        self.assertTrue(for_request(self._request('/quiz/', 'poll.example.com',
+                                                  {'fbsr_2': 'x'})) is self.poll)
+
+    def test_get(self):
+        self.assertTrue(self.registry.get(2) is self.quiz)
+        self.assertEqual(self.registry.get('4'), None)
+        self.assertTrue(self.registry.get_by_cookie({'csrftoken': 'x', 'fbsr_1': 'x'}) is self.poll)
+        self.assertEqual(self.registry.get_by_cookie({'fbsr_4': 'x'}), None)
+        single = AppRegistry([self.quiz])
+        self.assertTrue(single.default is self.quiz)
+        self.assertTrue(single.get_by_cookie({'fbsr_2': 'x'}) is self.quiz)
+        self.assertEqual(single.get_by_cookie({'fbsr_1': 'x'}), None)
+
+    def test_signed_requests_use_the_app_secret(self):
+        signed_request = _signed_request({'algorithm': 'HMAC-SHA256', 'user_id': '42'}, 'secret2')
+        self.assertEqual(self.quiz.parse_signed_request(signed_request)['user_id'], '42')
+        self.assertEqual(self.poll.parse_signed_request(signed_request), None)
+
+
+if __name__ == '__main__':
+    unittest.main()
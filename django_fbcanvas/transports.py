@@ -0,0 +1,260 @@
+"""django_fbcanvas - transports
+
+Transports are the objects actually performing HTTP requests to the
+Facebook APIs on behalf of :py:class:`django_fbcanvas.fb_api.FacebookConnection`.
+
+The transport to be used is selected by the ``FACEBOOK_TRANSPORT``
+setting (a dotted path to a transport class), or can be passed to a
+single :py:class:`django_fbcanvas.fb_api.OpenFacebook` instance::
+
+    facebook = OpenFacebook(access_token, transport=FakeTransport({
+        'me': {'id': '1234', 'name': 'John Doe'},
+    }))
+
+All the transports raise ``urllib2.URLError`` when the connection to
+the host fails, so that the request can be retried. Errors happening
+after the request was sent (eg. ``socket.timeout`` while waiting for the
+response) are raised as-is, since the request may have been processed.
+"""
+
+import atexit
+import threading
+import urllib
+import urllib2
+import urlparse
+import logging
+from cStringIO import StringIO
+
+import django_fbcanvas.settings as fb_settings
+from django_fbcanvas.connection_pool import get_pool_manager, ConnectError
+from django_fbcanvas.utils import json, import_by_path
+
+logger = logging.getLogger(__name__)
+
+USER_AGENT = 'Open Facebook Python'
+
+
+class BaseTransport(object):
+    """Base class for transports"""
+
+    def request(self, url, post_string=None, timeout=None):
+        """Perform a request and return the response body.
+
+        :param url: The full URL to be requested
+        :param post_string: Already-encoded POST body. If ``None``,
+            a GET request is performed.
+        :param timeout: Timeout for the request, in seconds
+        :returns: The response body, as unicode
+        :raises: ``urllib2.URLError`` on connection errors; other
+            ``socket.error`` or ``httplib.HTTPException`` if the
+            request failed after being sent
+        """
+        raise NotImplementedError
+
+    def open(self, url, post_string=None, timeout=None):
+        """Perform a request and return a file-like object from which
+        the (UTF-8 encoded) response body can be read incrementally.
+        The caller must ``close()`` it.
+
+        The default implementation reads the whole response.
+        """
+        return StringIO(self.request(url, post_string, timeout).encode('utf8'))
+
+
+class Urllib2Transport(BaseTransport):
+    """Transport using an ``urllib2`` opener, with a new connection
+    for each request.
+    """
+
+    def request(self, url, post_string=None, timeout=None):
+        response_file = self.open(url, post_string, timeout)
+        try:
+            return response_file.read().decode('utf8')
+        finally:
+            response_file.close()
+
+    def open(self, url, post_string=None, timeout=None):
+        opener = urllib2.build_opener()
+        opener.addheaders = [('User-agent', USER_AGENT)]
+        try:
+            return opener.open(url, post_string, timeout=timeout)
+        except (urllib2.HTTPError,), e:
+            ## Catch the silly status code errors
+            if 'http error' in str(e).lower():
+                return e
+            raise
+
+
+class PooledTransport(BaseTransport):
+    """Transport using persistent connections from the
+    :py:mod:`django_fbcanvas.connection_pool`.
+    """
+
+    def request(self, url, post_string=None, timeout=None):
+        try:
+            status, body = get_pool_manager().urlopen(
+                url, post_string, headers={'User-agent': USER_AGENT},
+                timeout=timeout)
+        except ConnectError, e:
+            raise urllib2.URLError(e.reason)
+        return body.decode('utf8')
+
+    def open(self, url, post_string=None, timeout=None):
+        try:
+            return get_pool_manager().urlopen_stream(
+                url, post_string, headers={'User-agent': USER_AGENT},
+                timeout=timeout)
+        except ConnectError, e:
+            raise urllib2.URLError(e.reason)
+
+
+## Secret parameters, never part of request keys (and recordings)
+_SECRET_PARAMS = ('access_token', 'client_secret', 'code')
+
+def _request_key(url, post_string=None):
+    """Key identifying a request, ignoring the host and the secret
+    parameters (access token, app secret and OAuth code)
+    """
+    parsed = urlparse.urlsplit(url)
+    query = sorted((k, v) for k, v in urlparse.parse_qsl(parsed.query)
+                   if k not in _SECRET_PARAMS)
+    path = parsed.path.lstrip('/')
+    if query:
+        path += '?' + urllib.urlencode(query)
+    return '%s %s' % ('POST' if post_string is not None else 'GET', path)
+
+
+class FakeTransport(BaseTransport):
+    """In-memory transport, returning pre-defined responses without
+    touching the network. Useful for tests.
+
+    :param responses: A dict mapping paths to responses; see :py:meth:`add`.
+    """
+
+    def __init__(self, responses=None):
+        self.responses = {}
+        self.requests = []
+        self._lock = threading.Lock()
+        for path, response in (responses or {}).items():
+            self.add(path, response)
+
+    def add(self, path, response, method='GET'):
+        """Register a response for ``path``.
+
+        :param path: The request path, without leading slash, optionally
+            including the query string (eg. ``me/friends?limit=10``).
+            Responses registered with the bare path match any query.
+        :param response: Either a string (returned as-is) or an object
+            that will be JSON-encoded.
+        :param method: Either ``GET`` or ``POST``
+        """
+        if not isinstance(response, basestring):
+            response = json.dumps(response)
+        self.responses['%s %s' % (method.upper(), path)] = unicode(response)
+
+    def request(self, url, post_string=None, timeout=None):
+        key = _request_key(url, post_string)
+        with self._lock:
+            self.requests.append((url, post_string))
+        if key in self.responses:
+            return self.responses[key]
+        bare_key = key.split('?', 1)[0]
+        if bare_key in self.responses:
+            return self.responses[bare_key]
+        logger.warn("FakeTransport: no response defined for %s", key)
+        return json.dumps({'error': {
+            'type': 'OAuthException', 'code': 803,
+            'message': '(#803) No response defined for %s' % key}})
+
+
+class RecordReplayTransport(BaseTransport):
+    """Transport recording responses to a file, or replaying them.
+
+    In ``record`` mode, requests are performed using ``transport``
+    (defaults to the default transport) and responses are written to
+    ``filename`` by :py:meth:`save`, which is called by :py:meth:`close`,
+    when leaving a ``with`` block or else at exit. In ``replay`` mode,
+    responses are read from the file and no request reaches the network.
+
+    Requests are matched by method, path and query string; the
+    ``access_token``, ``client_secret`` and ``code`` parameters are
+    ignored, and never written to the file.
+
+    :param filename: Path to the recordings file (JSON)
+    :param mode: Either ``"record"`` or ``"replay"``
+    :param transport: Transport used to perform the actual requests
+        in ``record`` mode.
+    """
+
+    def __init__(self, filename, mode='replay', transport=None):
+        if mode not in ('record', 'replay'):
+            raise ValueError("Invalid mode: %r" % mode)
+        self.filename = filename
+        self.mode = mode
+        self._lock = threading.Lock()
+        if mode == 'record':
+            self.transport = transport or get_default_transport()
+            self.recordings = {}
+            self._dirty = False
+            atexit.register(self.save)
+        else:
+            with open(filename, 'r') as f:
+                self.recordings = json.load(f)
+
+    def request(self, url, post_string=None, timeout=None):
+        key = _request_key(url, post_string)
+        if self.mode == 'replay':
+            try:
+                return self.recordings[key]
+            except KeyError:
+                raise urllib2.URLError("No recorded response for %s" % key)
+        response = self.transport.request(url, post_string, timeout)
+        with self._lock:
+            self.recordings[key] = response
+            self._dirty = True
+        return response
+
+    def save(self):
+        """Write recorded responses to the file, if any is new"""
+        if self.mode != 'record':
+            return
+        with self._lock:
+            if not self._dirty:
+                return
+            with open(self.filename, 'w') as f:
+                json.dump(self.recordings, f, indent=2, sort_keys=True)
+            self._dirty = False
+
+    close = save
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def get_transport_class(path):
+    """Import a transport class from its dotted path"""
+    return import_by_path(path)
+
+
+_default_transport = None
+
+def get_default_transport():
+    """Returns the transport configured in the settings.
+
+    If ``FACEBOOK_TRANSPORT`` is not set, :py:class:`PooledTransport` is
+    used when ``FACEBOOK_HTTP_KEEPALIVE`` is enabled, else
+    :py:class:`Urllib2Transport`.
+    """
+    global _default_transport
+    if _default_transport is None:
+        if fb_settings.FACEBOOK_TRANSPORT:
+            transport_class = get_transport_class(fb_settings.FACEBOOK_TRANSPORT)
+        elif fb_settings.FACEBOOK_HTTP_KEEPALIVE:
+            transport_class = PooledTransport
+        else:
+            transport_class = Urllib2Transport
+        _default_transport = transport_class()
+    return _default_transport
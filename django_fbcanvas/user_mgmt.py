@@ -4,7 +4,7 @@ import re
 import logging
 logger = logging.getLogger(__name__)
 
-from django.contrib.auth import authenticate, login
+from django.contrib.auth import authenticate, login, SESSION_KEY
 from django.contrib.auth.models import User
 from django.template.defaultfilters import slugify
 
@@ -12,6 +12,10 @@ from django_fbcanvas.fb_api import OpenFacebook
 from django_fbcanvas.models import FacebookUser
 from django_fbcanvas.utils import json
 
+## Session key holding the Facebook ID of the user logged in
+## by :py:func:`connect_user`
+SESSION_FACEBOOK_ID_KEY = '_fbcanvas_facebook_id'
+
 
 def _create_unique_username(base_username):
     """Create an unique username, by adding numbers at the end in
@@ -40,6 +44,22 @@ def _generate_password(size=20):
     _ch_pool = string.letters + string.digits
     return ''.join([choice(_ch_pool) for i in range(size)])
 
+def is_user_connected(request, facebook_id):
+    """Whether the user logged in the current session was connected
+    by :py:func:`connect_user` with the given Facebook ID.
+    
+    This only looks at the session, without querying the database.
+    """
+    session = getattr(request, 'session', None)
+    if not session or SESSION_KEY not in session:
+        return False
+    return session.get(SESSION_FACEBOOK_ID_KEY) == str(facebook_id)
+
+def _login(request, user, facebook_id):
+    """Log in the user, remembering its Facebook ID in the session"""
+    login(request, user)
+    request.session[SESSION_FACEBOOK_ID_KEY] = str(facebook_id)
+
 def connect_user(request, facebook_id):
     """Connects an user logged-in via Facebook or, if no user
     was found, preoceed to register a new one.
@@ -52,7 +72,7 @@ def connect_user(request, facebook_id):
     
     if user:
         ## The user already exists -- just log in
-        login(request, user)
+        _login(request, user, facebook_id)
         return user
     
     ## Register a new user
@@ -63,8 +83,13 @@ def connect_user(request, facebook_id):
         ## Redirect to OAuth endpoint page.
         pass
     
-    fbapi = OpenFacebook(access_token)
-    fb_user = fbapi.get('me')
+    ## Get the user profile and permissions in a single request,
+    ## since we are blocking the whole request meanwhile
+    fbapi = OpenFacebook(access_token, app=getattr(request, 'fb_app', None))
+    fb_user, fb_permissions = fbapi.batch(['me', 'me/permissions'])
+    for result in (fb_user, fb_permissions):
+        if isinstance(result, Exception):
+            raise result
     
     ##--------------------------------------------------------------------------
     ## NOTE: Hereby we require the user to grant us ``email`` permission,
@@ -87,10 +112,10 @@ def connect_user(request, facebook_id):
     new_fb_user.facebook_profile_data = json.dumps(fb_user)
     new_fb_user.access_token = access_token
     new_fb_user.facebook_profile_url = fb_user['link']
-    new_fb_user.granted_permissions = ",".join(fbapi.get_permissions())
+    new_fb_user.granted_permissions = ",".join(fbapi.parse_permissions(fb_permissions))
     new_fb_user.save()
     
-    login(request, new_user)
+    _login(request, new_user, fb_user['id'])
     
     return new_user
     
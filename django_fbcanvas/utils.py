@@ -4,6 +4,13 @@ Miscellaneous utility functions for django_fbcanvas
 """
 
 import re
+import hmac
+import string
+import hashlib
+import binascii
+import itertools
+import collections
+import multiprocessing
 import logging
 logger = logging.getLogger(__name__)
 
@@ -11,6 +18,7 @@ from django.conf import settings
 from django.db import models
 
 from django_fbcanvas import settings as fb_settings
+from django_fbcanvas.exceptions import InvalidSignedRequest
 
 ## Look for and import an usable JSON library
 try:
@@ -21,6 +29,12 @@ except ImportError:
     except ImportError:
         import json
 
+## Constant-time comparison of signatures
+try:
+    from hmac import compare_digest
+except ImportError:
+    from django.utils.crypto import constant_time_compare as compare_digest
+
 
 #def urlsafer_b64decode(s):
 #    """URL-Safe Base64 decoding with auto-padding, since PHP doesn't
@@ -51,10 +65,21 @@ def urlsafer_b64decode(s):
     
     :param inp: The base64-encoded string to be decoded
     """
-    import base64
-    padding_factor = (4 - len(s) % 4) % 4
-    s += "=" * padding_factor
-    return base64.b64decode(unicode(s).translate(dict(zip(map(ord, u'-_'), u'+/'))))
+    if isinstance(s, unicode):
+        s = s.encode('ascii')
+    return urlsafe_b64decode_bytes(s)
+
+
+## Translation table from the URL-safe base64 alphabet to the standard one
+_URLSAFE_B64_TABLE = string.maketrans('-_', '+/')
+
+def urlsafe_b64decode_bytes(s):
+    """Decode a (bytes) string encoded with the URL-safe base64
+    alphabet, with or without padding.
+    
+    :raises: ``binascii.Error`` if the string is not valid base64
+    """
+    return binascii.a2b_base64(s.translate(_URLSAFE_B64_TABLE) + '=' * (-len(s) % 4))
 
 
 def str_to_list(s, separator=","):
@@ -68,12 +93,84 @@ def str_to_list(s, separator=","):
     else:
         return list(s)
 
+def import_by_path(path):
+    """Import an object (eg. a class) given its dotted path"""
+    from django.utils.importlib import import_module
+    module_name, name = path.rsplit('.', 1)
+    return getattr(import_module(module_name), name)
+
 def get_profile_class():
     """Gets the class to be used for user profiles"""
     profile_string = getattr(settings, 'AUTH_PROFILE_MODULE', 'member.UserProfile')
     app_label, model = profile_string.split('.')
     return models.get_model(app_label, model)
 
+class SignedRequestVerifier(object):
+    """Verifies and decodes ``signed_request`` strings signed with
+    a given secret.
+    
+    The keyed HMAC state is computed once, and copied for each signed
+    request. The signature is checked on the raw (still encoded) payload,
+    so that bad signatures are rejected before any base64 or JSON
+    decoding takes place.
+    
+    :param secret: The key used to sign requests (the app secret)
+    :param algorithm: The signature algorithm; Facebook only
+        uses ``HMAC-SHA256``
+    """
+    
+    def __init__(self, secret, algorithm='HMAC-SHA256'):
+        self.algorithm = algorithm
+        self._hmac = hmac.new(smart_str(secret), digestmod=_get_digestmod(algorithm))
+    
+    def sign(self, data):
+        """Returns the signature of ``data`` (bytes)"""
+        mac = self._hmac.copy()
+        mac.update(data)
+        return mac.digest()
+    
+    def verify(self, signed_request):
+        """Verify and decode a signed request.
+        
+        :returns: The decoded data object
+        :raises: :py:class:`django_fbcanvas.exceptions.InvalidSignedRequest`
+            if the signed request is malformed or its signature is invalid
+        """
+        if not isinstance(signed_request, basestring):
+            raise InvalidSignedRequest("Signed request is not a string")
+        try:
+            if isinstance(signed_request, unicode):
+                signed_request = signed_request.encode('ascii')
+            enc_signature, enc_payload = signed_request.split('.', 1)
+            signature = urlsafe_b64decode_bytes(enc_signature)
+        except (ValueError, binascii.Error):
+            raise InvalidSignedRequest("Malformed signed request")
+        if not compare_digest(self.sign(enc_payload), signature):
+            raise InvalidSignedRequest("Invalid signed request signature")
+        try:
+            data = json.loads(urlsafe_b64decode_bytes(enc_payload))
+        except (ValueError, binascii.Error):
+            raise InvalidSignedRequest("Malformed signed request payload")
+        if not isinstance(data, dict) \
+                or str(data.get('algorithm')).upper() != self.algorithm:
+            raise InvalidSignedRequest("Unexpected signed request algorithm")
+        return data
+
+
+## Verifiers for each secret
+_signed_request_verifiers = {}
+
+def get_signed_request_verifier(secret=None):
+    """Returns the :py:class:`SignedRequestVerifier` for ``secret``,
+    defaulting to ``FACEBOOK_APP_SECRET``.
+    """
+    if secret is None:
+        secret = fb_settings.FACEBOOK_APP_SECRET
+    verifier = _signed_request_verifiers.get(secret)
+    if verifier is None:
+        verifier = _signed_request_verifiers[secret] = SignedRequestVerifier(secret)
+    return verifier
+
 def parse_signed_data(signed_request, secret=None):
     """Parse a ``signed_request`` from Facebook.
     
@@ -89,24 +186,73 @@ def parse_signed_data(signed_request, secret=None):
         Defaults to ``FACEBOOK_APP_SECRET`` from settings.
     :returns: The decoded data object if signature is valid, else ``None``.
     """
+    try:
+        data = get_signed_request_verifier(secret).verify(signed_request)
+    except InvalidSignedRequest, e:
+        logger.error("Invalid signed_data: %s" % e)
+        return
+    logger.debug("Received a valid signed request")
+    return data
+
+def _verify_signed_requests(secret, chunk):
+    """Verify a chunk of ``(index, signed_request)``, for
+    :py:func:`parse_signed_data_many`.
+    """
+    verify = get_signed_request_verifier(secret).verify
+    results = []
+    for index, signed_request in chunk:
+        try:
+            results.append((index, verify(signed_request)))
+        except InvalidSignedRequest, e:
+            results.append((index, e))
+    return results
+
+def parse_signed_data_many(signed_requests, secret=None, processes=None, chunksize=500):
+    """Verify and decode many signed requests, eg. when replaying logs.
     
+    Signed requests are consumed from the iterable as results are
+    yielded, so that memory usage doesn't depend on their number.
+    
+    :param signed_requests: Iterable of signed requests
+    :param secret: The key to be used to verify signatures.
+        Defaults to ``FACEBOOK_APP_SECRET`` from settings.
+    :param processes: Number of worker processes used to verify the
+        signed requests; ``None`` or ``0`` to verify them in the
+        current process
+    :param chunksize: Number of signed requests sent to a worker
+        process at once
+    :returns: An iterator of ``(index, result)`` tuples, in the same
+        order of ``signed_requests``, where ``result`` is either the
+        decoded data object or an
+        :py:class:`django_fbcanvas.exceptions.InvalidSignedRequest`
+        instance
+    """
     if secret is None:
         secret = fb_settings.FACEBOOK_APP_SECRET
     
-    enc_signature, enc_payload = signed_request.split('.', 1)
-    signature, payload = map(urlsafer_b64decode, (enc_signature, enc_payload))
-    data = json.loads(payload)
-    algo = data.get('algorithm').upper()
+    items = enumerate(signed_requests)
+    if not processes:
+        for chunk in iter(lambda: list(itertools.islice(items, chunksize)), []):
+            for result in _verify_signed_requests(secret, chunk):
+                yield result
+        return
     
+    ## Pool.imap() would consume the whole input in background,
+    ## so keep at most a few chunks per process in flight
+    pool = multiprocessing.Pool(processes)
     try:
-        if verify_signature(enc_payload, secret, signature, algo):
-            logger.debug("Received a valid signed request")
-            return data
-        else:
-            logger.error("Invalid signed_data signature!")
-            return
-    except:
-        logger.exception("Something went wrong while verifying the signed_request.")
+        pending = collections.deque()
+        for chunk in iter(lambda: list(itertools.islice(items, chunksize)), []):
+            pending.append(pool.apply_async(_verify_signed_requests, (secret, chunk)))
+            if len(pending) >= processes * 2:
+                for result in pending.popleft().get():
+                    yield result
+        while pending:
+            for result in pending.popleft().get():
+                yield result
+        pool.close()
+    finally:
+        pool.terminate()
 
 def calculate_signature(data, secret, algorithm=None):
     """Calculate the signature of ``data`` using ``secret`` as key
@@ -118,35 +264,34 @@ def calculate_signature(data, secret, algorithm=None):
         Must be one of algorithms supported by hashlib, or an equivalent
         calllable / function.
     """
-    import hmac, hashlib
-    
     if algorithm is None:
         algorithm = 'HMAC-SHA256'
+    return hmac.new(secret, msg=data, digestmod=_get_digestmod(algorithm)).digest()
 
+def _get_digestmod(algorithm):
+    """Returns the hashlib constructor for a ``HMAC-*`` algorithm name"""
     if isinstance(algorithm, basestring):
         if algorithm == 'HMAC-SHA256':
-            digestmod = hashlib.sha256
+            return hashlib.sha256
         elif algorithm == 'HMAC-MD5':
-            digestmod = hashlib.md5
+            return hashlib.md5
         elif algorithm == 'HMAC-SHA1':
-            digestmod = hashlib.sha1
+            return hashlib.sha1
         elif algorithm == 'HMAC-SHA224':
-            digestmod = hashlib.sha224
+            return hashlib.sha224
         elif algorithm == 'HMAC-SHA384':
-            digestmod = hashlib.sha384
+            return hashlib.sha384
         elif algorithm == 'HMAC-SHA512':
-            digestmod = hashlib.sha512
+            return hashlib.sha512
         else:
             raise ValueError("Unsupported algorithm: %r" % algorithm)
-    else:
-        ## Try using algorithm directly
-        digestmod = algorithm
-    return hmac.new(secret, msg=data, digestmod=digestmod).digest()
+    ## Try using algorithm directly
+    return algorithm
 
 def verify_signature(data, secret, signature, algorithm=None):
     """Verify the ``signature`` on ``data`` using ``secret`` key."""
     _c_sig = calculate_signature(data, secret, algorithm)
-    return signature == _c_sig
+    return compare_digest(signature, _c_sig)
 
 def to_int(s, default=0, exception=(ValueError, TypeError), regexp=None):
     '''Convert the given input to an integer or return default
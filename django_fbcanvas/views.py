@@ -5,9 +5,12 @@ logger = logging.getLogger(__name__)
 
 from django.contrib import messages
 from django.http import HttpResponseNotAllowed, HttpResponseRedirect,\
-    HttpResponse
+    HttpResponse, HttpResponseBadRequest
+from django.views.decorators.csrf import csrf_exempt
 
 from django_fbcanvas.fb_api import oauth_start, oauth_at_from_code
+from django_fbcanvas.app_registry import get_app
+from django_fbcanvas.deauthorize import enqueue_deauthorization
 
 
 def fb_oauth(request):
@@ -41,7 +44,8 @@ def fb_oauth(request):
         return oauth_start(request, redirect_to="/")
     else:
         if request.REQUEST.get('state') == request.session['facebook_oauth_state']:
-            result = oauth_at_from_code(code=oauth_code, redirect_uri="/")
+            result = oauth_at_from_code(code=oauth_code, redirect_uri="/",
+                                        app=getattr(request, 'fb_app', None))
             access_token = result['access_token']
             request.session['facebook_access_token'] = access_token
             request.fb_info['access_token'] = access_token
@@ -56,11 +60,22 @@ def fb_oauth(request):
             raise HttpResponseNotAllowed("State doesn't match - you might be victim of CSRF")
 
 
+@csrf_exempt
 def fb_deauthorize(request):
-    """Deauthorize callback, pinged when an user deauthorizes this app."""
+    """Deauthorize callback, pinged when an user deauthorizes this app.
     
-    ## TODO: Verify the signed request
-    ## TODO: Trigger a signal
+    The signed request is verified and the user is queued for
+    processing (see :py:mod:`django_fbcanvas.deauthorize`), so that
+    the callback returns quickly even during bursts.
+    """
+    
+    app = getattr(request, 'fb_app', None) or get_app()
+    signed_request = request.POST.get('signed_request')
+    data = app.parse_signed_request(signed_request) if signed_request else None
+    if not data or not data.get('user_id'):
+        return HttpResponseBadRequest("Invalid signed request")
+    
+    enqueue_deauthorization(data['user_id'], app.app_id)
     
     ## Send a "thank you" message. We are polite even with robots. :)
     return HttpResponse("Thank you!")
@@ -0,0 +1,156 @@
+"""django_fbcanvas - workers
+
+Bounded pools of worker threads, used to run Graph API requests and
+other slow work off the calling thread.
+
+Pools are created lazily and re-created after a ``fork()``, since the
+worker threads of the parent process don't exist in the child.
+"""
+
+import os
+import logging
+import threading
+from multiprocessing.pool import ThreadPool
+
+logger = logging.getLogger(__name__)
+
+## The pool running the job of the current thread, if any
+_current = threading.local()
+
+
+class PoolFull(Exception):
+    """Raised when submitting a job to a full :py:class:`WorkerPool`
+    without blocking.
+    """
+    pass
+
+
+class WorkerPool(object):
+    """A pool of worker threads with a bounded number of pending jobs.
+
+    :param size: Number of worker threads
+    :param max_pending: Maximum number of jobs either queued or running.
+        Defaults to ``size * 10``.
+    :param name: Name of the pool, used for logging only
+    """
+
+    def __init__(self, size, max_pending=None, name=None):
+        self.size = size
+        self.max_pending = max_pending or size * 10
+        self.name = name
+        self._lock = threading.Lock()
+        self._pool = None
+        self._pid = None
+        self._slots = threading.BoundedSemaphore(self.max_pending)
+
+    def _get_pool(self):
+        pid = os.getpid()
+        if self._pool is None or self._pid != pid:
+            with self._lock:
+                if self._pool is None or self._pid != pid:
+                    logger.debug("Starting worker pool %r with %d threads", self.name, self.size)
+                    self._pool = ThreadPool(self.size)
+                    self._slots = threading.BoundedSemaphore(self.max_pending)
+                    self._pid = pid
+        return self._pool
+
+    def submit(self, func, *args, **kwargs):
+        """Run ``func(*args, **kwargs)`` in a worker thread.
+
+        If the pool already has ``max_pending`` jobs, this blocks
+        until one of them completes.
+
+        :returns: a ``multiprocessing.pool.AsyncResult``; call its
+            ``get()`` method to wait for the result. Exceptions raised
+            by ``func`` are re-raised by ``get()``.
+        """
+        return self._submit(True, func, args, kwargs)
+
+    def try_submit(self, func, *args, **kwargs):
+        """Like :py:meth:`submit`, but raises :py:class:`PoolFull`
+        instead of blocking if too many jobs are pending.
+        """
+        return self._submit(False, func, args, kwargs)
+
+    def _submit(self, block, func, args, kwargs):
+        pool = self._get_pool()
+        slots = self._slots
+        if not slots.acquire(block):
+            raise PoolFull("Worker pool %r is full" % self.name)
+
+        def _job():
+            _current.pool = self
+            try:
+                return func(*args, **kwargs)
+            finally:
+                _current.pool = None
+                slots.release()
+
+        try:
+            return pool.apply_async(_job)
+        except:
+            slots.release()
+            raise
+
+    def in_worker(self):
+        """Whether the current thread is running a job of this pool:
+        waiting there for another job of the same pool may deadlock.
+        """
+        return getattr(_current, 'pool', None) is self
+
+    def close(self):
+        """Stop accepting jobs and wait for the pending ones to complete"""
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None and self._pid == os.getpid():
+            pool.close()
+            pool.join()
+
+
+class CompletedResult(object):
+    """Result of a call already performed in the calling thread, with
+    the same interface as the ``AsyncResult`` returned by
+    :py:meth:`WorkerPool.submit`.
+    """
+
+    def __init__(self, value=None, exception=None):
+        self._value = value
+        self._exception = exception
+
+    @classmethod
+    def call(cls, func, *args, **kwargs):
+        """Call ``func`` and wrap its result or exception"""
+        try:
+            return cls(func(*args, **kwargs))
+        except Exception, e:
+            return cls(exception=e)
+
+    def ready(self):
+        return True
+
+    def successful(self):
+        return self._exception is None
+
+    def wait(self, timeout=None):
+        pass
+
+    def get(self, timeout=None):
+        if self._exception is not None:
+            raise self._exception
+        return self._value
+
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+def get_worker_pool(name, size, max_pending=None):
+    """Returns the process-wide :py:class:`WorkerPool` with the
+    given name, creating it if needed.
+    """
+    pool = _pools.get(name)
+    if pool is None:
+        with _pools_lock:
+            pool = _pools.get(name)
+            if pool is None:
+                pool = _pools[name] = WorkerPool(size, max_pending, name=name)
+    return pool